@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark dei kernel dei solver, con baseline JSON e confronto anti-regressione.
+
+Kernel misurati (per ogni caso della griglia):
+    load_from_file   parsing del file istanza                      [s/chiamata]
+    lower_bound      Instance.get_theoretical_lower_bound          [s/chiamata]
+    greedy_lpt       greedy_lpt_solve                              [s/chiamata]
+    local_search     IteratedGreedy._local_search sulla soluzione LPT [s/chiamata]
+    bnb_nodes        BranchAndBound, nodi esplorati al secondo (solo N <= 20)   [nodi/s]
+    ig_iterations    IteratedGreedy, iterazioni al secondo                      [iter/s]
+
+Griglia fissa: istanze di data/dataset_exam (prima replica di ogni (N, M, Dist)) più taglie
+grandi generate con generator.py in una cartella temporanea (seed fissi: stesso contenuto ovunque).
+Ogni kernel ha warmup e trial ripetuti; si riportano mediana, MAD (median absolute deviation),
+min e max. Le chiamate brevi sono ripetute in un loop interno fino a min_time per trial.
+
+Usage:
+    python benchmarks/bench_kernels.py run --output benchmarks/baselines/main.json
+    python benchmarks/bench_kernels.py run --quick --filter greedy_lpt --output /tmp/new.json
+    python benchmarks/bench_kernels.py compare benchmarks/baselines/main.json /tmp/new.json --threshold 0.10
+"""
+import argparse
+import datetime
+import glob
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+
+# Aggiungi src al path per gli import
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from instance import Instance
+from algorithms import greedy_lpt_solve, BranchAndBound, IteratedGreedy
+from generator import generate_instance_unrelated
+from result_cache import solver_code_version
+
+DATASET_ROOT = os.path.join("data", "dataset_exam")
+
+# (N, M) presi dal dataset, per entrambe le distribuzioni
+DATASET_GRID = [(10, 2), (20, 4), (100, 10), (500, 20)]
+# Taglie grandi generate al volo: (N, M, seed)
+GENERATED_GRID = [(2000, 20, 9001), (10000, 50, 9002)]
+DISTRIBUTIONS = ["uniform", "job_correlated"]
+
+# Budget dei solver a tempo (s): abbastanza per una stima stabile del throughput
+BNB_BUDGET = 0.5
+IG_BUDGET = 0.5
+BNB_MAX_N = 20
+
+
+def collect_cases(tmp_dir, quick=False):
+    """Ritorna [(case_id, filepath)] della griglia fissa."""
+    cases = []
+    grid = DATASET_GRID[:2] if quick else DATASET_GRID
+    for n, m in grid:
+        for dist in DISTRIBUTIONS:
+            files = glob.glob(os.path.join(DATASET_ROOT, "**", f"inst_{n}_{m}_{dist}_*.txt"), recursive=True)
+            if not files:
+                print(f"⚠️  Nessuna istanza {n}x{m} {dist} in {DATASET_ROOT}: caso saltato")
+                continue
+            # Prima replica = seed minimo (ordinamento numerico)
+            first = min(files, key=lambda p: int(os.path.splitext(p)[0].rsplit('_', 1)[1]))
+            cases.append((f"{n}x{m}_{dist}", first))
+    for n, m, seed in ([] if quick else GENERATED_GRID):
+        for dist in DISTRIBUTIONS:
+            path = generate_instance_unrelated(n, m, seed, dist, tmp_dir)
+            cases.append((f"{n}x{m}_{dist}_gen", path))
+    return cases
+
+
+def measure(fn, trials, warmup, min_time):
+    """
+    Tempo per chiamata di fn(): warmup, poi `trials` trial. In ogni trial fn è ripetuta
+    finché non si accumula almeno min_time (il numero di ripetizioni è fissato al primo trial).
+    """
+    for _ in range(warmup):
+        fn()
+    loops = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time or loops >= 1_000_000:
+            break
+        loops *= 2
+    samples = [elapsed / loops]
+    for _ in range(trials - 1):
+        start = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        samples.append((time.perf_counter() - start) / loops)
+    return samples
+
+
+def measure_rate(fn, trials, warmup):
+    """Throughput di un solver a tempo: fn() ritorna (unità di lavoro, secondi) -> unità/s per trial."""
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(trials):
+        work, elapsed = fn()
+        samples.append(work / elapsed if elapsed > 0 else 0.0)
+    return samples
+
+
+def robust_stats(samples):
+    median = statistics.median(samples)
+    return {"median": median,
+            "mad": statistics.median(abs(x - median) for x in samples),
+            "min": min(samples), "max": max(samples), "trials": len(samples)}
+
+
+def bench_case(case_id, path, trials, warmup, min_time, name_filter=None):
+    """Esegue tutti i kernel su un caso. Ritorna {chiave: record}."""
+    inst = Instance(path)
+    ms_lpt, assign_lpt = greedy_lpt_solve(inst)
+    ig = IteratedGreedy(inst, time_limit=IG_BUDGET)
+    loads_lpt = ig._calculate_loads(assign_lpt)
+
+    def bnb_run():
+        solver = BranchAndBound(inst, time_limit=BNB_BUDGET)
+        start = time.process_time()
+        _, nodes, _ = solver.solve()
+        return nodes, time.process_time() - start
+
+    def ig_run():
+        solver = IteratedGreedy(inst, time_limit=IG_BUDGET)
+        start = time.process_time()
+        _, iters, _ = solver.solve(seed=2024)
+        return iters, time.process_time() - start
+
+    kernels = [
+        ("load_from_file", "s", False, lambda: measure(inst.load_from_file, trials, warmup, min_time)),
+        ("lower_bound", "s", False, lambda: measure(inst.get_theoretical_lower_bound, trials, warmup, min_time)),
+        ("greedy_lpt", "s", False, lambda: measure(lambda: greedy_lpt_solve(inst), trials, warmup, min_time)),
+        # _local_search non modifica gli argomenti: stessa soluzione di partenza a ogni chiamata
+        ("local_search", "s", False, lambda: measure(lambda: ig._local_search(assign_lpt, loads_lpt),
+                                                     trials, warmup, min_time)),
+        ("ig_iterations", "iter/s", True, lambda: measure_rate(ig_run, trials, min(warmup, 1))),
+    ]
+    if inst.num_jobs <= BNB_MAX_N:
+        kernels.append(("bnb_nodes", "nodes/s", True, lambda: measure_rate(bnb_run, trials, min(warmup, 1))))
+
+    results = {}
+    for name, unit, higher_is_better, run in kernels:
+        if name_filter and not any(f in name for f in name_filter):
+            continue
+        rec = robust_stats(run())
+        rec.update(kernel=name, case=case_id, unit=unit, higher_is_better=higher_is_better)
+        results[f"{name}/{case_id}"] = rec
+        print(f"  {name:<15} {case_id:<28} {rec['median']:>14.6g} {unit:<8} (MAD {rec['mad']:.3g})")
+    return results
+
+
+def run_suite(output_path, trials=7, warmup=2, min_time=0.05, quick=False, name_filter=None):
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        cases = collect_cases(tmp_dir, quick)
+        print(f"🏁 Benchmark kernel: {len(cases)} casi, {trials} trial, warmup {warmup}")
+        for case_id, path in cases:
+            results.update(bench_case(case_id, path, trials, warmup, min_time, name_filter))
+
+    baseline = {
+        "meta": {
+            "date": datetime.datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "machine": platform.machine(),
+            "cpu_count": os.cpu_count(),
+            "solver_version": solver_code_version(),
+            "trials": trials, "warmup": warmup, "min_time": min_time,
+        },
+        "results": results,
+    }
+    if os.path.dirname(output_path):
+        os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    with open(output_path, 'w') as f:
+        json.dump(baseline, f, indent=2, sort_keys=True)
+    print(f"💾 Baseline salvata in: {output_path}")
+    return baseline
+
+
+def compare(baseline_path, current_path, threshold=0.10):
+    """
+    Confronta due file di risultati. Regressione = peggioramento della mediana oltre `threshold`
+    (relativo) E oltre il rumore (3 MAD della baseline). Ritorna il numero di regressioni.
+    """
+    with open(baseline_path, 'r') as f:
+        base = json.load(f)
+    with open(current_path, 'r') as f:
+        curr = json.load(f)
+
+    if base["meta"].get("platform") != curr["meta"].get("platform") or \
+            base["meta"].get("python") != curr["meta"].get("python"):
+        print("⚠️  Piattaforma o versione Python diverse: il confronto è solo indicativo")
+
+    regressions = improvements = 0
+    print(f"{'Kernel/Caso':<46} {'Baseline':>12} {'Attuale':>12} {'Delta':>8}")
+    for key in sorted(set(base["results"]) & set(curr["results"])):
+        b, c = base["results"][key], curr["results"][key]
+        if b["median"] == 0:
+            continue
+        change = (c["median"] - b["median"]) / b["median"]
+        worse = -change if b["higher_is_better"] else change  # > 0 = peggiorato
+        noisy = abs(c["median"] - b["median"]) <= 3 * b["mad"]
+        if worse > threshold and not noisy:
+            flag = "❌ REGRESSIONE"
+            regressions += 1
+        elif worse < -threshold and not noisy:
+            flag = "✅ miglioramento"
+            improvements += 1
+        else:
+            flag = ""
+        print(f"{key:<46} {b['median']:>12.5g} {c['median']:>12.5g} {change:>+8.1%} {flag}")
+
+    only_base = set(base["results"]) - set(curr["results"])
+    if only_base:
+        print(f"⚠️  {len(only_base)} misure presenti solo nella baseline")
+    print(f"\n📊 {regressions} regressioni, {improvements} miglioramenti (soglia {threshold:.0%})")
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Micro-benchmark dei kernel dei solver")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_run = sub.add_parser("run", help="Esegue la suite e salva i risultati in JSON")
+    p_run.add_argument("--output", type=str, required=True, help="File JSON dei risultati (baseline)")
+    p_run.add_argument("--trials", type=int, default=7)
+    p_run.add_argument("--warmup", type=int, default=2)
+    p_run.add_argument("--min-time", type=float, default=0.05, help="Durata minima di un trial (s)")
+    p_run.add_argument("--quick", action="store_true", help="Solo le istanze small del dataset")
+    p_run.add_argument("--filter", type=str, default=None,
+                       help="Kernel da eseguire, separati da virgola (es. 'greedy_lpt,bnb_nodes')")
+
+    p_cmp = sub.add_parser("compare", help="Confronta risultati con una baseline")
+    p_cmp.add_argument("baseline", type=str)
+    p_cmp.add_argument("current", type=str)
+    p_cmp.add_argument("--threshold", type=float, default=0.10, help="Peggioramento relativo tollerato")
+
+    args = parser.parse_args()
+    if args.command == "run":
+        run_suite(args.output, args.trials, args.warmup, args.min_time, args.quick,
+                  args.filter.split(',') if args.filter else None)
+    else:
+        sys.exit(1 if compare(args.baseline, args.current, args.threshold) else 0)
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Harness di scalabilità della pipeline sperimentale (run_experiment con --workers).
+
+Campagna sintetica fissa: istanze generate con generator.py (seed fissi) in una cartella
+temporanea, eseguite con IG a time limit fisso (CPU time): ogni task costa lo stesso lavoro,
+quindi le deviazioni dallo scaling ideale misurano l'overhead della pipeline, non il carico.
+
+    strong: stesso set di istanze, 1, 2, 4, ... N worker   -> speedup = T1/Tp, efficienza = T1/(p*Tp)
+    weak:   istanze proporzionali ai worker (per_worker*p) -> efficienza = T1/Tp
+
+Per ogni punto il trace (tracing.py) fornisce la ripartizione dei tempi:
+    LoadTime       parsing istanze + lower bound (somma sui task)
+    SolveTime      solve (somma sui task)
+    Overhead       p * wall - LoadTime - SolveTime (avvio pool, IPC, worker inattivi)
+    MeanQueueWait  attesa media di un task tra l'inizio dell'esecuzione e il suo avvio
+
+Usage:
+    python benchmarks/scaling.py                                  # strong + weak, fino a os.cpu_count()
+    python benchmarks/scaling.py --mode strong --workers 1 2 4 8 --instances 32
+    python benchmarks/scaling.py --output results/generated/csv/scaling_results.csv --no-plot
+"""
+import argparse
+import contextlib
+import csv
+import io
+import json
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from generator import generate_instance_unrelated
+from runner import run_experiment
+import tracing
+
+SCALING_FIELDS = ["Mode", "Workers", "Instances", "Tasks", "Wall", "Throughput", "Speedup", "Efficiency",
+                  "LoadTime", "SolveTime", "Overhead", "MeanQueueWait", "CPUCount"]
+
+DISTRIBUTIONS = ["uniform", "job_correlated"]
+BASE_SEED = 7000
+
+
+def default_worker_counts():
+    """1, 2, 4, ... fino al numero di core (incluso)."""
+    cpus = os.cpu_count() or 1
+    counts = [1]
+    while counts[-1] * 2 <= cpus:
+        counts.append(counts[-1] * 2)
+    if counts[-1] != cpus:
+        counts.append(cpus)
+    return counts
+
+
+def make_dataset(root, count, n, m):
+    """Genera `count` istanze n x m (distribuzioni alternate, seed consecutivi)."""
+    for i in range(count):
+        generate_instance_unrelated(n, m, BASE_SEED + i, DISTRIBUTIONS[i % len(DISTRIBUTIONS)], root)
+    return root
+
+
+def make_config(work_dir, name, dataset_root, n, m, ig_time):
+    """Config nel formato experiments/*.json per la campagna sintetica."""
+    config = {
+        "experiment_name": name,
+        "output_file": os.path.join(work_dir, "csv", f"{name}.csv"),
+        "dataset_root": dataset_root,
+        "parameters": {"n_values": [n], "m_values": [m], "distributions": DISTRIBUTIONS},
+        "algorithms": {"iterated_greedy": {"time_limit": ig_time, "d": 4, "T_lambda": 0.5}},
+    }
+    config_path = os.path.join(work_dir, f"{name}.json")
+    with open(config_path, 'w') as f:
+        json.dump(config, f, indent=2)
+    return config_path
+
+
+def breakdown(trace_path, run):
+    """Ripartizione dei tempi di un run dal trace JSONL."""
+    load = solve = 0.0
+    exec_ts = None
+    task_start = {}
+    with open(trace_path, 'r') as f:
+        for line in f:
+            rec = json.loads(line)
+            if rec.get('run') != run:
+                continue
+            if rec['name'] == "execute":
+                exec_ts = rec['ts']
+            elif rec['name'] in ("instance_parse", "lower_bound"):
+                load += rec['wall']
+            elif rec['name'] == "solve":
+                solve += rec['wall']
+            task = rec.get('task')
+            if task is not None:
+                task_start[task] = min(task_start.get(task, rec['ts']), rec['ts'])
+    waits = [ts - exec_ts for ts in task_start.values()] if exec_ts is not None else []
+    return load, solve, (sum(waits) / len(waits) if waits else 0.0)
+
+
+def run_point(work_dir, mode, workers, instances, n, m, ig_time):
+    """Esegue un punto della curva e ritorna la riga CSV (senza Speedup/Efficiency)."""
+    dataset_root = os.path.join(work_dir, "data", f"{instances}")
+    if not os.path.exists(dataset_root):
+        make_dataset(dataset_root, instances, n, m)
+    name = f"scaling_{mode}_w{workers}_i{instances}"
+    config_path = make_config(work_dir, name, dataset_root, n, m, ig_time)
+
+    trace_path = os.path.join(work_dir, "trace.jsonl")
+    tracing.configure(trace_path=trace_path, run=name)
+    try:
+        # L'output del runner non serve: stampiamo solo il riepilogo del punto
+        with contextlib.redirect_stdout(io.StringIO()):
+            stats = run_experiment(config_path, workers=workers)
+    finally:
+        tracing.configure()
+    load, solve, wait = breakdown(trace_path, name)
+
+    wall = stats['actual_makespan']
+    row = {"Mode": mode, "Workers": workers, "Instances": instances, "Tasks": stats['executed'],
+           "Wall": wall, "Throughput": stats['executed'] / wall if wall > 0 else 0.0,
+           "LoadTime": load, "SolveTime": solve, "Overhead": workers * wall - load - solve,
+           "MeanQueueWait": wait, "CPUCount": os.cpu_count()}
+    print(f"  {mode:<6} p={workers:<3} istanze={instances:<5} wall={wall:7.2f}s "
+          f"throughput={row['Throughput']:7.2f} task/s overhead={row['Overhead']:6.2f}s")
+    return row
+
+
+def run_scaling(modes, worker_counts, instances, per_worker, n, m, ig_time, output_file):
+    rows = []
+    with tempfile.TemporaryDirectory() as work_dir:
+        for mode in modes:
+            print(f"📈 Scaling {mode}: worker {worker_counts}")
+            curve = []
+            for p in worker_counts:
+                count = instances if mode == "strong" else per_worker * p
+                curve.append(run_point(work_dir, mode, p, count, n, m, ig_time))
+            base = curve[0]
+            for row in curve:
+                ratio = base['Wall'] / row['Wall'] if row['Wall'] > 0 else 0.0
+                p_ratio = row['Workers'] / base['Workers']
+                if mode == "strong":
+                    row['Speedup'], row['Efficiency'] = ratio, ratio / p_ratio
+                else:
+                    # Weak scaling: speedup "scalato" (lavoro cresciuto di p volte nello stesso tempo)
+                    row['Speedup'], row['Efficiency'] = ratio * p_ratio, ratio
+            rows.extend(curve)
+
+    if os.path.dirname(output_file):
+        os.makedirs(os.path.dirname(output_file), exist_ok=True)
+    with open(output_file, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=SCALING_FIELDS)
+        writer.writeheader()
+        writer.writerows(rows)
+    print(f"📊 Risultati salvati in: {output_file}")
+    return rows
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Strong/weak scaling della pipeline sperimentale")
+    parser.add_argument("--mode", choices=["strong", "weak", "both"], default="both")
+    parser.add_argument("--workers", type=int, nargs="+", default=None,
+                        help="Numeri di worker da provare (default 1, 2, 4, ... cpu_count)")
+    parser.add_argument("--instances", type=int, default=32, help="Istanze della campagna (strong scaling)")
+    parser.add_argument("--per-worker", type=int, default=8, help="Istanze per worker (weak scaling)")
+    parser.add_argument("--n", type=int, default=100, help="Job per istanza")
+    parser.add_argument("--m", type=int, default=10, help="Macchine per istanza")
+    parser.add_argument("--ig-time", type=float, default=0.2, help="Time limit IG per task (s, CPU)")
+    parser.add_argument("--output", type=str, default=os.path.join("results", "generated", "csv", "scaling_results.csv"))
+    parser.add_argument("--no-plot", action="store_true", help="Non generare il grafico")
+    args = parser.parse_args()
+
+    modes = ["strong", "weak"] if args.mode == "both" else [args.mode]
+    run_scaling(modes, sorted(set(args.workers)) if args.workers else default_worker_counts(),
+                args.instances, args.per_worker, args.n, args.m, args.ig_time, args.output)
+
+    if not args.no_plot:
+        sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src', 'plotting'))
+        import plot_scaling
+        plot_scaling.plot(args.output)
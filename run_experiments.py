@@ -8,6 +8,9 @@ Usage:
     python run_experiments.py --pilot              # Solo esperimenti pilot
     python run_experiments.py --config pilot_a     # Esperimento specifico
     python run_experiments.py --generate-plots     # Solo grafici (da dati esistenti)
+    python run_experiments.py --config workhorse --workers 8   # Esecuzione parallela
+    python run_experiments.py --all --trace results/generated/trace.jsonl   # Trace delle fasi
+    python run_experiments.py --startup-profile    # Tempo di import per modalità
     
 Autore: Leonardo Pinterpe
 Corso: Algorithm Engineering
@@ -20,21 +23,20 @@ import sys
 import time
 import datetime
 import importlib
+import importlib.util
+import subprocess
 
 # Aggiungi src al path per gli import
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src')
+PLOTTING_DIR = os.path.join(SRC_DIR, 'plotting')
+sys.path.insert(0, SRC_DIR)
 
+# Solo i moduli del solver: i plot (pandas, matplotlib, seaborn: ~1 s di import) si caricano
+# su richiesta in generate_plots, così i run senza grafici non ne pagano il costo
 from runner import run_experiment
-from path_utils import get_results_paths
+import tracing
 
-# Import plotting modules
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src', 'plotting'))
-
-plot_pilot_a = importlib.import_module('plot_pilot_a')
-plot_pilot_b = importlib.import_module('plot_pilot_b')
-plot_pilot_c = importlib.import_module('plot_pilot_c')
-plot_validation = importlib.import_module('plot_validation')
-plot_workhorse = importlib.import_module('plot_workhorse')
+sys.path.insert(0, PLOTTING_DIR)
 
 # Configurazioni disponibili
 EXPERIMENT_CONFIGS = {
@@ -45,12 +47,19 @@ EXPERIMENT_CONFIGS = {
     'workhorse': 'experiments/workhorse_config.json'
 }
 
+# Nome del modulo di plot per esperimento (import lazy nei worker di plot_build)
 PLOT_MODULES = {
-    'pilot_a': plot_pilot_a,
-    'pilot_b': plot_pilot_b,
-    'pilot_c': plot_pilot_c, 
-    'validation': plot_validation,
-    'workhorse': plot_workhorse
+    'pilot_a': 'plot_pilot_a',
+    'pilot_b': 'plot_pilot_b',
+    'pilot_c': 'plot_pilot_c', 
+    'validation': 'plot_validation',
+    'workhorse': 'plot_workhorse'
+}
+
+# Moduli importati da ogni modalità della CLI (per --startup-profile)
+STARTUP_MODES = {
+    'solver': ['runner', 'instance', 'algorithms', 'tracing'],
+    'plot': ['runner', 'instance', 'algorithms', 'tracing'] + list(PLOT_MODULES.values()),
 }
 
 def print_header(title):
@@ -59,7 +68,7 @@ def print_header(title):
     print(f" {title}")
     print(f"{'='*60}")
 
-def run_single_experiment(experiment_name):
+def run_single_experiment(experiment_name, workers=1, resume=False, measure_memory=False):
     """Esegue un singolo esperimento con logging completo"""
     if experiment_name not in EXPERIMENT_CONFIGS:
         print(f"❌ Esperimento '{experiment_name}' non trovato!")
@@ -77,7 +86,8 @@ def run_single_experiment(experiment_name):
     
     start_time = time.time()
     try:
-        run_experiment(config_path)
+        with tracing.span("experiment", experiment=experiment_name):
+            run_experiment(config_path, workers=workers, resume=resume, measure_memory=measure_memory)
         elapsed = time.time() - start_time
         print(f"✅ Esperimento {experiment_name} completato in {elapsed:.1f}s")
         return True
@@ -86,38 +96,37 @@ def run_single_experiment(experiment_name):
         print(f"❌ Esperimento {experiment_name} fallito dopo {elapsed:.1f}s: {e}")
         return False
 
-def generate_plots(experiment_list=None):
-    """Genera tutti i grafici specificati"""
+def generate_plots(experiment_list=None, workers=None, force=False):
+    """Genera i grafici specificati: solo quelli non aggiornati, in parallelo (vedi plot_build)"""
     if experiment_list is None:
         experiment_list = list(PLOT_MODULES.keys())
     
     print_header("🎨 GENERAZIONE GRAFICI")
     
+    targets = [exp_name for exp_name in experiment_list if exp_name in PLOT_MODULES]
     for exp_name in experiment_list:
         if exp_name not in PLOT_MODULES:
             print(f"⚠️  Plot per '{exp_name}' non disponibile")
-            continue
-            
-        print(f"📊 Generazione plot: {exp_name}")
-        try:
-            PLOT_MODULES[exp_name].plot()
-            print(f"✅ Plot {exp_name} generato")
-        except Exception as e:
-            print(f"❌ Errore plot {exp_name}: {e}")
+    
+    # Import lazy: plot_build è leggero, pandas/matplotlib vengono importati solo nei worker
+    plot_build = importlib.import_module('plot_build')
+    start = time.time()
+    status = plot_build.build(targets, workers=workers, force=force)
+    plot_build.print_build_summary(status)
+    print(f"⏱️  Grafici: {time.time() - start:.1f}s")
 
 def check_environment():
     """Verifica che l'ambiente sia configurato correttamente"""
     print_header("🔍 VERIFICA AMBIENTE")
     
-    # Controlla dipendenze
+    # Controlla dipendenze (find_spec: verifica la presenza senza pagare l'import)
     required_packages = ['pandas', 'matplotlib', 'seaborn', 'numpy']
     missing = []
     
     for pkg in required_packages:
-        try:
-            __import__(pkg)
+        if importlib.util.find_spec(pkg) is not None:
             print(f"✅ {pkg}: installato")
-        except ImportError:
+        else:
             missing.append(pkg)
             print(f"❌ {pkg}: mancante")
     
@@ -143,6 +152,39 @@ def check_environment():
     
     return True
 
+# Librerie pesanti riportate a parte nel profilo di avvio (importate indirettamente dai plot)
+HEAVY_LIBRARIES = ['numpy', 'pandas', 'matplotlib.pyplot', 'seaborn']
+
+def measure_startup(modules):
+    """
+    Import dei moduli in un interprete nuovo con -X importtime (niente cache del processo corrente).
+    Ritorna (totale_ms, {modulo: ms cumulativi}).
+    """
+    code = f"import sys; sys.path[:0] = {[SRC_DIR, PLOTTING_DIR]!r}; " + "; ".join(f"import {m}" for m in modules)
+    start = time.perf_counter()
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                          capture_output=True, text=True, check=True)
+    total_ms = (time.perf_counter() - start) * 1000
+    cumulative = {}
+    for line in proc.stderr.splitlines():
+        # "import time: self [us] | cumulative [us] | package" (package indentato se import annidato)
+        parts = line.split("|")
+        if len(parts) == 3 and parts[1].strip().isdigit():
+            cumulative.setdefault(parts[2].strip(), int(parts[1]) / 1000)
+    return total_ms, cumulative
+
+def print_startup_profile():
+    """Costo di avvio per modalità (interprete + import), misurato in processi nuovi."""
+    print_header("⏱️  STARTUP PROFILE")
+    baseline_ms, _ = measure_startup([])
+    print(f"Interprete vuoto: {baseline_ms:.0f} ms (tempi per modulo cumulativi: includono i moduli che importa)")
+    for mode, modules in STARTUP_MODES.items():
+        total_ms, cumulative = measure_startup(modules)
+        print(f"\n🔹 {mode}: {total_ms:.0f} ms totali (+{total_ms - baseline_ms:.0f} ms rispetto all'interprete vuoto)")
+        for name in modules + HEAVY_LIBRARIES:
+            if name in cumulative:
+                print(f"   {cumulative[name]:8.1f} ms  {name}")
+
 def main():
     parser = argparse.ArgumentParser(
         description="Esecutore principale per esperimenti di scheduling",
@@ -171,12 +213,34 @@ Output:
                        help='Genera solo grafici (senza rieseguire esperimenti)')
     parser.add_argument('--check-env', action='store_true',
                        help='Verifica solo configurazione ambiente')
+    parser.add_argument('--workers', type=int, default=1,
+                       help='Processi paralleli per esperimento (default 1 = sequenziale)')
+    parser.add_argument('--resume', action='store_true',
+                       help='Riprende run interrotti eseguendo solo i task mancanti nel CSV')
+    parser.add_argument('--memory', action='store_true',
+                       help='Aggiunge ai CSV la memoria di picco di ogni run (PeakPyMB, RSSDeltaMB)')
+    parser.add_argument('--trace', type=str, default=None,
+                       help='File JSONL con tempo wall/CPU di ogni fase (esperimenti e plot)')
+    parser.add_argument('--profile', type=str, default=None,
+                       help='Cartella dei profili cProfile dei task (.pstats + summary.txt)')
+    parser.add_argument('--profile-tasks', type=str, default=None,
+                       help="Task da profilare: indici e/o algoritmi separati da virgola (es. 'BnB')")
+    parser.add_argument('--plot-workers', type=int, default=None,
+                       help='Processi paralleli per i grafici (default: 1 per core)')
+    parser.add_argument('--force-plots', action='store_true',
+                       help='Rigenera tutti i grafici, anche quelli già aggiornati')
+    parser.add_argument('--startup-profile', action='store_true',
+                       help='Misura il tempo di import di ogni modalità (solver, plot) e termina')
 
     args = parser.parse_args()
 
     # Header principale
     print_header(f"🧪 SCHEDULING EXPERIMENTS - {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     
+    if args.startup_profile:
+        print_startup_profile()
+        return
+    
     # Se nessun argomento, mostra help
     if not any([args.all, args.pilot, args.config, args.generate_plots, args.check_env]):
         parser.print_help()
@@ -190,6 +254,10 @@ Output:
     if args.check_env:
         print("✅ Ambiente verificato con successo!")
         return
+    
+    if args.trace or args.profile:
+        tracing.configure(args.trace, args.profile,
+                          args.profile_tasks.split(',') if args.profile_tasks else None)
 
     # Esecuzione esperimenti
     experiments_to_run = []
@@ -214,7 +282,8 @@ Output:
         total_start = time.time()
         
         for exp_name in experiments_to_run:
-            if run_single_experiment(exp_name):
+            if run_single_experiment(exp_name, workers=args.workers, resume=args.resume,
+                                     measure_memory=args.memory):
                 success_count += 1
         
         total_elapsed = time.time() - total_start
@@ -224,7 +293,11 @@ Output:
     # Genera plot
     if args.all or args.pilot or args.generate_plots:
         plot_experiments = experiments_to_run if experiments_to_run else list(PLOT_MODULES.keys())
-        generate_plots(plot_experiments)
+        generate_plots(plot_experiments, workers=args.plot_workers, force=args.force_plots)
+    
+    if tracing.enabled():
+        print_header("⏱️  TRACE")
+        tracing.print_trace_summary(args.trace, tracing.run_id())
     
     # Messaggio finale
     print_header("🎉 COMPLETATO")
@@ -0,0 +1,302 @@
+"""
+Aggregazione in streaming dei CSV di risultati: una sola passata riga per riga, memoria limitata
+dal numero di gruppi (non di righe).
+
+Per ogni gruppo e valore:
+    count, mean, var (popolazione, come ResultsStore.aggregate), std, min, max  -> Welford
+    p25, p50, p75                                                               -> quantili
+I quantili sono esatti finché un gruppo ha al più EXACT_LIMIT valori; oltre, gli stimatori P²
+(Jain & Chlamtac, 1985) usano 5 marcatori per quantile, indipendentemente dalla taglia del gruppo.
+
+Stessi nomi di colonna e filtri di ResultsStore (minuscoli, parametri già estratti: d, t_lambda,
+time_limit, warm_start): il CSV e il backend SQLite si interrogano allo stesso modo.
+
+I riepiloghi si salvano in results/generated/summaries/ come CSV, con chiave = hash del CSV di input
++ specifica dell'aggregazione: summarize() li riusa finché il CSV non cambia.
+
+Usage:
+    python src/aggregate.py results/reference/workhorse_results.csv --group-by n m --value gap --filter status=OPTIMAL
+"""
+import argparse
+import csv
+import hashlib
+import json
+import math
+import os
+
+from results_store import QUERY_COLUMNS, parse_params
+
+QUANTILES = (0.25, 0.5, 0.75)
+EXACT_LIMIT = 1000  # valori per gruppo tenuti in memoria prima di passare a P²
+
+SUMMARY_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                           "results", "generated", "summaries")
+
+# Colonna CSV e conversione di ogni colonna interrogabile (le derivate da Params sono a parte)
+_CSV_COLUMNS = {"experiment": ("Experiment", str), "dist": ("Dist", str), "n": ("N", int), "m": ("M", int),
+                "replica": ("Replica", int), "seed": ("Seed", int), "algo": ("Algo", str),
+                "params": ("Params", str), "time": ("Time", float), "obj": ("Obj", float),
+                "status": ("Status", str), "gap": ("Gap", float), "nodes": ("Nodes", lambda v: int(float(v)))}
+_PARAM_COLUMNS = {"d", "t_lambda", "time_limit", "warm_start"}
+
+
+class P2Quantile:
+    """Stimatore P² di un quantile: 5 marcatori (altezze q, posizioni n), memoria costante."""
+
+    def __init__(self, p):
+        self.p = p
+        self.q = []
+        self.n = [0, 1, 2, 3, 4]
+        self.np = [0, 2 * p, 4 * p, 2 + 2 * p, 4]
+        self.dn = [0, p / 2, p, (1 + p) / 2, 1]
+
+    def add(self, x):
+        q, n = self.q, self.n
+        if len(q) < 5:
+            q.append(x)
+            q.sort()
+            return
+        if x < q[0]:
+            q[0] = x
+            k = 0
+        elif x >= q[4]:
+            q[4] = x
+            k = 3
+        else:
+            k = next(i for i in range(4) if q[i] <= x < q[i + 1])
+        for i in range(k + 1, 5):
+            n[i] += 1
+        for i in range(5):
+            self.np[i] += self.dn[i]
+        # Aggiusta i marcatori interni se si sono allontanati dalla posizione desiderata
+        for i in (1, 2, 3):
+            d = self.np[i] - n[i]
+            if (d >= 1 and n[i + 1] - n[i] > 1) or (d <= -1 and n[i - 1] - n[i] < -1):
+                d = 1 if d > 0 else -1
+                qp = q[i] + d / (n[i + 1] - n[i - 1]) * (
+                    (n[i] - n[i - 1] + d) * (q[i + 1] - q[i]) / (n[i + 1] - n[i]) +
+                    (n[i + 1] - n[i] - d) * (q[i] - q[i - 1]) / (n[i] - n[i - 1]))
+                if not q[i - 1] < qp < q[i + 1]:
+                    qp = q[i] + d * (q[i + d] - q[i]) / (n[i + d] - n[i])  # passo lineare
+                q[i] = qp
+                n[i] += d
+
+    def value(self):
+        return self.q[2] if len(self.q) == 5 else _exact_quantile(sorted(self.q), self.p)
+
+
+def _exact_quantile(values, p):
+    """Quantile con interpolazione lineare (default di numpy/pandas) su valori ordinati."""
+    if not values:
+        return None
+    pos = (len(values) - 1) * p
+    lo = math.floor(pos)
+    hi = min(lo + 1, len(values) - 1)
+    return values[lo] + (values[hi] - values[lo]) * (pos - lo)
+
+
+class RunningStats:
+    """Statistiche online di una serie di valori: Welford + quantili (esatti, poi P²)."""
+
+    def __init__(self, quantiles=QUANTILES, exact_limit=EXACT_LIMIT):
+        self.quantiles = quantiles
+        self.exact_limit = exact_limit
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self.buffer = []        # valori esatti finché count <= exact_limit
+        self.estimators = None  # P², creati al superamento del limite
+
+    def add(self, x):
+        self.count += 1
+        delta = x - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (x - self.mean)
+        self.min = min(self.min, x)
+        self.max = max(self.max, x)
+        if self.estimators is not None:
+            for est in self.estimators:
+                est.add(x)
+            return
+        self.buffer.append(x)
+        if len(self.buffer) > self.exact_limit:
+            # Gli stimatori ripercorrono i valori nell'ordine di arrivo, poi il buffer si libera
+            self.estimators = [P2Quantile(p) for p in self.quantiles]
+            for value in self.buffer:
+                for est in self.estimators:
+                    est.add(value)
+            self.buffer = None
+
+    def summary(self):
+        var = self.m2 / self.count
+        out = {"count": self.count, "mean": self.mean, "var": var, "std": math.sqrt(var),
+               "min": self.min, "max": self.max}
+        if self.estimators is None:
+            ordered = sorted(self.buffer)
+            quantiles = [_exact_quantile(ordered, p) for p in self.quantiles]
+        else:
+            quantiles = [est.value() for est in self.estimators]
+        for p, value in zip(self.quantiles, quantiles):
+            out[f"p{round(p * 100):02d}"] = value
+        return out
+
+
+def _matches(value, expected):
+    if isinstance(expected, (list, tuple, set)):
+        return value in expected
+    return value == expected
+
+
+def aggregate_rows(rows, group_by, values, filters=None, quantiles=QUANTILES, exact_limit=EXACT_LIMIT):
+    """
+    Aggrega un iterabile di righe CSV (dict) in una passata.
+    values: nome di colonna (chiavi count, mean, ... come ResultsStore.aggregate) oppure lista
+    (chiavi prefissate: "<valore>_mean", ...). Ritorna lista di dict ordinata per group_by.
+    """
+    single = isinstance(values, str)
+    values = [values] if single else list(values)
+    filters = filters or {}
+    needed = list(dict.fromkeys(list(group_by) + values + list(filters)))
+    for col in needed:
+        if col not in QUERY_COLUMNS:
+            raise ValueError(f"Colonna non valida: {col}")
+    plain = [(col,) + _CSV_COLUMNS[col] for col in needed if col in _CSV_COLUMNS]
+    use_params = any(col in _PARAM_COLUMNS for col in needed)
+    params_cache = {}  # poche stringhe Params distinte: parsing una volta sola
+
+    groups = {}
+    for row in rows:
+        rec = {col: convert(row[name]) for col, name, convert in plain}
+        if use_params:
+            params = row['Params']
+            if params not in params_cache:
+                params_cache[params] = parse_params(params)
+            rec.update(params_cache[params])
+        if not all(_matches(rec[col], expected) for col, expected in filters.items()):
+            continue
+        key = tuple(rec[col] for col in group_by)
+        stats = groups.get(key)
+        if stats is None:
+            stats = groups[key] = [RunningStats(quantiles, exact_limit) for _ in values]
+        for stat, col in zip(stats, values):
+            if rec[col] is not None:
+                stat.add(rec[col])
+
+    out = []
+    # None (es. d assente) in fondo: l'ordinamento resta totale
+    for key in sorted(groups, key=lambda k: tuple((v is None, v) for v in k)):
+        rec = dict(zip(group_by, key))
+        for stat, col in zip(groups[key], values):
+            if stat.count == 0:
+                continue
+            summary = stat.summary()
+            rec.update(summary if single else {f"{col}_{k}": v for k, v in summary.items()})
+        out.append(rec)
+    return out
+
+
+def aggregate_csv(csv_path, group_by, values, filters=None, quantiles=QUANTILES, exact_limit=EXACT_LIMIT):
+    """aggregate_rows su un CSV di risultati letto in streaming."""
+    with open(csv_path, 'r', newline='') as f:
+        return aggregate_rows(csv.DictReader(f), group_by, values, filters, quantiles, exact_limit)
+
+
+def _file_sha256(path):
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+_CODE_VERSION = None
+
+# Sorgenti del calcolo (RunningStats, convertitori, parse_params): se cambiano, i riepiloghi salvati decadono
+CODE_SOURCES = [os.path.abspath(__file__),
+                os.path.join(os.path.dirname(os.path.abspath(__file__)), "results_store.py")]
+
+
+def code_version():
+    """Hash (troncato) dei sorgenti dell'aggregazione."""
+    global _CODE_VERSION
+    if _CODE_VERSION is None:
+        _CODE_VERSION = hashlib.sha256("".join(_file_sha256(p) for p in CODE_SOURCES).encode()).hexdigest()[:16]
+    return _CODE_VERSION
+
+
+def summary_path(csv_path, group_by, values, filters=None, quantiles=QUANTILES, summary_dir=SUMMARY_DIR):
+    """Percorso del riepilogo persistito: chiave = hash del CSV + specifica dell'aggregazione + versione del codice."""
+    spec = json.dumps({"group_by": list(group_by), "values": values, "filters": filters or {},
+                       "quantiles": list(quantiles)}, sort_keys=True, default=list)
+    key = hashlib.sha256((_file_sha256(csv_path) + spec + code_version()).encode()).hexdigest()[:16]
+    stem = os.path.splitext(os.path.basename(csv_path))[0]
+    return os.path.join(summary_dir, f"{stem}.{key}.summary.csv")
+
+
+def save_summary(rows, path):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    fieldnames = list(dict.fromkeys(k for row in rows for k in row))
+    tmp = path + ".tmp"
+    with open(tmp, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames)
+        writer.writeheader()
+        writer.writerows(rows)
+    os.replace(tmp, path)
+
+
+def load_summary(path):
+    """Rilegge un riepilogo: colonne di raggruppamento con il loro tipo, statistiche numeriche."""
+    def convert(col, value):
+        if value == "":
+            return None
+        if col in _CSV_COLUMNS:
+            return _CSV_COLUMNS[col][1](value)
+        if col in ("d", "warm_start", "count") or col.endswith("_count"):
+            return int(value)
+        return float(value)
+    with open(path, 'r', newline='') as f:
+        return [{k: convert(k, v) for k, v in row.items()} for row in csv.DictReader(f)]
+
+
+def summarize(csv_path, group_by, values, filters=None, quantiles=QUANTILES, summary_dir=SUMMARY_DIR):
+    """Riepilogo persistito: riletto se CSV e codice non sono cambiati, altrimenti calcolato e salvato."""
+    path = summary_path(csv_path, group_by, values, filters, quantiles, summary_dir)
+    if os.path.exists(path):
+        return load_summary(path)
+    rows = aggregate_csv(csv_path, group_by, values, filters, quantiles)
+    save_summary(rows, path)
+    return rows
+
+
+def _parse_filter(text):
+    col, _, value = text.partition("=")
+    options = value.split("|")
+    converted = []
+    for option in options:
+        if col in _CSV_COLUMNS:
+            converted.append(_CSV_COLUMNS[col][1](option))
+        else:
+            converted.append(float(option))
+    return col, converted if len(converted) > 1 else converted[0]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Aggregazione in streaming di un CSV di risultati")
+    parser.add_argument("csv", type=str, help="CSV di risultati")
+    parser.add_argument("--group-by", nargs="+", required=True, help="Colonne di raggruppamento (es. n m dist)")
+    parser.add_argument("--value", nargs="+", default=["gap"], help="Colonne da aggregare (default: gap)")
+    parser.add_argument("--filter", nargs="*", default=[], help="Filtri colonna=valore (alternative con |)")
+    parser.add_argument("--save", action="store_true", help="Persiste il riepilogo in results/generated/summaries")
+    args = parser.parse_args()
+
+    values = args.value[0] if len(args.value) == 1 else args.value
+    filters = dict(_parse_filter(f) for f in args.filter)
+    if args.save:
+        rows = summarize(args.csv, args.group_by, values, filters)
+        print(f"💾 Riepilogo: {summary_path(args.csv, args.group_by, values, filters)}")
+    else:
+        rows = aggregate_csv(args.csv, args.group_by, values, filters)
+    for row in rows:
+        print("  " + ", ".join(f"{k}={v:.4g}" if isinstance(v, float) else f"{k}={v}" for k, v in row.items()))
@@ -2,6 +2,9 @@ import time
 import math
 import random
 import copy
+import operator
+import queue
+import threading
 
 # =============================================================================
 # 1. SHARED HEURISTIC (Greedy LPT - Deterministic)
@@ -60,12 +63,18 @@ def greedy_lpt_solve(instance):
 # =============================================================================
 
 class BranchAndBound:
-    def __init__(self, instance, time_limit=60):
+    def __init__(self, instance, time_limit=60, initial_solution=None, on_improvement=None):
         self.instance = instance
         self.time_limit = time_limit
+        # Warm start opzionale: (makespan, assignment) noto, es. dal registro BKS
+        self.initial_solution = initial_solution
+        # Anytime: on_improvement(soluzione) ad ogni nuovo incumbent; se ritorna True la ricerca si ferma
+        self.on_improvement = on_improvement
         self.start_time = 0
         self.nodes_explored = 0
         self.timed_out = False
+        self.stopped = False
+        self.lower_bound = None
         
         self.best_makespan = float('inf')
         self.best_assignment = []
@@ -75,12 +84,23 @@ class BranchAndBound:
         self.start_time = time.process_time()
         self.nodes_explored = 0
         self.timed_out = False
+        self.stopped = False
+        if self.on_improvement is not None:
+            self.lower_bound = self.instance.get_theoretical_lower_bound()
         
         # 1. Hot Start
         ub, assign = greedy_lpt_solve(self.instance)
         self.best_makespan = ub
         self.best_assignment = list(assign)
         
+        # Warm start: se la soluzione nota batte LPT, diventa l'Upper Bound iniziale
+        if self.initial_solution is not None and self.initial_solution[0] < self.best_makespan:
+            self.best_makespan = self.initial_solution[0]
+            self.best_assignment = list(self.initial_solution[1])
+        
+        if self.on_improvement is not None and self._notify():
+            return self.best_makespan, self.nodes_explored, "STOPPED"
+        
         # 2. Ordinamento Job (LPT rule per il branching order)
         n = self.instance.num_jobs
         m = self.instance.num_machines
@@ -100,9 +120,23 @@ class BranchAndBound:
         
         self._recursive_search(0, sorted_job_indices, initial_loads, current_assignment)
         
-        status = "TIMEOUT" if self.timed_out else "OPTIMAL"
+        if self.stopped:
+            status = "STOPPED"
+        else:
+            status = "TIMEOUT" if self.timed_out else "OPTIMAL"
         return self.best_makespan, self.nodes_explored, status
 
+    def _notify(self):
+        """Comunica l'incumbent corrente al chiamante. True = il chiamante chiede lo stop."""
+        stop = bool(self.on_improvement({
+            "makespan": self.best_makespan, "assignment": list(self.best_assignment),
+            "cpu_time": time.process_time() - self.start_time,
+            "lower_bound": self.lower_bound, "nodes": self.nodes_explored}))
+        if stop:
+            # Stesso percorso di uscita del timeout (nessun controllo aggiuntivo nel loop caldo)
+            self.stopped = self.timed_out = True
+        return stop
+
     def _recursive_search(self, step_idx, sorted_jobs, current_loads, current_assignment):
         # Check Timeout ogni 1000 nodi usando process_time
         if self.nodes_explored % 1000 == 0:
@@ -120,6 +154,8 @@ class BranchAndBound:
             if current_max < self.best_makespan:
                 self.best_makespan = current_max
                 self.best_assignment = list(current_assignment)
+                if self.on_improvement is not None:
+                    self._notify()
             return
 
         self.nodes_explored += 1
@@ -149,11 +185,15 @@ class BranchAndBound:
 # =============================================================================
 
 class IteratedGreedy:
-    def __init__(self, instance, time_limit=60, d=4, T_lambda=0.5):
+    def __init__(self, instance, time_limit=60, d=4, T_lambda=0.5, initial_solution=None, on_improvement=None):
         self.instance = instance
         self.time_limit = time_limit
         self.d = d 
         self.T_lambda = T_lambda
+        # Warm start opzionale: (makespan, assignment) noto, es. dal registro BKS
+        self.initial_solution = initial_solution
+        # Anytime: on_improvement(soluzione) ad ogni nuova best; se ritorna True la ricerca si ferma
+        self.on_improvement = on_improvement
         
         self.start_time = 0
         self.best_makespan = float('inf')
@@ -171,6 +211,8 @@ class IteratedGreedy:
         
         # 1. INITIALIZATION (Deterministica LPT)
         curr_makespan, curr_assign = greedy_lpt_solve(self.instance)
+        if self.initial_solution is not None and self.initial_solution[0] < curr_makespan:
+            curr_makespan, curr_assign = self.initial_solution[0], list(self.initial_solution[1])
         curr_loads = self._calculate_loads(curr_assign)
         
         self.best_makespan = curr_makespan
@@ -184,6 +226,8 @@ class IteratedGreedy:
         if temperature == 0: temperature = 0.1
         
         iter_count = 0
+        if self.on_improvement is not None and self._notify(iter_count):
+            return self.best_makespan, iter_count, "HEURISTIC"
         
         # 2. MAIN LOOP
         while (time.process_time() - self.start_time) < self.time_limit:
@@ -246,9 +290,17 @@ class IteratedGreedy:
                 if curr_makespan < self.best_makespan:
                     self.best_makespan = curr_makespan
                     self.best_assignment = list(curr_assign)
+                    if self.on_improvement is not None and self._notify(iter_count):
+                        break
                     
         return self.best_makespan, iter_count, "HEURISTIC"
 
+    def _notify(self, iter_count):
+        """Comunica la best corrente al chiamante. True = il chiamante chiede lo stop."""
+        return bool(self.on_improvement({
+            "makespan": self.best_makespan, "assignment": list(self.best_assignment),
+            "cpu_time": time.process_time() - self.start_time, "iteration": iter_count}))
+
     def _calculate_loads(self, assignment):
         loads = [0] * self.instance.num_machines
         for j, m in enumerate(assignment):
@@ -340,3 +392,113 @@ class PureBruteForce:
             
             # Backtrack
             current_loads[m] -= time_p
+
+
+class TwoMachineDP:
+    """
+    Solver ESATTO pseudo-polinomiale per R2||Cmax (solo M = 2).
+    Stato: carico L della macchina 0 -> carico minimo della macchina 1 (f[L]).
+    Ogni job va su 0 (L += p_0j) oppure su 1 (f[L] += p_1j): O(N * UB) lavoro, con UB = makespan LPT
+    (gli stati con L > UB non possono migliorare l'incumbent e vengono tagliati).
+    I passi sono operazioni su liste intere (map/min), non loop Python sugli stati.
+    """
+    def __init__(self, instance):
+        if instance.num_machines != 2:
+            raise ValueError(f"TwoMachineDP richiede M=2, trovate {instance.num_machines} macchine")
+        self.instance = instance
+        self.best_makespan = float('inf')
+        self.best_assignment = []
+        self.states = 0  # stati raggiungibili generati (somma sugli N passi)
+
+    def solve(self):
+        inf = float('inf')
+        n = self.instance.num_jobs
+        p0, p1 = self.instance.processing_times
+        ub, _ = greedy_lpt_solve(self.instance)
+        self.states = 0
+
+        f = [0]          # f[L] dopo i job già decisi
+        choices = []     # choices[j][L] = 1 se nello stato L il job j è sulla macchina 0
+        for j in range(n):
+            a, b = p0[j], p1[j]
+            size = min(len(f) + a, ub + 1)
+            on_1 = [x + b for x in f[:size]] + [inf] * (size - len(f))
+            on_0 = ([inf] * a + f)[:size]
+            f = list(map(min, on_1, on_0))
+            choices.append(bytes(map(operator.lt, on_0, on_1)))
+            self.states += size - f.count(inf)
+
+        # Ottimo: min_L max(L, f[L]); a parità vince il carico L minore (deterministico)
+        best_load = min(range(len(f)), key=lambda L: (max(L, f[L]), L))
+        self.best_makespan = max(best_load, f[best_load])  # finito: la soluzione LPT ha L <= UB
+
+        # Ricostruzione all'indietro dalle scelte salvate
+        assignment = [1] * n
+        load = best_load
+        for j in range(n - 1, -1, -1):
+            if choices[j][load]:
+                assignment[j] = 0
+                load -= p0[j]
+        self.best_assignment = assignment
+        return self.best_makespan, self.states, "OPTIMAL"
+
+
+# =============================================================================
+# 4. ANYTIME API (generatore sulle soluzioni miglioranti)
+# =============================================================================
+
+def iter_improvements(solver, *args, **kwargs):
+    """
+    Generatore anytime su BranchAndBound o IteratedGreedy: produce ogni soluzione migliorante
+    (dict con makespan, assignment, cpu_time; per il B&B anche lower_bound e nodes).
+
+    solver.solve(*args, **kwargs) gira in un thread che resta SOSPESO a ogni miglioramento
+    finché il chiamante non chiede il successivo: uscire dal for (break / close()) ferma la
+    ricerca in modo cooperativo. Consumato fino in fondo dà lo stesso risultato di solve(),
+    che è anche il valore di ritorno del generatore (StopIteration.value).
+    Nota: i solver misurano process_time del processo, quindi il lavoro del chiamante tra due
+    yield consuma il time limit.
+    """
+    handoff = queue.Queue(maxsize=1)
+    resume = threading.Event()
+    state = {"stop": False}
+    previous = solver.on_improvement
+
+    def callback(solution):
+        if previous is not None and previous(solution):
+            return True
+        handoff.put(("improvement", solution))
+        resume.wait()
+        resume.clear()
+        return state["stop"]
+
+    outcome = {}
+
+    def run():
+        try:
+            outcome["result"] = solver.solve(*args, **kwargs)
+        except BaseException as e:
+            outcome["error"] = e
+        finally:
+            handoff.put(("done", None))
+
+    solver.on_improvement = callback
+    worker = threading.Thread(target=run, daemon=True)
+    worker.start()
+    try:
+        while True:
+            kind, solution = handoff.get()
+            if kind == "done":
+                break
+            yield solution
+            resume.set()
+    finally:
+        if worker.is_alive():
+            # Chiusura anticipata: sblocca il solver chiedendo lo stop
+            state["stop"] = True
+            resume.set()
+            worker.join()
+        solver.on_improvement = previous
+    if "error" in outcome:
+        raise outcome["error"]
+    return outcome["result"]
@@ -0,0 +1,151 @@
+"""
+Costruzione LPT, lower bound e statistiche per job su MIGLIAIA di istanze in un colpo solo (NumPy).
+
+Le istanze sono impilate in un array B x M x N (forme diverse: padding + maschere) e ogni passo
+dell'LPT è vettorizzato sul batch: il loop Python è sugli N passi, non su B * N * M.
+Tie-breaking IDENTICO agli scalari di algorithms.py / instance.py:
+    - ordine dei job: media decrescente, a parità Job ID decrescente
+      (sorted(..., key=(media, id), reverse=True)); media = somma/M, quindi si ordina per somma
+    - macchina: la prima (indice minore) che minimizza carico + p  (confronto stretto <)
+    - LB = max(max_j min_i p_ij, ceil(sum_j min_i p_ij / M)) con la stessa divisione float
+
+Usage:
+    python src/batch.py data/dataset_exam --csv results/generated/csv/triage.csv
+"""
+import argparse
+import csv
+import glob
+import os
+
+import numpy as np
+
+# Tempo "infinito" per le macchine di padding: mai scelte, mai minime
+_PAD_TIME = np.iinfo(np.int64).max // 4
+
+
+def load_matrix(filepath):
+    """Parsing veloce di un file istanza in un array M x N (int64), stesse verifiche di Instance."""
+    with open(filepath, 'r') as f:
+        lines = [l for l in f if l.strip() and not l.startswith('#')]
+    try:
+        n, m = (int(v) for v in lines[0].split()[:2])
+    except (IndexError, ValueError):
+        raise ValueError(f"Header non valido nel file: {filepath}")
+    values = np.array(" ".join(lines[1:]).split(), dtype=np.int64)
+    if len(lines) - 1 != m or values.size != n * m:
+        raise ValueError(f"Matrice {filepath}: attesi {m}x{n} valori, trovati {values.size}")
+    return values.reshape(m, n)
+
+
+def stack_instances(matrices):
+    """
+    Impila matrici M x N (array, liste o oggetti Instance) in un batch con padding.
+    Ritorna (P, num_machines, num_jobs): P è B x Mmax x Nmax int64; le macchine di padding hanno
+    tempo _PAD_TIME, i job di padding tempo 0 sulle macchine reali.
+    """
+    arrays = [np.asarray(getattr(mat, 'processing_times', mat), dtype=np.int64) for mat in matrices]
+    num_machines = np.array([a.shape[0] for a in arrays], dtype=np.int64)
+    num_jobs = np.array([a.shape[1] for a in arrays], dtype=np.int64)
+    if len(set(a.shape for a in arrays)) == 1:
+        return np.stack(arrays), num_machines, num_jobs
+    P = np.zeros((len(arrays), num_machines.max(), num_jobs.max()), dtype=np.int64)
+    for b, a in enumerate(arrays):
+        P[b, :a.shape[0], :a.shape[1]] = a
+        P[b, a.shape[0]:, :] = _PAD_TIME
+    return P, num_machines, num_jobs
+
+
+def _masks(P, num_machines, num_jobs):
+    B, M, N = P.shape
+    if num_machines is None:
+        num_machines = np.full(B, M, dtype=np.int64)
+    if num_jobs is None:
+        num_jobs = np.full(B, N, dtype=np.int64)
+    machine_mask = np.arange(M)[None, :] < num_machines[:, None]  # B x M
+    job_mask = np.arange(N)[None, :] < num_jobs[:, None]          # B x N
+    return num_machines, num_jobs, machine_mask, job_mask
+
+
+def job_statistics(P, num_machines=None, num_jobs=None):
+    """Statistiche per job (B x N): somma, media, min, max e macchina più veloce (prima a parità)."""
+    num_machines, num_jobs, machine_mask, job_mask = _masks(P, num_machines, num_jobs)
+    real = machine_mask[:, :, None]
+    job_sum = np.where(real, P, 0).sum(axis=1)
+    return {
+        "sum": job_sum,
+        "mean": job_sum / num_machines[:, None],
+        "min": P.min(axis=1),  # le macchine di padding hanno _PAD_TIME: mai minime
+        "max": np.where(real, P, np.iinfo(np.int64).min).max(axis=1),
+        "argmin": P.argmin(axis=1),
+        "job_mask": job_mask,
+    }
+
+
+def batch_lower_bounds(P, num_machines=None, num_jobs=None):
+    """Lower bound di Fleszar & Hindi per ogni istanza (array B int64), come Instance.get_theoretical_lower_bound."""
+    num_machines, num_jobs, _, job_mask = _masks(P, num_machines, num_jobs)
+    min_times = np.where(job_mask, P.min(axis=1), 0)
+    lb1 = min_times.max(axis=1)
+    # Stessa aritmetica dello scalare: math.ceil(total / m) con divisione float64
+    lb2 = np.ceil(min_times.sum(axis=1) / num_machines).astype(np.int64)
+    return np.maximum(lb1, lb2)
+
+
+def batch_lpt(P, num_machines=None, num_jobs=None):
+    """
+    greedy_lpt_solve su tutto il batch. Ritorna (makespan B, assignment B x N); i job di padding
+    hanno assignment -1.
+    """
+    B, M, N = P.shape
+    num_machines, num_jobs, machine_mask, job_mask = _masks(P, num_machines, num_jobs)
+    job_sum = np.where(machine_mask[:, :, None], P, 0).sum(axis=1)
+
+    # Ordine: somma decrescente, a parità Job ID decrescente (= ordinamento crescente su (-somma, -id)).
+    # I job di padding vanno in fondo (chiave -1 < qualunque somma reale >= 0).
+    key_sum = np.where(job_mask, job_sum, -1)
+    job_ids = np.broadcast_to(np.arange(N), (B, N))
+    order = np.lexsort((-job_ids, -key_sum), axis=1)  # ultima chiave = primaria
+
+    loads = np.zeros((B, M), dtype=np.int64)
+    assignment = np.full((B, N), -1, dtype=np.int64)
+    rows = np.arange(B)
+    for step in range(N):
+        jobs = order[:, step]
+        p = P[rows, :, jobs]                   # B x M
+        machines = np.argmin(loads + p, axis=1)  # argmin = primo indice minimo (come il < stretto)
+        loads[rows, machines] += p[rows, machines]
+        assignment[rows, jobs] = machines
+
+    assignment[~job_mask] = -1
+    makespan = np.where(machine_mask, loads, 0).max(axis=1)
+    return makespan, assignment
+
+
+def triage(paths):
+    """LB, LPT e rapporto LPT/LB per una lista di file istanza."""
+    P, num_machines, num_jobs = stack_instances([load_matrix(p) for p in paths])
+    lb = batch_lower_bounds(P, num_machines, num_jobs)
+    makespan, _ = batch_lpt(P, num_machines, num_jobs)
+    return [{"File": os.path.basename(path), "N": int(n), "M": int(m), "LB": int(l), "LPT": int(c),
+             "Ratio": c / l if l > 0 else float('nan')}
+            for path, n, m, l, c in zip(paths, num_jobs, num_machines, lb, makespan)]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Triage vettorizzato (LB + LPT) di un insieme di istanze")
+    parser.add_argument("root", type=str, help="Cartella con i file inst_*.txt (ricorsiva)")
+    parser.add_argument("--csv", type=str, default=None, help="Salva il triage in CSV")
+    args = parser.parse_args()
+
+    paths = sorted(glob.glob(os.path.join(args.root, "**", "*.txt"), recursive=True))
+    rows = triage(paths)
+    ratios = [r['Ratio'] for r in rows]
+    print(f"📦 {len(rows)} istanze: LPT/LB medio {np.mean(ratios):.4f}, max {np.max(ratios):.4f}")
+    if args.csv:
+        if os.path.dirname(args.csv):
+            os.makedirs(os.path.dirname(args.csv), exist_ok=True)
+        with open(args.csv, 'w', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=list(rows[0].keys()))
+            writer.writeheader()
+            writer.writerows(rows)
+        print(f"📊 Triage salvato in: {args.csv}")
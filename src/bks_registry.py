@@ -0,0 +1,110 @@
+"""
+Registro persistente delle Best Known Solutions (BKS) su SQLite (solo stdlib).
+
+Chiave: hash del contenuto dell'istanza (Instance.content_hash), quindi il registro
+sopravvive a rinomine/spostamenti dei file e viene condiviso tra esperimenti diversi.
+Per ogni istanza salva: miglior makespan, assegnamento, stato di ottimalità dimostrata
+e provenienza (algoritmo, parametri, esperimento, timestamp).
+"""
+import datetime
+import json
+import os
+import sqlite3
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS best_known (
+    instance_hash  TEXT PRIMARY KEY,
+    instance_name  TEXT,
+    num_jobs       INTEGER,
+    num_machines   INTEGER,
+    makespan       INTEGER NOT NULL,
+    assignment     TEXT,
+    proven_optimal INTEGER NOT NULL DEFAULT 0,
+    source         TEXT,
+    experiment     TEXT,
+    updated_at     TEXT
+)
+"""
+
+
+class BestKnownRegistry:
+    def __init__(self, db_path):
+        self.db_path = db_path
+        if os.path.dirname(db_path):
+            os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        # isolation_level=None: gestiamo noi le transazioni (BEGIN IMMEDIATE)
+        self.conn = sqlite3.connect(db_path, timeout=60, isolation_level=None)
+        self.conn.execute(SCHEMA)
+
+    def get(self, instance_hash):
+        """Ritorna il record BKS come dict, oppure None se l'istanza non è registrata."""
+        row = self.conn.execute(
+            "SELECT makespan, assignment, proven_optimal, source, experiment, updated_at "
+            "FROM best_known WHERE instance_hash = ?", (instance_hash,)).fetchone()
+        if row is None:
+            return None
+        return {
+            "makespan": row[0],
+            "assignment": json.loads(row[1]) if row[1] else None,
+            "proven_optimal": bool(row[2]),
+            "source": row[3],
+            "experiment": row[4],
+            "updated_at": row[5],
+        }
+
+    def get_optimum(self, instance_hash):
+        """Makespan ottimo dimostrato (o None se l'ottimo non è certificato)."""
+        rec = self.get(instance_hash)
+        if rec is not None and rec["proven_optimal"]:
+            return rec["makespan"]
+        return None
+
+    def update(self, instance, makespan, assignment, proven_optimal, source, experiment=""):
+        """
+        Aggiorna il registro se la soluzione migliora quella salvata.
+        - makespan strettamente migliore -> sostituisce il record
+        - stesso makespan -> eredita il flag di ottimalità e completa l'assegnamento mancante
+        L'assegnamento può essere None (es. Brute Force, che non lo ricostruisce).
+        Ritorna True se il record è stato modificato.
+        """
+        return self.update_record(instance.content_hash(), os.path.basename(instance.filepath), instance.num_jobs,
+                                  instance.num_machines, makespan, assignment, proven_optimal, source, experiment)
+
+    def update_record(self, key, name, num_jobs, num_machines, makespan, assignment, proven_optimal, source,
+                      experiment=""):
+        """Come update(), a partire da hash e dimensioni già noti (senza caricare l'istanza)."""
+        now = datetime.datetime.now().isoformat(timespec='seconds')
+        assign_json = json.dumps(list(assignment)) if assignment else None
+        makespan = int(makespan)
+
+        # BEGIN IMMEDIATE: read-modify-write atomico anche con più processi sullo stesso DB
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = self.conn.execute(
+                "SELECT makespan, assignment, proven_optimal FROM best_known WHERE instance_hash = ?",
+                (key,)).fetchone()
+
+            if row is None or makespan < row[0]:
+                if row is not None and row[2]:
+                    print(f"⚠️ Warning: BKS {row[0]} marcata ottima ma migliorata a {makespan} ({name})")
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO best_known VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (key, name, num_jobs, num_machines,
+                     makespan, assign_json, int(bool(proven_optimal)), source, experiment, now))
+                changed = True
+            elif makespan == row[0] and ((proven_optimal and not row[2]) or (assign_json and not row[1])):
+                self.conn.execute(
+                    "UPDATE best_known SET proven_optimal = ?, assignment = COALESCE(assignment, ?), "
+                    "source = ?, experiment = ?, updated_at = ? WHERE instance_hash = ?",
+                    (int(bool(proven_optimal) or bool(row[2])), assign_json, source, experiment, now, key))
+                changed = True
+            else:
+                changed = False
+            self.conn.execute("COMMIT")
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
+        return changed
+
+    def close(self):
+        self.conn.close()
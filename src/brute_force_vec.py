@@ -0,0 +1,139 @@
+"""
+Brute Force esaustivo vettorizzato (NumPy): stessa semantica di PureBruteForce ("nessun pruning,
+si conta tutto"), ma lo spazio degli assegnamenti è percorso a blocchi invece che un nodo per chiamata.
+
+Un assegnamento è un indice a in [0, M^N) in base mista M: la cifra j (a // M^j) % M è la macchina
+del job j. Le K cifre basse (job 0..K-1) variano dentro un blocco di M^K indici consecutivi: i loro
+vettori di carico sono una tabella M x M^K calcolata una volta. Le cifre alte identificano il blocco:
+si decodificano a gruppi di blocchi in carichi di "prefisso" (B x M). Il makespan di un blocco è
+min_a max_i (prefisso_i + tabella_i[a]), ridotto con operazioni su array interi.
+
+I blocchi si possono dividere tra più processi (intervalli contigui di indici di blocco).
+Nodi contati: tutte le M^N foglie enumerate + i nodi interni dell'albero (sum_{d<N} M^d),
+lo stesso conteggio di PureBruteForce.
+
+Usage:
+    python src/brute_force_vec.py data/dataset_exam/small/uniform/inst_14_4_uniform_2094.txt --workers 2
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+# Foglie per blocco (M^K) e per gruppo di blocchi elaborato in un colpo: memoria ~ M x GROUP_LEAVES int32
+BLOCK_LEAVES = 1 << 16
+GROUP_LEAVES = 1 << 20
+
+
+def _digits(indices, start_job, num_jobs, m):
+    """Cifre in base m degli indici, per i job start_job..start_job+num_jobs-1 (shape num_jobs x len)."""
+    out = np.empty((num_jobs, len(indices)), dtype=np.int64)
+    rest = indices.copy()
+    for j in range(num_jobs):
+        out[j] = rest % m
+        rest //= m
+    return out
+
+
+def _loads(matrix, digits, first_job):
+    """Carichi (M x len) degli assegnamenti parziali descritti da digits (job first_job, ...)."""
+    m = matrix.shape[0]
+    loads = np.zeros((m, digits.shape[1]), dtype=np.int32)
+    for offset, machines in enumerate(digits):
+        times = matrix[:, first_job + offset]
+        for i in range(m):
+            loads[i] += np.where(machines == i, times[i], 0).astype(np.int32)
+    return loads
+
+
+def _block_jobs(n, m):
+    """K: cifre basse per blocco, il massimo con M^K <= BLOCK_LEAVES (almeno 1, al più N)."""
+    k = 0
+    while k < n and m ** (k + 1) <= BLOCK_LEAVES:
+        k += 1
+    return max(min(k, n), min(1, n))
+
+
+def _search_blocks(matrix, k, first_block, last_block):
+    """
+    Enumera i blocchi [first_block, last_block). Ritorna (makespan minimo, indice dell'assegnamento
+    ottimo, foglie enumerate). Eseguibile in un processo worker (argomenti picklabili).
+    """
+    m, n = matrix.shape
+    suffix = _loads(matrix, _digits(np.arange(m ** k, dtype=np.int64), 0, k, m), 0)
+    block_size = m ** k
+    per_group = max(1, GROUP_LEAVES // block_size)
+
+    best, best_index, leaves = None, None, 0
+    for start in range(first_block, last_block, per_group):
+        blocks = np.arange(start, min(start + per_group, last_block), dtype=np.int64)
+        prefix = _loads(matrix, _digits(blocks, k, n - k, m), k)  # M x B
+        # makespan[b, a] = max_i (prefix[i, b] + suffix[i, a])
+        span = prefix[0][:, None] + suffix[0][None, :]
+        for i in range(1, m):
+            np.maximum(span, prefix[i][:, None] + suffix[i][None, :], out=span)
+        flat = int(np.argmin(span))
+        value = int(span.flat[flat])
+        leaves += span.size
+        if best is None or value < best:
+            b, a = divmod(flat, block_size)
+            best, best_index = value, int(blocks[b]) * block_size + a
+    return best, best_index, leaves
+
+
+class VectorizedBruteForce:
+    def __init__(self, instance, workers=1):
+        self.instance = instance
+        self.workers = workers
+        self.best_makespan = float('inf')
+        self.best_assignment = []
+        self.nodes_visited = 0
+
+    def solve(self):
+        n, m = self.instance.num_jobs, self.instance.num_machines
+        matrix = np.array([list(row) for row in self.instance.processing_times], dtype=np.int32).reshape(m, n)
+        k = _block_jobs(n, m)
+        num_blocks = m ** (n - k)
+
+        workers = max(1, min(self.workers, num_blocks))
+        bounds = [num_blocks * w // workers for w in range(workers + 1)]
+        ranges = [(bounds[w], bounds[w + 1]) for w in range(workers) if bounds[w] < bounds[w + 1]]
+        if len(ranges) == 1:
+            parts = [_search_blocks(matrix, k, *ranges[0])]
+        else:
+            from concurrent.futures import ProcessPoolExecutor
+            with ProcessPoolExecutor(max_workers=len(ranges)) as pool:
+                parts = list(pool.map(_search_blocks, *zip(*[(matrix, k, lo, hi) for lo, hi in ranges])))
+
+        # A parità di makespan vince l'indice minore (intervalli in ordine): risultato indipendente dai worker
+        best, best_index, _ = min(parts, key=lambda p: (p[0], p[1]))
+        leaves = sum(p[2] for p in parts)
+        internal = sum(m ** d for d in range(n))
+        self.best_makespan = best
+        self.best_assignment = [(best_index // m ** j) % m for j in range(n)]
+        self.nodes_visited = internal + leaves
+        return self.best_makespan, self.nodes_visited
+
+
+if __name__ == "__main__":
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    from instance import Instance
+    from algorithms import PureBruteForce
+
+    parser = argparse.ArgumentParser(description="Brute Force vettorizzato a blocchi")
+    parser.add_argument("instance", type=str, help="File istanza")
+    parser.add_argument("--workers", type=int, default=1, help="Processi (default: 1)")
+    parser.add_argument("--compare", action="store_true", help="Confronta con PureBruteForce (lento)")
+    args = parser.parse_args()
+
+    inst = Instance(args.instance)
+    start = time.perf_counter()
+    makespan, nodes = VectorizedBruteForce(inst, workers=args.workers).solve()
+    print(f"🔢 Vettorizzato: makespan={makespan}, nodi={nodes}, {time.perf_counter() - start:.2f}s")
+    if args.compare:
+        start = time.perf_counter()
+        ref_makespan, ref_nodes = PureBruteForce(inst).solve()
+        print(f"🐢 Ricorsivo:    makespan={ref_makespan}, nodi={ref_nodes}, {time.perf_counter() - start:.2f}s")
+        print("✅ Identici" if (makespan, nodes) == (ref_makespan, ref_nodes) else "❌ Diversi")
@@ -1,17 +1,25 @@
 import os
 import math
+import hashlib
 
 class Instance:
-    def __init__(self, filepath):
+    def __init__(self, filepath, storage="list", backing_path=None):
         self.filepath = filepath
         self.num_jobs = 0
         self.num_machines = 0
         # Matrice MxN: processing_times[machine][job]
         # (Nota: abbiamo invertito rispetto a prima per allinearci al generator)
+        # Con storage "array"/"mmap" ogni riga è una memoryview int32 (stessa indicizzazione [i][j])
         self.processing_times = [] 
+        self._content_hash = None
+        self._buffer = None  # array/mmap che tiene in vita le righe compatte
+        self._job_min = None  # min_i p_ij per job, se già calcolato altrove (es. memoria condivisa)
         
         # Caricamento automatico
-        self.load_from_file()
+        if storage == "list":
+            self.load_from_file()
+        else:
+            self.load_compact(storage, backing_path)
 
     def load_from_file(self):
         if not os.path.exists(self.filepath):
@@ -31,6 +39,7 @@ class Instance:
 
         # 2. Leggi Matrice (M righe)
         self.processing_times = []
+        self._content_hash = None
         matrix_lines = lines[1:]
         
         if len(matrix_lines) != self.num_machines:
@@ -42,10 +51,70 @@ class Instance:
                 raise ValueError(f"Riga {row_idx}: attesi {self.num_jobs} jobs, trovati {len(vals)}")
             self.processing_times.append(vals)
 
+    def load_compact(self, storage="array", backing_path=None):
+        """Parser a blocchi in un buffer int32 (vedi streaming_parser): per istanze da milioni di job."""
+        from streaming_parser import parse_streaming
+        self._content_hash = None
+        self.num_jobs, self.num_machines, self.processing_times, self._buffer = parse_streaming(
+            self.filepath, storage=storage, backing_path=backing_path)
+
+    @classmethod
+    def from_matrix(cls, processing_times, name="<memoria>"):
+        """
+        Istanza da una matrice MxN già in memoria (servizio solver, benchmark), senza file.
+        Stesse validazioni del parser: righe di uguale lunghezza, valori interi.
+        """
+        inst = cls.__new__(cls)
+        inst.filepath = name
+        inst._content_hash = None
+        inst._buffer = None
+        inst._job_min = None
+        if not processing_times or not processing_times[0]:
+            raise ValueError("Matrice vuota: attesa almeno 1 macchina e 1 job")
+        inst.num_machines = len(processing_times)
+        inst.num_jobs = len(processing_times[0])
+        inst.processing_times = []
+        for row_idx, row in enumerate(processing_times):
+            if len(row) != inst.num_jobs:
+                raise ValueError(f"Riga {row_idx}: attesi {inst.num_jobs} jobs, trovati {len(row)}")
+            inst.processing_times.append([int(v) for v in row])
+        return inst
+
+    @classmethod
+    def from_rows(cls, rows, num_jobs, num_machines, name="<memoria>", content_hash=None, buffer=None,
+                  job_min=None):
+        """
+        Istanza che avvolge righe già pronte (es. memoryview di un archivio mmap), senza copie
+        né validazioni: il chiamante garantisce M righe da N valori. buffer tiene in vita la memoria.
+        job_min: minimi per job precalcolati (evita la scansione della matrice nel lower bound).
+        """
+        inst = cls.__new__(cls)
+        inst.filepath = name
+        inst.num_jobs = num_jobs
+        inst.num_machines = num_machines
+        inst.processing_times = rows
+        inst._content_hash = content_hash
+        inst._buffer = buffer
+        inst._job_min = job_min
+        return inst
+
     def get_time(self, machine_id, job_id):
         """Ritorna p_{ij} (tempo del job j sulla macchina i)."""
         return self.processing_times[machine_id][job_id]
 
+    def content_hash(self):
+        """
+        Hash SHA-256 del contenuto (header N M + matrice), indipendente dal percorso.
+        Chiave stabile per registri persistenti: due file identici hanno lo stesso hash.
+        """
+        if self._content_hash is None:
+            h = hashlib.sha256()
+            h.update(f"{self.num_jobs} {self.num_machines}\n".encode())
+            for row in self.processing_times:
+                h.update((" ".join(map(str, row)) + "\n").encode())
+            self._content_hash = h.hexdigest()
+        return self._content_hash
+
     def get_theoretical_lower_bound(self):
         """
         Calcola il Lower Bound stretto (Fleszar & Hindi).
@@ -54,11 +123,13 @@ class Instance:
         """
         # Calcoliamo il tempo minimo di ogni job tra tutte le macchine disponibili
         # min_p[j] = min(p_0j, p_1j, ..., p_mj)
-        min_times_per_job = []
-        for j in range(self.num_jobs):
-            # Estraiamo la colonna j-esima dalla matrice
-            col_j = [self.processing_times[m][j] for m in range(self.num_machines)]
-            min_times_per_job.append(min(col_j))
+        min_times_per_job = self._job_min
+        if min_times_per_job is None:
+            min_times_per_job = []
+            for j in range(self.num_jobs):
+                # Estraiamo la colonna j-esima dalla matrice
+                col_j = [self.processing_times[m][j] for m in range(self.num_machines)]
+                min_times_per_job.append(min(col_j))
 
         # LB1: Job-based bound (Il job più "difficile" nel caso migliore)
         lb1 = max(min_times_per_job)
@@ -0,0 +1,173 @@
+"""
+Archivio compatto del dataset: tutte le matrici in UN solo file, come blocchi int32 contigui, con un
+indice (N, M, dist, seed, offset, hash). Evita di aprire migliaia di file piccoli (filesystem condivisi)
+e permette l'accesso casuale: un'istanza è una fetta dell'mmap, senza parsing né copie.
+
+Formato (little-endian):
+    [0:24)      header: magic b"JSPPACK1", offset dell'indice (uint64), lunghezza dell'indice (uint64)
+    [24:...)    blocchi int32, uno per istanza, riga per riga (macchina i: p_i0 ... p_i,N-1)
+    [indice)    JSON: {"version": 1, "instances": [{"name", "n", "m", "dist", "seed", "offset", "hash"}]}
+"name" è il percorso relativo alla radice del dataset (es. "large/uniform/inst_50_10_uniform_2237.txt"):
+unpack ricrea lo stesso albero di file di testo.
+
+Nel runner: "dataset_archive": "data/dataset_exam.jspack" nel JSON al posto di "dataset_root".
+I task referenziano le istanze come "<archivio>::<name>" (stesso basename del file di testo).
+
+Usage:
+    python src/instance_archive.py pack data/dataset_exam data/dataset_exam.jspack
+    python src/instance_archive.py unpack data/dataset_exam.jspack /tmp/dataset_exam
+    python src/instance_archive.py info data/dataset_exam.jspack
+"""
+import argparse
+import glob
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+
+from instance import Instance
+
+MAGIC = b"JSPPACK1"
+VERSION = 1
+_HEADER = struct.Struct("<8sQQ")
+ARCHIVE_SEP = "::"
+
+_LITTLE_ENDIAN = sys.byteorder == "little"
+
+
+def pack(dataset_root, archive_path):
+    """Scrive l'archivio di tutti i file .txt sotto dataset_root. Ritorna il numero di istanze."""
+    from runner import parse_filename
+
+    paths = sorted(glob.glob(os.path.join(dataset_root, "**", "*.txt"), recursive=True))
+    entries = []
+    with open(archive_path, 'wb') as f:
+        f.write(_HEADER.pack(MAGIC, 0, 0))
+        for path in paths:
+            inst = Instance(path, storage="array")
+            meta = parse_filename(os.path.basename(path)) or {}
+            block = array('i')
+            for row in inst.processing_times:
+                block.frombytes(row.tobytes())
+            if not _LITTLE_ENDIAN:
+                block.byteswap()
+            entries.append({"name": os.path.relpath(path, dataset_root).replace(os.sep, "/"),
+                            "n": inst.num_jobs, "m": inst.num_machines,
+                            "dist": meta.get('dist'), "seed": meta.get('seed'),
+                            "offset": f.tell(), "hash": inst.content_hash()})
+            block.tofile(f)
+        index = json.dumps({"version": VERSION, "instances": entries}).encode()
+        index_offset = f.tell()
+        f.write(index)
+        f.seek(0)
+        f.write(_HEADER.pack(MAGIC, index_offset, len(index)))
+    return len(entries)
+
+
+class InstanceArchive:
+    """Archivio aperto in sola lettura (mmap): instance(name) -> Instance con righe memoryview."""
+
+    def __init__(self, archive_path):
+        self.path = archive_path
+        with open(archive_path, 'rb') as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._mm) < _HEADER.size:
+            raise ValueError(f"Archivio non valido (troppo corto): {archive_path}")
+        magic, index_offset, index_size = _HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC:
+            raise ValueError(f"Archivio non valido (magic {magic!r}): {archive_path}")
+        index = json.loads(self._mm[index_offset:index_offset + index_size])
+        if index.get('version') != VERSION:
+            raise ValueError(f"Versione archivio non supportata: {index.get('version')}")
+        self.entries = {e['name']: e for e in index['instances']}
+
+    def names(self):
+        return list(self.entries)
+
+    def instance(self, name):
+        """Istanza zero-copy: le righe sono fette dell'mmap (copia solo su host big-endian)."""
+        entry = self.entries.get(name)
+        if entry is None:
+            raise KeyError(f"Istanza {name} non presente in {self.path}")
+        n, m, offset = entry['n'], entry['m'], entry['offset']
+        block = memoryview(self._mm)[offset:offset + 4 * n * m]
+        if _LITTLE_ENDIAN:
+            flat = block.cast('i')
+        else:
+            flat = array('i', block.tobytes())
+            flat.byteswap()
+            flat = memoryview(flat)
+        rows = [flat[i * n:(i + 1) * n] for i in range(m)]
+        return Instance.from_rows(rows, n, m, name=f"{self.path}{ARCHIVE_SEP}{name}",
+                                  content_hash=entry['hash'], buffer=self._mm)
+
+    def unpack(self, output_root):
+        """Ricrea l'albero di file di testo (stesso formato di generator.py)."""
+        for name in self.entries:
+            inst = self.instance(name)
+            path = os.path.join(output_root, *name.split("/"))
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "w") as f:
+                f.write(f"{inst.num_jobs} {inst.num_machines}\n")
+                for row in inst.processing_times:
+                    f.write(" ".join(map(str, row)) + "\n")
+        return len(self.entries)
+
+
+# Archivi aperti (per processo): i worker aprono l'mmap una volta sola
+_OPEN_ARCHIVES = {}
+
+
+def is_archive_path(filepath):
+    return ARCHIVE_SEP in filepath
+
+
+def archive_paths(archive_path):
+    """Percorsi "<archivio>::<name>" di tutte le istanze, da usare come filepath dei task."""
+    return [f"{archive_path}{ARCHIVE_SEP}{name}" for name in open_archive(archive_path).names()]
+
+
+def open_archive(archive_path):
+    archive = _OPEN_ARCHIVES.get(archive_path)
+    if archive is None:
+        archive = _OPEN_ARCHIVES[archive_path] = InstanceArchive(archive_path)
+    return archive
+
+
+def load_instance(filepath):
+    """Istanza da un percorso "<archivio>::<name>"."""
+    archive_path, _, name = filepath.partition(ARCHIVE_SEP)
+    return open_archive(archive_path).instance(name)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Archivio compatto (int32 + indice) del dataset")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p_pack = sub.add_parser("pack", help="Cartella di file .txt -> archivio")
+    p_pack.add_argument("root", type=str)
+    p_pack.add_argument("archive", type=str)
+    p_unpack = sub.add_parser("unpack", help="Archivio -> cartella di file .txt")
+    p_unpack.add_argument("archive", type=str)
+    p_unpack.add_argument("root", type=str)
+    p_info = sub.add_parser("info", help="Riepilogo del contenuto")
+    p_info.add_argument("archive", type=str)
+    args = parser.parse_args()
+
+    if args.command == "pack":
+        count = pack(args.root, args.archive)
+        size_mb = os.path.getsize(args.archive) / (1024 * 1024)
+        print(f"📦 {count} istanze impacchettate in {args.archive} ({size_mb:.2f} MB)")
+    elif args.command == "unpack":
+        count = InstanceArchive(args.archive).unpack(args.root)
+        print(f"📂 {count} istanze estratte in {args.root}")
+    else:
+        archive = InstanceArchive(args.archive)
+        groups = {}
+        for entry in archive.entries.values():
+            key = (entry['n'], entry['m'], entry['dist'])
+            groups[key] = groups.get(key, 0) + 1
+        print(f"📦 {args.archive}: {len(archive.entries)} istanze")
+        for (n, m, dist), count in sorted(groups.items(), key=lambda kv: (kv[0][0], kv[0][1], str(kv[0][2]))):
+            print(f"  N={n:<4} M={m:<3} {dist}: {count}")
@@ -0,0 +1,74 @@
+"""
+Misura della memoria di picco di un run del solver (opzionale, "measure_memory" nel JSON o --memory).
+
+- PeakPyMB:   picco delle allocazioni Python durante il solve (tracemalloc, solo allocazioni nuove)
+- RSSDeltaMB: picco del Resident Set Size durante il solve meno l'RSS all'avvio del solve.
+              Su Linux il picco (VmHWM) viene azzerato prima di ogni task (/proc/self/clear_refs),
+              altrimenti si usa ru_maxrss, che cresce solo: il delta è un limite inferiore.
+
+tracemalloc rallenta le allocazioni: con la misura attiva la colonna Time non è confrontabile
+con i run normali. Disattivata, il costo è un singolo controllo in run_task.
+"""
+import sys
+import tracemalloc
+
+try:
+    import resource  # non disponibile su Windows
+except ImportError:
+    resource = None
+
+MEMORY_FIELDS = ["PeakPyMB", "RSSDeltaMB"]
+
+_MB = 1024 * 1024
+
+
+def _status_kb(field):
+    """Valore (kB) di un campo di /proc/self/status, None se non disponibile."""
+    try:
+        with open("/proc/self/status", 'r') as f:
+            for line in f:
+                if line.startswith(field + ":"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+
+def _reset_peak_rss():
+    """Azzera VmHWM del processo (Linux). True se riuscito."""
+    try:
+        with open("/proc/self/clear_refs", 'w') as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def _maxrss_bytes():
+    if resource is None:
+        return None
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return maxrss if sys.platform == "darwin" else maxrss * 1024  # macOS: byte, Linux: kB
+
+
+class MemoryProbe:
+    """Da usare attorno al solo solve: probe.start() ... probe.stop() -> (peak_py_mb, rss_delta_mb)."""
+
+    def start(self):
+        self.rss_start = _status_kb("VmRSS")
+        self.hwm_reset = self.rss_start is not None and _reset_peak_rss()
+        self.maxrss_start = _maxrss_bytes()
+        tracemalloc.start()
+
+    def stop(self):
+        _, peak_py = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        rss_delta = None
+        if self.hwm_reset:
+            hwm = _status_kb("VmHWM")
+            if hwm is not None:
+                rss_delta = max(0, hwm - self.rss_start) * 1024
+        elif self.maxrss_start is not None:
+            rss_delta = max(0, _maxrss_bytes() - self.maxrss_start)
+        return (round(peak_py / _MB, 3),
+                round(rss_delta / _MB, 3) if rss_delta is not None else None)
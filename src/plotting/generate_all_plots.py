@@ -1,74 +1,40 @@
 """
 Script di coordinamento per generare tutti i grafici del report finale
-Esegue tutti i plot script e genera la documentazione
+Delega a plot_build: solo i grafici con input o codice cambiati, in parallelo
+
+Usage:
+    python src/plotting/generate_all_plots.py [--workers N] [--force]
 """
 
+import argparse
 import os
 import sys
-import importlib.util
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from plot_build import TARGETS, build, print_build_summary
 
-def run_all_plots():
+def run_all_plots(workers=None, force=False):
     """
     Esegue tutti gli script di plotting per il report finale
     """
     print("🚀 Generazione completa dei grafici per il report finale...")
     print("=" * 60)
     
-    # Cambia alla directory plotting
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    os.chdir(script_dir)
-    
-    # Lista degli script da eseguire
-    scripts = [
-        ("plot_validation.py", "Validazione: Micro-benchmarks (BF vs BnB)"),
-        ("plot_pilot_a.py", "Pilot A: The Wall (Branch & Bound Timeout)"),
-        ("plot_pilot_b.py", "Pilot B: Parameter Tuning (Heatmap)"),
-        ("plot_pilot_c.py", "Pilot C: Convergence Analysis (Gap vs Time)"),
-        ("plot_workhorse.py", "Workhorse: Campagna Sperimentale Finale")
-    ]
-    
-    results = []
-    
-    for script, description in scripts:
-        print(f"\n📊 {description}")
-        print("-" * 50)
-        
-        try:
-            if os.path.exists(script):
-                # Carica il modulo usando importlib
-                script_name = script.replace('.py', '')
-                spec = importlib.util.spec_from_file_location(script_name, script)
-                module = importlib.util.module_from_spec(spec)
-                spec.loader.exec_module(module)
-                
-                # Chiama la funzione corretta (plot() o plot_all() per workhorse) 
-                if script == "plot_workhorse.py":
-                    module.plot_all()
-                else:
-                    module.plot()
-                results.append((script, "✅ Successo"))
-                print(f"✅ {script} completato")
-            else:
-                results.append((script, "❌ File non trovato"))
-                print(f"❌ {script} non trovato")
-                
-        except Exception as e:
-            results.append((script, f"❌ Errore: {str(e)[:50]}..."))
-            print(f"❌ Errore in {script}: {e}")
+    start = time.time()
+    results = build(list(TARGETS), workers=workers, force=force)
     
     # Summary finale
     print(f"\n{'='*60}")
     print("📋 SUMMARY GENERAZIONE GRAFICI")
     print(f"{'='*60}")
-    
-    for script, status in results:
-        print(f"{script:<30} {status}")
-    
-    print(f"\n📁 Grafici salvati in: ../../plots/")
-    print("📄 Formati disponibili: .png (300dpi) e .pdf (vettoriale)")
+    print_build_summary(results)
+    print(f"⏱️  Tempo totale: {time.time() - start:.1f}s")
     
     # Controlla se la cartella plots esiste e lista i file
-    plots_dir = "../../plots"
+    from path_utils import get_results_paths
+    plots_dir = get_results_paths("plots", create_dirs=False)['plots_dir']
+    print(f"\n📁 Grafici salvati in: {plots_dir}")
     if os.path.exists(plots_dir):
         files = [f for f in os.listdir(plots_dir) if f.endswith(('.png', '.pdf'))]
         print(f"\n📊 File generati ({len(files)}):")
@@ -78,4 +44,8 @@ def run_all_plots():
     print("\n🎯 Setup completo per report finale!")
 
 if __name__ == "__main__":
-    run_all_plots()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Genera tutti i grafici del report (build incrementale)")
+    parser.add_argument("--workers", type=int, default=None, help="Processi paralleli (default: 1 per core)")
+    parser.add_argument("--force", action="store_true", help="Rigenera anche i grafici aggiornati")
+    args = parser.parse_args()
+    run_all_plots(args.workers, args.force)
@@ -0,0 +1,196 @@
+"""
+Build incrementale e parallelo dei grafici del report.
+
+Ogni figura (target) ha una chiave = SHA-256 di (CSV di input, sorgente del modulo di plot e di
+aggregate.py).
+Le chiavi dell'ultima generazione riuscita sono salvate in <output_dir>/.plot_manifest.json:
+un target è aggiornato se la chiave coincide e tutti i suoi PDF esistono, altrimenti è "stale"
+e viene rigenerato. I target stale girano in processi separati con backend matplotlib "Agg"
+(non interattivo): pandas/matplotlib/seaborn vengono importati solo nei worker.
+
+Usage:
+    python src/plotting/plot_build.py                       # tutti i target, 1 worker per core
+    python src/plotting/plot_build.py --targets workhorse pilot_b --workers 2
+    python src/plotting/plot_build.py --force               # rigenera anche i target aggiornati
+"""
+import argparse
+import hashlib
+import importlib
+import json
+import os
+import sys
+import time
+
+PLOTTING_DIR = os.path.dirname(os.path.abspath(__file__))
+SRC_DIR = os.path.dirname(PLOTTING_DIR)
+BASE_DIR = os.path.dirname(SRC_DIR)
+REFERENCE_DIR = os.path.join(BASE_DIR, "results", "reference")
+sys.path.insert(0, SRC_DIR)
+sys.path.insert(0, PLOTTING_DIR)
+
+from path_utils import get_latest_results_file, get_results_paths
+import tracing
+
+MANIFEST_NAME = ".plot_manifest.json"
+
+# Target: modulo, funzione, CSV di input (risolto al momento del build), PDF prodotti.
+# Gli input replicano i default dei singoli moduli di plot.
+TARGETS = {
+    'validation': {"module": "plot_validation", "function": "plot",
+                   "input": lambda: os.path.join(REFERENCE_DIR, "validation_results.csv"),
+                   "outputs": ["validation_micro_benchmarks.pdf"]},
+    'pilot_a': {"module": "plot_pilot_a", "function": "plot",
+                "input": lambda: get_latest_results_file("pilot_wall"),
+                "outputs": ["pilot_a_the_wall.pdf"]},
+    'pilot_b': {"module": "plot_pilot_b", "function": "plot",
+                "input": lambda: os.path.join(REFERENCE_DIR, "pilot_b_tuning.csv"),
+                "outputs": ["pilot_b_tuning.pdf"]},
+    'pilot_c': {"module": "plot_pilot_c", "function": "plot",
+                "input": lambda: os.path.join(REFERENCE_DIR, "pilot_c_convergence.csv"),
+                "outputs": ["pilot_c_convergence.pdf"]},
+    'workhorse': {"module": "plot_workhorse", "function": "plot",
+                  "input": lambda: os.path.join(REFERENCE_DIR, "workhorse_results.csv"),
+                  "outputs": ["workhorse_2_lower_bound_error.pdf", "workhorse_3_rpd_distribution.pdf",
+                              "workhorse_4_rpd_vs_machines.pdf"]},
+    'scaling': {"module": "plot_scaling", "function": "plot",
+                "input": lambda: os.path.join(BASE_DIR, "results", "generated", "csv", "scaling_results.csv"),
+                "outputs": ["scaling.pdf"]},
+}
+
+
+def _file_sha256(path):
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+# Moduli locali importati dai plot (anche indirettamente: aggregate -> results_store):
+# se cambiano, cambiano tutte le figure
+COMMON_SOURCES = [os.path.join(SRC_DIR, name) for name in ("aggregate.py", "results_store.py", "path_utils.py")]
+
+
+def target_key(name, results_path):
+    """Chiave del target: hash del CSV di input + hash dei sorgenti (modulo di plot e condivisi)."""
+    module_path = os.path.join(PLOTTING_DIR, TARGETS[name]["module"] + ".py")
+    h = hashlib.sha256()
+    h.update(_file_sha256(results_path).encode())
+    for source in [module_path] + COMMON_SOURCES:
+        h.update(_file_sha256(source).encode())
+    return h.hexdigest()
+
+
+def _load_manifest(output_dir):
+    try:
+        with open(os.path.join(output_dir, MANIFEST_NAME), 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_manifest(output_dir, manifest):
+    path = os.path.join(output_dir, MANIFEST_NAME)
+    tmp = path + ".tmp"
+    with open(tmp, 'w') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(tmp, path)  # atomico: un build interrotto non lascia un manifest troncato
+
+
+def _init_worker(*trace_settings):
+    """Backend non interattivo prima di qualunque import di pyplot (worker e build sequenziale)."""
+    os.environ["MPLBACKEND"] = "Agg"
+    if "matplotlib" in sys.modules:
+        sys.modules["matplotlib"].use("Agg")
+    if trace_settings:
+        tracing.configure(*trace_settings)
+
+
+def _render(name, results_path, output_dir):
+    """Genera un target (anche in un processo worker). Ritorna (name, errore|None, secondi)."""
+    target = TARGETS[name]
+    start = time.perf_counter()
+    try:
+        with tracing.span("plot", target=name):
+            module = importlib.import_module(target["module"])
+            getattr(module, target["function"])(results_path=results_path, output_dir=output_dir)
+        missing = [f for f in target["outputs"] if not os.path.exists(os.path.join(output_dir, f))]
+        error = f"output mancanti: {', '.join(missing)}" if missing else None
+    except Exception as e:
+        error = str(e)
+    return name, error, time.perf_counter() - start
+
+
+def build(targets=None, output_dir=None, workers=None, force=False):
+    """
+    Rigenera i target stale (tutti con force). Ritorna {target: stato}, con stato in
+    "up-to-date", "built", "skipped" (CSV di input assente) o "failed: <errore>".
+    """
+    targets = list(TARGETS) if targets is None else targets
+    if output_dir is None:
+        output_dir = get_results_paths("plots", create_dirs=True)['plots_dir']
+    os.makedirs(output_dir, exist_ok=True)
+    manifest = _load_manifest(output_dir)
+
+    status, stale = {}, []
+    for name in targets:
+        if name not in TARGETS:
+            status[name] = "failed: target sconosciuto"
+            continue
+        results_path = TARGETS[name]["input"]()
+        if results_path is None or not os.path.exists(results_path):
+            status[name] = "skipped"
+            continue
+        key = target_key(name, results_path)
+        outputs_exist = all(os.path.exists(os.path.join(output_dir, f)) for f in TARGETS[name]["outputs"])
+        if not force and manifest.get(name, {}).get("key") == key and outputs_exist:
+            status[name] = "up-to-date"
+        else:
+            stale.append((name, results_path, key))
+
+    workers = min(workers or os.cpu_count() or 1, len(stale))
+    keys = {name: key for name, _, key in stale}
+    if workers <= 1:
+        _init_worker()
+        results = (_render(name, path, output_dir) for name, path, _ in stale)
+    else:
+        from concurrent.futures import ProcessPoolExecutor, as_completed
+        pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=tracing.settings())
+        futures = [pool.submit(_render, name, path, output_dir) for name, path, _ in stale]
+        results = (future.result() for future in as_completed(futures))
+
+    try:
+        for name, error, elapsed in results:
+            if error is None:
+                status[name] = "built"
+                manifest[name] = {"key": keys[name], "outputs": TARGETS[name]["outputs"],
+                                  "seconds": round(elapsed, 3)}
+            else:
+                status[name] = f"failed: {error}"
+                manifest.pop(name, None)
+            _save_manifest(output_dir, manifest)  # dopo ogni target: un build interrotto non perde il lavoro fatto
+    finally:
+        if workers > 1:
+            pool.shutdown()
+    return {name: status[name] for name in targets}
+
+
+def print_build_summary(status):
+    icons = {"up-to-date": "⏭️ ", "built": "✅", "skipped": "⚠️ "}
+    for name, state in status.items():
+        print(f"{icons.get(state, '❌')} {name:<12} {state}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build incrementale e parallelo dei grafici")
+    parser.add_argument("--targets", nargs="+", choices=list(TARGETS), default=None,
+                        help="Target da generare (default: tutti)")
+    parser.add_argument("--output-dir", type=str, default=None, help="Cartella dei PDF (default: results/generated/plots)")
+    parser.add_argument("--workers", type=int, default=None, help="Processi paralleli (default: 1 per core)")
+    parser.add_argument("--force", action="store_true", help="Rigenera anche i target aggiornati")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    status = build(args.targets, args.output_dir, args.workers, args.force)
+    print_build_summary(status)
+    print(f"⏱️  Build grafici: {time.perf_counter() - start:.1f}s")
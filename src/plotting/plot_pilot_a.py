@@ -5,6 +5,7 @@ import os
 import sys
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from path_utils import get_latest_results_file, get_results_paths
+from aggregate import summarize
 
 def plot(results_path=None, output_dir=None):
     print("[INFO] Generazione Plot Pilot A (The Wall - BnB Timeout)...")
@@ -24,20 +25,15 @@ def plot(results_path=None, output_dir=None):
     print(f"[INFO] Usando file: {results_path}")
     print(f"[INFO] Salvando in: {output_dir}")
 
-    df = pd.read_csv(results_path)
+    # Filtriamo per M=4 (dove avviene la crescita esponenziale) e algoritmo BnB,
+    # tempo medio per N e Dist: riepilogo in streaming, persistito
+    rows = summarize(results_path, ['n', 'dist'], 'time', {'m': 4, 'algo': 'BnB'})
     
-    # Filtriamo per M=4 (dove avviene la crescita esponenziale) e algoritmo BnB
-    df_filtered = df[(df['M'] == 4) & (df['Algo'] == 'BnB')].copy()
-    
-    if df_filtered.empty:
+    if not rows:
         print("[WARNING] Nessun dato trovato per M=4 e algoritmo BnB")
         return
     
-    # Calcola media per N e Dist, gestendo timeout
-    df_avg = df_filtered.groupby(['N', 'Dist'])['Time'].mean().reset_index()
-    
-    # Identifica timeout (Time >= 60s)
-    df_timeout = df_filtered[df_filtered['Time'] >= 60.0].groupby(['N', 'Dist']).size().reset_index(name='timeout_count')
+    df_avg = pd.DataFrame(rows).rename(columns={'n': 'N', 'dist': 'Dist', 'mean': 'Time'})
     
     # Setup grafico compatto per Overleaf
     sns.set_style("whitegrid")
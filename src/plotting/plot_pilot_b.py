@@ -6,8 +6,31 @@ import os
 import sys
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from path_utils import get_latest_results_file, get_results_paths
+from results_store import ResultsStore
+from aggregate import summarize
 
-def plot(results_path=None, output_dir=None):
+def _load_ig_aggregate(results_path, store_path, experiment, group_by):
+    """
+    Gap medio IG per gruppo. Con store_path filtri e aggregazione sono eseguiti da SQLite
+    (nessun CSV caricato, parametri già tipizzati); altrimenti riepilogo in streaming del CSV
+    (una passata, persistito in results/generated/summaries).
+    """
+    columns = {'d': 'd', 'T': 't_lambda', 'N': 'n'}
+    if store_path is not None:
+        store = ResultsStore(store_path)
+        rows = store.aggregate([columns[c] for c in group_by], 'gap', {'experiment': experiment, 'algo': 'IG'})
+        store.close()
+    else:
+        if not os.path.exists(results_path):
+            print(f"[WARNING] File {results_path} non trovato.")
+            return None
+        rows = summarize(results_path, [columns[c] for c in group_by], 'gap', {'algo': 'IG'})
+    if not rows:
+        return None
+    agg = pd.DataFrame(rows).rename(columns={v: k for k, v in columns.items()})
+    return agg.rename(columns={'mean': 'Gap'})[group_by + ['Gap']]
+
+def plot(results_path=None, output_dir=None, store_path=None, experiment="pilot_b_tuning"):
     print("[INFO] Generazione Plot Pilot B (Tuning: Heatmap)...")
     
     # Usa il file di reference specifico se non specificato
@@ -22,30 +45,11 @@ def plot(results_path=None, output_dir=None):
     print(f"[INFO] Usando file: {results_path}")
     print(f"[INFO] Salvando in: {output_dir}")
     
-    if not os.path.exists(results_path):
-        print(f"[WARNING] File {results_path} non trovato.")
-        return
-
-    df = pd.read_csv(results_path)
-    
-    # Parsing dei parametri dalla colonna Params
-    def parse_ig_params(params_str):
-        # Formato: "d=4,T=0.5,t=30s"  
-        parts = params_str.replace('s', '').split(',')
-        d = int(parts[0].split('=')[1])
-        T = float(parts[1].split('=')[1]) 
-        return d, T
-    
-    # Applica parsing solo alle righe IG
-    ig_data = df[df['Algo'] == 'IG'].copy()
-    if ig_data.empty:
+    # Calcola Gap medio per combinazione (d, T)
+    agg_data = _load_ig_aggregate(results_path, store_path, experiment, ['d', 'T'])
+    if agg_data is None:
         print("[WARNING] Nessun dato IG trovato per tuning")
         return
-        
-    ig_data[['d', 'T']] = ig_data['Params'].apply(lambda x: pd.Series(parse_ig_params(x)))
-    
-    # Calcola Gap medio per combinazione (d, T)
-    agg_data = ig_data.groupby(['d', 'T'])['Gap'].mean().reset_index()
     pivot_data = agg_data.pivot(index='d', columns='T', values='Gap')
     
     # Setup figure compatta per Overleaf
@@ -66,7 +70,8 @@ def plot(results_path=None, output_dir=None):
     print("[SUCCESS] Salvato: pilot_b_tuning.pdf")
     plt.close()
 
-def plot_interaction(results_path="../../results/pilot_b_tuning.csv", output_dir="../../plots"):
+def plot_interaction(results_path="../../results/pilot_b_tuning.csv", output_dir="../../plots",
+                     store_path=None, experiment="pilot_b_tuning"):
     """
     Genera grafico interaction che mostra:
     - Asse x: taglia delle istanze (N)
@@ -75,30 +80,11 @@ def plot_interaction(results_path="../../results/pilot_b_tuning.csv", output_dir
     """
     print("[INFO] Generazione Plot Pilot B Interaction (Instance Size vs Gap per d)...")
     
-    if not os.path.exists(results_path):
-        print(f"[WARNING] File {results_path} non trovato.")
-        return
-
-    df = pd.read_csv(results_path)
-    
-    # Parsing dei parametri dalla colonna Params
-    def parse_ig_params(params_str):
-        # Formato: "d=4,T=0.5,t=30s"  
-        parts = params_str.replace('s', '').split(',')
-        d = int(parts[0].split('=')[1])
-        T = float(parts[1].split('=')[1]) 
-        return d, T
-    
-    # Applica parsing solo alle righe IG
-    ig_data = df[df['Algo'] == 'IG'].copy()
-    if ig_data.empty:
+    # Calcola Gap medio per combinazione (N, d) - aggregando su tutte le T
+    agg_data = _load_ig_aggregate(results_path, store_path, experiment, ['N', 'd'])
+    if agg_data is None:
         print("[WARNING] Nessun dato IG trovato per tuning")
         return
-        
-    ig_data[['d', 'T']] = ig_data['Params'].apply(lambda x: pd.Series(parse_ig_params(x)))
-    
-    # Calcola Gap medio per combinazione (N, d) - aggregando su tutte le T
-    agg_data = ig_data.groupby(['N', 'd'])['Gap'].mean().reset_index()
     
     # Setup figure compatta per Overleaf
     plt.figure(figsize=(6, 4))
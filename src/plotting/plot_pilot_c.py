@@ -6,8 +6,10 @@ import os
 import sys
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from path_utils import get_latest_results_file, get_results_paths
+from results_store import ResultsStore
+from aggregate import summarize
 
-def plot(results_path=None, output_dir=None):
+def plot(results_path=None, output_dir=None, store_path=None, experiment="pilot_c_convergence"):
     print("[INFO] Generazione Plot Pilot C (Convergence: Gap vs Time)...")
     
     # Usa il file di reference specifico se non specificato
@@ -22,32 +24,26 @@ def plot(results_path=None, output_dir=None):
     print(f"[INFO] Usando file: {results_path}")
     print(f"[INFO] Salvando in: {output_dir}")
     
-    if not os.path.exists(results_path):
-        print(f"[WARNING] File {results_path} non trovato.")
-        return
-
-    df = pd.read_csv(results_path)
-    
-    # Filtriamo solo dati IG per analisi di convergenza
-    ig_data = df[df['Algo'] == 'IG'].copy()
-    if ig_data.empty:
-        print("[WARNING] Nessun dato IG trovato per convergenza")
-        return
-    
-    # Parsing time limit dai parametri
-    def parse_time_limit(params_str):
-        # Formato: "d=6,T=0.1,t=30s"
-        parts = params_str.split(',')
-        time_str = [p for p in parts if 't=' in p][0]
-        return float(time_str.split('=')[1].replace('s', ''))
-    
-    ig_data['Time_Limit'] = ig_data['Params'].apply(parse_time_limit)
-    
     # Time steps desiderati: 0.1, 0.5, 1, 5, 10, 30, 60
     time_steps = [0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0]
     
-    # Calcola gap medio per N, Dist, Time_Limit
-    convergence_data = ig_data.groupby(['N', 'Dist', 'Time_Limit'])['Gap'].mean().reset_index()
+    if store_path is not None:
+        # Filtro e aggregazione eseguiti da SQLite (time_limit è già una colonna tipizzata)
+        store = ResultsStore(store_path)
+        rows = store.aggregate(['n', 'dist', 'time_limit'], 'gap', {'experiment': experiment, 'algo': 'IG'})
+        store.close()
+    else:
+        if not os.path.exists(results_path):
+            print(f"[WARNING] File {results_path} non trovato.")
+            return
+
+        # Solo dati IG, gap medio per N, Dist, Time_Limit: riepilogo in streaming, persistito
+        rows = summarize(results_path, ['n', 'dist', 'time_limit'], 'gap', {'algo': 'IG'})
+    if not rows:
+        print("[WARNING] Nessun dato IG trovato per convergenza")
+        return
+    convergence_data = pd.DataFrame(rows).rename(
+        columns={'n': 'N', 'dist': 'Dist', 'time_limit': 'Time_Limit', 'mean': 'Gap'})
     
     # Setup figure compatta per Overleaf
     fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(10, 3.5))
@@ -0,0 +1,86 @@
+import pandas as pd
+import matplotlib.pyplot as plt
+import seaborn as sns
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from path_utils import get_results_paths
+
+def plot(results_path=None, output_dir=None):
+    print("[INFO] Generazione Plot Scaling (Strong/Weak scaling della pipeline)...")
+
+    # CSV prodotto da benchmarks/scaling.py
+    if results_path is None:
+        base_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        results_path = os.path.join(base_dir, "results", "generated", "csv", "scaling_results.csv")
+
+    if output_dir is None:
+        paths = get_results_paths("scaling", create_dirs=True)
+        output_dir = paths['plots_dir']
+
+    print(f"[INFO] Usando file: {results_path}")
+    print(f"[INFO] Salvando in: {output_dir}")
+
+    if not os.path.exists(results_path):
+        print(f"[WARNING] File {results_path} non trovato. Lancia benchmarks/scaling.py prima!")
+        return
+
+    df = pd.read_csv(results_path)
+    strong = df[df['Mode'] == 'strong'].sort_values('Workers')
+    weak = df[df['Mode'] == 'weak'].sort_values('Workers')
+
+    # Setup figure compatta per Overleaf
+    fig, (ax1, ax2, ax3) = plt.subplots(1, 3, figsize=(12, 3.5))
+    sns.set_style("whitegrid")
+
+    # 1. STRONG SCALING: speedup vs worker (con retta ideale)
+    if not strong.empty:
+        workers = strong['Workers']
+        ax1.plot(workers, workers / workers.iloc[0], color='gray', linestyle='--', linewidth=1, label='Ideale')
+        ax1.plot(workers, strong['Speedup'], color='#1f77b4', marker='o', linewidth=1.5, markersize=4,
+                 markerfacecolor='white', markeredgewidth=1.5, markeredgecolor='#1f77b4',
+                 label=f"{strong['Instances'].iloc[0]} istanze")
+        ax1.set_xticks(workers)
+    ax1.set_title('Strong Scaling', fontsize=10, fontweight='bold')
+    ax1.set_xlabel('Worker', fontsize=9)
+    ax1.set_ylabel('Speedup', fontsize=9)
+    ax1.legend(loc='upper left', fontsize=7)
+    ax1.grid(True, alpha=0.3)
+
+    # 2. EFFICIENZA PARALLELA (strong e weak)
+    for subset, label, color in [(strong, 'Strong', '#1f77b4'), (weak, 'Weak', '#ff7f0e')]:
+        if not subset.empty:
+            ax2.plot(subset['Workers'], subset['Efficiency'], color=color, marker='o', linewidth=1.5,
+                     markersize=4, markerfacecolor='white', markeredgewidth=1.5, markeredgecolor=color, label=label)
+    ax2.axhline(y=1.0, color='gray', linestyle='--', linewidth=1)
+    ax2.set_ylim(0, 1.1)
+    ax2.set_title('Parallel Efficiency', fontsize=10, fontweight='bold')
+    ax2.set_xlabel('Worker', fontsize=9)
+    ax2.set_ylabel('Efficienza', fontsize=9)
+    ax2.legend(loc='lower left', fontsize=7)
+    ax2.grid(True, alpha=0.3)
+
+    # 3. RIPARTIZIONE DEL TEMPO-WORKER (strong): solve, caricamento, overhead
+    if not strong.empty:
+        labels = strong['Workers'].astype(str)
+        ax3.bar(labels, strong['SolveTime'], color='#2ca02c', label='Solve')
+        ax3.bar(labels, strong['LoadTime'], bottom=strong['SolveTime'], color='#1f77b4', label='Load + LB')
+        ax3.bar(labels, strong['Overhead'].clip(lower=0), bottom=strong['SolveTime'] + strong['LoadTime'],
+                color='#d62728', label='Overhead')
+    ax3.set_title('Worker-Time Breakdown (Strong)', fontsize=10, fontweight='bold')
+    ax3.set_xlabel('Worker', fontsize=9)
+    ax3.set_ylabel('Tempo worker totale (s)', fontsize=9)
+    ax3.legend(loc='upper left', fontsize=7)
+    ax3.grid(True, alpha=0.3, axis='y')
+
+    fig.suptitle('Pipeline Scaling: Throughput ed Efficienza Parallela', fontsize=11, fontweight='bold')
+
+    # Salvataggio PDF
+    os.makedirs(output_dir, exist_ok=True)
+    plt.tight_layout()
+    plt.savefig(os.path.join(output_dir, "scaling.pdf"), bbox_inches='tight')
+    print("[SUCCESS] Salvato: scaling.pdf")
+    plt.close()
+
+if __name__ == "__main__":
+    plot()
@@ -5,6 +5,7 @@ import os
 import sys
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from path_utils import get_latest_results_file, get_results_paths
+from aggregate import summarize
 
 def plot(results_path=None, output_dir=None):
     print("[INFO] Generazione Plot Validazione (Bar Chart Logaritmico)...")
@@ -25,19 +26,13 @@ def plot(results_path=None, output_dir=None):
         print(f"[WARNING] File {results_path} non trovato.")
         return
 
-    df = pd.read_csv(results_path)
-    
-    # Filtriamo per algoritmi esatti (BF e BnB) per istanze piccole
-    exact_data = df[df['Algo'].isin(['BF', 'BnB'])].copy()
-    if exact_data.empty:
+    # Medie per N, Algo dei soli algoritmi esatti (BF e BnB): riepilogo in streaming, persistito
+    rows = summarize(results_path, ['n', 'algo'], ['time', 'nodes'], {'algo': ['BF', 'BnB']})
+    if not rows:
         print("[WARNING] Nessun dato trovato per algoritmi esatti")
         return
-    
-    # Raggruppiamo per N, Algo e calcoliamo medie
-    grouped_data = exact_data.groupby(['N', 'Algo']).agg({
-        'Time': 'mean',
-        'Nodes': 'mean'
-    }).reset_index()
+    grouped_data = pd.DataFrame(rows).rename(
+        columns={'n': 'N', 'algo': 'Algo', 'time_mean': 'Time', 'nodes_mean': 'Nodes'})
     
     # Setup figure compatta per Overleaf
     fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(10, 3.5))
@@ -5,6 +5,7 @@ import os
 import sys
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from path_utils import get_latest_results_file, get_results_paths
+from aggregate import summarize
 
 def plot(results_path=None, output_dir=None):
     """
@@ -37,7 +38,7 @@ def plot(results_path=None, output_dir=None):
     
     # Tabella 1 + 3 grafici
     table_1_optimality_gap_summary(df)
-    plot_2_lower_bound_error(df, output_dir)
+    plot_2_lower_bound_error(results_path, output_dir)
     plot_3_rpd_by_distribution(df, output_dir)
     plot_4_rpd_vs_machines(df, output_dir)
     
@@ -84,17 +85,18 @@ def table_1_optimality_gap_summary(df):
     return result
 
 
-def plot_2_lower_bound_error(df, output_dir):
+def plot_2_lower_bound_error(results_path, output_dir):
     """
     Andamento dell'Errore del Lower Bound (Istanze Piccole).
     Filtra per Status == 'OPTIMAL' (BnB).
     Gap rappresenta la distanza dell'ottimo dal lower bound.
+    Usa il riepilogo in streaming (media per N, M) invece del DataFrame completo.
     """
     print("[INFO] Generazione Plot 2: Lower Bound Error (Istanze Piccole)...")
     
-    df_filtered = df[df['Status'] == 'OPTIMAL'].copy()
+    rows = summarize(results_path, ['n', 'm'], 'gap', {'status': 'OPTIMAL'})
     
-    if df_filtered.empty:
+    if not rows:
         print("[WARNING] Nessun dato con Status 'OPTIMAL' trovato.")
         return
     
@@ -105,8 +107,8 @@ def plot_2_lower_bound_error(df, output_dir):
     # Colori per numero di macchine
     palette = {2: '#2E86C1', 4: '#E74C3C', 5: '#28B463', 10: '#F39C12', 20: '#9B59B6'}
     
-    # Calcola media per (N, M)
-    df_avg = df_filtered.groupby(['N', 'M'])['Gap'].mean().reset_index()
+    # Media per (N, M)
+    df_avg = pd.DataFrame(rows).rename(columns={'n': 'N', 'm': 'M', 'mean': 'Gap'})
     
     # Line plot raggruppato per M (marker ridotti per figura compatta)
     for m in sorted(df_avg['M'].unique()):
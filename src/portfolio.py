@@ -0,0 +1,198 @@
+"""
+Portfolio parallelo: per una singola istanza B&B e più IG (seed diversi) corrono in processi separati,
+con LPT calcolato subito nel processo chiamante come primo incumbent.
+
+Stato condiviso tra i processi:
+    incumbent   makespan migliore trovato da QUALUNQUE componente (multiprocessing.Value + lock)
+    stop        evento di arresto (ottimo certificato o budget scaduto)
+Ogni componente pubblica i propri miglioramenti (on_improvement). Un thread di controllo nel worker
+(stesso schema della cancellazione in solver_service) abbassa il bound del B&B all'incumbent
+condiviso, così il B&B pota con la best dell'IG, e azzera il time limit dei solver quando scatta stop.
+
+Certificazione dell'ottimo (il portfolio ritorna appena avviene):
+    - il B&B termina OPTIMAL: nessuna soluzione sotto il suo bound finale, quindi l'incumbent è ottimo
+    - l'incumbent raggiunge il lower bound teorico
+Altrimenti si ferma allo scadere del budget (tempo wall) con la migliore soluzione trovata.
+Il risultato indica il componente che ha prodotto la soluzione finale ("winner") e chi l'ha certificata.
+L'istanza è pubblicata una volta in memoria condivisa (shared_instance): ai worker arriva il descrittore.
+
+Usage:
+    python src/portfolio.py data/dataset_exam/small/uniform/inst_20_4_uniform_2154.txt --time-limit 10 --seeds 3
+"""
+import argparse
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+from instance import Instance
+from algorithms import greedy_lpt_solve, BranchAndBound, IteratedGreedy
+from shared_instance import SharedInstanceStore, attach
+
+WATCH_INTERVAL = 0.005  # secondi tra due letture dello stato condiviso (worker e coordinatore)
+
+# --- Lato worker ---------------------------------------------------------------
+
+_INCUMBENT = None
+_STOP = None
+
+
+def _init_worker(incumbent, stop):
+    global _INCUMBENT, _STOP
+    _INCUMBENT = incumbent
+    _STOP = stop
+
+
+def _publish(makespan):
+    with _INCUMBENT.get_lock():
+        if makespan < _INCUMBENT.value:
+            _INCUMBENT.value = makespan
+
+
+def _watch(solver, share_bound, done):
+    """Stop -> time limit azzerato; share_bound: il bound del B&B segue l'incumbent condiviso."""
+    while not done.wait(WATCH_INTERVAL):
+        if _STOP.is_set():
+            solver.time_limit = -1
+            return
+        if share_bound:
+            bound = _INCUMBENT.value
+            if bound < solver.best_makespan:
+                solver.best_makespan = bound
+
+
+def _run_component(name, descriptor, options):
+    """Esegue un componente del portfolio. Ritorna la SUA migliore soluzione (non il bound importato)."""
+    inst = attach(descriptor)
+    own = {}
+
+    def on_improvement(solution):
+        own.update(makespan=solution['makespan'], assignment=solution['assignment'])
+        _publish(solution['makespan'])
+        return _STOP.is_set()
+
+    if name == "BnB":
+        solver = BranchAndBound(inst, time_limit=options['time_limit'], on_improvement=on_improvement)
+        run = solver.solve
+    else:
+        solver = IteratedGreedy(inst, time_limit=options['time_limit'], d=options['d'],
+                                T_lambda=options['T_lambda'], on_improvement=on_improvement)
+        run = lambda: solver.solve(seed=options['seed'])
+
+    done = threading.Event()
+    watcher = threading.Thread(target=_watch, args=(solver, name == "BnB", done), daemon=True)
+    watcher.start()
+    cpu0 = time.process_time()
+    try:
+        _, nodes, status = run()
+    finally:
+        done.set()
+        watcher.join()
+    return {"component": name, "makespan": own['makespan'], "assignment": own['assignment'],
+            "status": status, "nodes": nodes, "bound": solver.best_makespan,
+            "cpu_time": time.process_time() - cpu0}
+
+
+# --- Lato coordinatore ---------------------------------------------------------
+
+class Portfolio:
+    """
+    Corsa parallela di B&B + IG (un seed per processo) con incumbent condiviso.
+    solve() -> (makespan, nodi B&B, status) con status "OPTIMAL" (certificato) o "HEURISTIC".
+    """
+    def __init__(self, instance, time_limit=10, ig_seeds=(42, 43, 44), d=4, T_lambda=0.5,
+                 workers=None, use_bnb=True):
+        self.instance = instance
+        self.time_limit = time_limit
+        self.ig_seeds = list(ig_seeds)
+        self.d = d
+        self.T_lambda = T_lambda
+        self.use_bnb = use_bnb
+        components = int(use_bnb) + len(self.ig_seeds)
+        self.workers = max(1, min(workers or components, components))
+
+        self.best_makespan = float('inf')
+        self.best_assignment = []
+        self.winner = None        # componente che ha prodotto la soluzione finale
+        self.certified_by = None  # "BnB", "lower_bound" o None (budget scaduto)
+        self.wall_time = 0.0      # secondi fino alla risposta (certificazione o budget)
+        self.cpu_time = 0.0       # CPU totale: coordinatore + tutti i componenti (confrontabile con B&B/IG)
+        self.reports = []         # un dict per componente (vedi _run_component)
+
+    def solve(self):
+        start = time.perf_counter()
+        cpu0 = time.process_time()
+        deadline = start + self.time_limit
+        lb = self.instance.get_theoretical_lower_bound()
+
+        # LPT nel coordinatore: primo incumbent per tutti, prima ancora di avviare i processi
+        lpt_makespan, lpt_assignment = greedy_lpt_solve(self.instance)
+        self.reports = [{"component": "LPT", "makespan": lpt_makespan, "assignment": list(lpt_assignment),
+                         "status": "HEURISTIC", "nodes": 0, "bound": lpt_makespan, "cpu_time": 0.0}]
+        self.certified_by = "lower_bound" if lpt_makespan <= lb else None
+
+        if self.certified_by is None:
+            incumbent = multiprocessing.Value('q', lpt_makespan)
+            stop = multiprocessing.Event()
+            jobs = [("BnB", {"time_limit": self.time_limit})] if self.use_bnb else []
+            jobs += [(f"IG[seed={seed}]", {"time_limit": self.time_limit, "d": self.d,
+                                           "T_lambda": self.T_lambda, "seed": seed}) for seed in self.ig_seeds]
+            # L'istanza va ai worker una volta sola, in memoria condivisa (descrittore al posto della matrice)
+            store = SharedInstanceStore()
+            descriptor = store.publish(self.instance, key="portfolio")
+            pool = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                       initargs=(incumbent, stop))
+            try:
+                pending = {pool.submit(_run_component, name, descriptor, options) for name, options in jobs}
+                answered = None
+                while pending:
+                    finished, pending = wait(pending, timeout=WATCH_INTERVAL, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        report = future.result()
+                        self.reports.append(report)
+                        if report['component'] == "BnB" and report['status'] == "OPTIMAL":
+                            self.certified_by = self.certified_by or "BnB"
+                    if self.certified_by is None and incumbent.value <= lb:
+                        self.certified_by = "lower_bound"
+                    if answered is None and (self.certified_by or time.perf_counter() >= deadline):
+                        # Da qui i componenti escono al loro prossimo controllo: si raccolgono le soluzioni
+                        answered = time.perf_counter()
+                        stop.set()
+                self.wall_time = (answered or time.perf_counter()) - start
+            finally:
+                stop.set()
+                pool.shutdown(wait=True)
+                store.close()
+        else:
+            self.wall_time = time.perf_counter() - start
+
+        self.cpu_time = time.process_time() - cpu0 + sum(r['cpu_time'] for r in self.reports)
+
+        # Soluzione finale: la migliore tra i componenti (a parità, l'ordine di avvio)
+        order = ["LPT", "BnB"] + [f"IG[seed={seed}]" for seed in self.ig_seeds]
+        best = min(self.reports, key=lambda r: (r['makespan'], order.index(r['component'])))
+        self.best_makespan, self.best_assignment, self.winner = best['makespan'], best['assignment'], best['component']
+        nodes = next((r['nodes'] for r in self.reports if r['component'] == "BnB"), 0)
+        return self.best_makespan, nodes, "OPTIMAL" if self.certified_by else "HEURISTIC"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Portfolio parallelo B&B + IG con incumbent condiviso")
+    parser.add_argument("instance", type=str, help="File istanza")
+    parser.add_argument("--time-limit", type=float, default=10, help="Budget wall in secondi (default: 10)")
+    parser.add_argument("--seeds", type=int, default=3, help="Numero di IG (seed 42, 43, ...)")
+    parser.add_argument("--workers", type=int, default=None, help="Processi (default: 1 per componente)")
+    parser.add_argument("--no-bnb", action="store_true", help="Solo IG (istanze grandi)")
+    args = parser.parse_args()
+
+    inst = Instance(args.instance)
+    portfolio = Portfolio(inst, time_limit=args.time_limit, ig_seeds=range(42, 42 + args.seeds),
+                          workers=args.workers, use_bnb=not args.no_bnb)
+    makespan, nodes, status = portfolio.solve()
+    print(f"🏁 {os.path.basename(args.instance)}: makespan={makespan} ({status}) in {portfolio.wall_time:.2f}s "
+          f"(CPU totale {portfolio.cpu_time:.2f}s)")
+    print(f"   Vincitore: {portfolio.winner} | Certificato da: {portfolio.certified_by or '-'}")
+    for report in portfolio.reports:
+        print(f"   {report['component']:<14} makespan={report['makespan']:<6} status={report['status']:<10} "
+              f"nodi/iter={report['nodes']:<9} cpu={report['cpu_time']:.2f}s")
@@ -0,0 +1,238 @@
+"""
+Rescheduling incrementale: ripara una soluzione esistente dopo una variazione dell'istanza,
+invece di ripartire da zero con greedy_lpt_solve + IteratedGreedy.
+
+Variazioni supportate (applicate all'istanza originale M x N):
+    removed_jobs      indici dei job cancellati
+    removed_machines  indici delle macchine guaste (i loro job vanno ricollocati)
+    added_machines    righe delle nuove macchine: tempi dei job originali NON rimossi, nell'ordine originale
+    added_jobs        colonne dei nuovi job: tempi sulle macchine finali
+                      (macchine originali non rimosse, poi le nuove)
+
+Nuova istanza: job = originali superstiti (stesso ordine) + nuovi; macchine = originali superstiti + nuove.
+
+Riparazione:
+    1. i job superstiti restano sulla loro macchina (se esiste ancora)
+    2. reinserimento dei job liberi (nuovi + spostati da macchine rimosse), ordinati per tempo minimo
+       decrescente, sulla macchina che minimizza il makespan risultante (stesso criterio della
+       construction dell'IG)
+    3. local search sulla macchina critica entro time_limit (spostamenti singoli, poi scambi): ogni
+       mossa migliora (makespan, n. macchine critiche); a parità si preferiscono le mosse che non
+       spostano job già assegnati, senza mai superare max_moves. Riportare un job sulla macchina
+       originale riduce il conteggio.
+"""
+import time
+
+from instance import Instance
+
+
+class IncrementalRescheduler:
+    def __init__(self, instance, assignment, added_jobs=None, removed_jobs=None,
+                 added_machines=None, removed_machines=None, time_limit=0.05, max_moves=None):
+        self.instance = instance
+        self.assignment = assignment
+        self.added_jobs = [list(col) for col in (added_jobs or [])]
+        self.removed_jobs = set(removed_jobs or [])
+        self.added_machines = [list(row) for row in (added_machines or [])]
+        self.removed_machines = set(removed_machines or [])
+        self.time_limit = time_limit
+        self.max_moves = max_moves
+
+        self.new_instance = None
+        self.job_map = {}       # job originale -> job nuovo
+        self.machine_map = {}   # macchina originale -> macchina nuova
+        self.best_makespan = float('inf')
+        self.best_assignment = []
+        self.moved = 0          # job superstiti spostati (rispetto alla macchina originale)
+        self.displaced = 0      # job che erano su macchine rimosse (spostamento inevitabile)
+
+    def _build_instance(self):
+        """Costruisce la nuova istanza applicando la variazione."""
+        old = self.instance
+        kept_jobs = [j for j in range(old.num_jobs) if j not in self.removed_jobs]
+        kept_machines = [i for i in range(old.num_machines) if i not in self.removed_machines]
+        self.job_map = {j: k for k, j in enumerate(kept_jobs)}
+        self.machine_map = {i: k for k, i in enumerate(kept_machines)}
+
+        num_machines = len(kept_machines) + len(self.added_machines)
+        if num_machines == 0:
+            raise ValueError("Nessuna macchina disponibile dopo la variazione")
+        for row in self.added_machines:
+            if len(row) != len(kept_jobs):
+                raise ValueError(f"Nuova macchina: attesi {len(kept_jobs)} tempi (job superstiti), trovati {len(row)}")
+        for col in self.added_jobs:
+            if len(col) != num_machines:
+                raise ValueError(f"Nuovo job: attesi {num_machines} tempi (macchine finali), trovati {len(col)}")
+
+        rows = [[old.get_time(i, j) for j in kept_jobs] for i in kept_machines] + self.added_machines
+        for k, row in enumerate(rows):
+            row.extend(col[k] for col in self.added_jobs)
+        if not rows[0]:
+            raise ValueError("Nessun job rimasto dopo la variazione")
+        return Instance.from_matrix(rows, name=f"{old.filepath}+delta")
+
+    def solve(self):
+        """Ritorna (makespan, assignment, moved) sulla nuova istanza."""
+        start = time.process_time()
+        self.new_instance = inst = self._build_instance()
+        n, m = inst.num_jobs, inst.num_machines
+        p = inst.processing_times
+
+        # 1. I superstiti restano dove sono
+        origin = [-1] * n  # macchina "di riferimento" per il conteggio degli spostamenti (-1 = job libero)
+        assignment = [-1] * n
+        loads = [0] * m
+        self.displaced = 0
+        for j_old, j in self.job_map.items():
+            mach = self.machine_map.get(self.assignment[j_old])
+            if mach is None:
+                self.displaced += 1
+                continue
+            origin[j] = assignment[j] = mach
+            loads[mach] += p[mach][j]
+
+        # 2. Reinserimento dei job liberi: i più "pesanti" per primi
+        free = [j for j in range(n) if assignment[j] == -1]
+        free.sort(key=lambda j: (min(p[i][j] for i in range(m)), j), reverse=True)
+        for job in free:
+            current_Cmax = max(loads)
+            best_m, best_cost = -1, None
+            for mach in range(m):
+                new_load = loads[mach] + p[mach][job]
+                cost = (max(current_Cmax, new_load), new_load)
+                if best_cost is None or cost < best_cost:
+                    best_cost, best_m = cost, mach
+            assignment[job] = best_m
+            loads[best_m] += p[best_m][job]
+
+        # 3. Local search a budget
+        moved = 0
+        while (time.process_time() - start) < self.time_limit:
+            move = self._best_move(assignment, loads, origin, moved)
+            if move is None:
+                break
+            for job, src, dest in move:
+                moved += self._extra(origin, job, src, dest)
+                loads[src] -= p[src][job]
+                loads[dest] += p[dest][job]
+                assignment[job] = dest
+
+        self.best_makespan = max(loads)
+        self.best_assignment = assignment
+        self.moved = moved
+        return self.best_makespan, assignment, moved
+
+    def _extra(self, origin, job, src, dest):
+        """Spostamenti aggiuntivi causati dal muovere job da src a dest (0 per i job liberi)."""
+        if origin[job] == -1:
+            return 0
+        return (dest != origin[job]) - (src != origin[job])
+
+    def _best_move(self, assignment, loads, origin, moved):
+        """
+        Mossa migliorante dalla macchina critica: tutte le macchine coinvolte scendono sotto il
+        makespan, quindi cala il makespan (o, a parità, il numero di macchine critiche).
+        Prima gli spostamenti singoli, poi gli scambi tra un job critico e un job di un'altra macchina.
+        A parità di vicinato si preferisce: meno spostamenti aggiuntivi (job liberi o job che tornano
+        alla macchina originale prima), poi il carico risultante più basso.
+        Ritorna una lista di (job, src, dest) oppure None.
+        """
+        p = self.new_instance.processing_times
+        m = self.new_instance.num_machines
+        cmax = max(loads)
+        critical = loads.index(cmax)
+        on_critical = [j for j, mach in enumerate(assignment) if mach == critical]
+
+        def allowed(extra):
+            return extra <= 0 or self.max_moves is None or moved + extra <= self.max_moves
+
+        # 1. Spostamento singolo
+        best, best_rank = None, None
+        for job in on_critical:
+            if loads[critical] - p[critical][job] >= cmax:
+                continue
+            for dest in range(m):
+                if dest == critical:
+                    continue
+                new_dest = loads[dest] + p[dest][job]
+                extra = self._extra(origin, job, critical, dest)
+                if new_dest >= cmax or not allowed(extra):
+                    continue
+                rank = (extra, new_dest, job, dest)
+                if best_rank is None or rank < best_rank:
+                    best_rank, best = rank, [(job, critical, dest)]
+        if best is not None:
+            return best
+
+        # 2. Scambio: job critico a <-> job b su un'altra macchina
+        for a in on_critical:
+            for b, dest in enumerate(assignment):
+                if dest == critical:
+                    continue
+                new_crit = loads[critical] - p[critical][a] + p[critical][b]
+                new_dest = loads[dest] - p[dest][b] + p[dest][a]
+                if new_crit >= cmax or new_dest >= cmax:
+                    continue
+                extra = self._extra(origin, a, critical, dest) + self._extra(origin, b, dest, critical)
+                if not allowed(extra):
+                    continue
+                rank = (extra, max(new_crit, new_dest), a, b)
+                if best_rank is None or rank < best_rank:
+                    best_rank, best = rank, [(a, critical, dest), (b, dest, critical)]
+        return best
+
+if __name__ == "__main__":
+    import argparse
+    import random
+
+    from algorithms import IteratedGreedy
+
+    parser = argparse.ArgumentParser(description="Demo: rescheduling incrementale vs re-solve completo con IG")
+    parser.add_argument("instance", type=str, help="File istanza di partenza")
+    parser.add_argument("--add-jobs", type=int, default=5)
+    parser.add_argument("--remove-jobs", type=int, default=5)
+    parser.add_argument("--remove-machines", type=int, default=1)
+    parser.add_argument("--add-machines", type=int, default=0)
+    parser.add_argument("--time-limit", type=float, default=0.05, help="Budget CPU della riparazione (s)")
+    parser.add_argument("--max-moves", type=int, default=None, help="Massimo di job già assegnati da spostare")
+    parser.add_argument("--ig-time", type=float, default=1.0, help="Budget CPU dell'IG (soluzione iniziale e re-solve)")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    inst = Instance(args.instance)
+    base = IteratedGreedy(inst, time_limit=args.ig_time)
+    base.solve(seed=args.seed)
+    base_makespan, base_assign = base.best_makespan, base.best_assignment
+    print(f"📂 {inst.filepath}: {inst.num_jobs} job, {inst.num_machines} macchine, makespan iniziale {base_makespan}")
+
+    removed_jobs = rng.sample(range(inst.num_jobs), min(args.remove_jobs, inst.num_jobs - 1))
+    removed_machines = rng.sample(range(inst.num_machines), min(args.remove_machines, inst.num_machines - 1))
+    # Variazione realistica: una macchina nuova clona una esistente, un job nuovo clona un job esistente
+    kept_jobs = [j for j in range(inst.num_jobs) if j not in removed_jobs]
+    kept_machines = [i for i in range(inst.num_machines) if i not in removed_machines]
+    clones = [rng.randrange(inst.num_machines) for _ in range(args.add_machines)]
+    added_machines = [[inst.get_time(src, j) for j in kept_jobs] for src in clones]
+    added_jobs = []
+    for _ in range(args.add_jobs):
+        job = rng.randrange(inst.num_jobs)
+        added_jobs.append([inst.get_time(i, job) for i in kept_machines + clones])
+
+    rescheduler = IncrementalRescheduler(inst, base_assign, added_jobs=added_jobs, removed_jobs=removed_jobs,
+                                         added_machines=added_machines, removed_machines=removed_machines,
+                                         time_limit=args.time_limit, max_moves=args.max_moves)
+    t0 = time.process_time()
+    makespan, assignment, moved = rescheduler.solve()
+    repair_time = time.process_time() - t0
+
+    t0 = time.process_time()
+    full_makespan = IteratedGreedy(rescheduler.new_instance, time_limit=args.ig_time).solve(seed=args.seed)[0]
+    full_time = time.process_time() - t0
+
+    new_inst = rescheduler.new_instance
+    print(f"🔁 Variazione: +{len(added_jobs)}/-{len(removed_jobs)} job, "
+          f"+{len(added_machines)}/-{len(removed_machines)} macchine -> {new_inst.num_jobs}x{new_inst.num_machines}")
+    print(f"⚡ Incrementale: makespan {makespan} in {repair_time * 1000:.1f} ms, "
+          f"{moved} job spostati (+{rescheduler.displaced} da macchine rimosse)")
+    print(f"🐢 Re-solve IG:  makespan {full_makespan} in {full_time * 1000:.1f} ms "
+          f"(gap incrementale {(makespan - full_makespan) / full_makespan * 100:+.2f}%)")
@@ -0,0 +1,99 @@
+"""
+Cache persistente (SQLite, solo stdlib) dei risultati dei solver deterministici.
+
+Brute Force e Branch & Bound completato (OPTIMAL) producono sempre lo stesso risultato
+per la stessa istanza: ha senso riusarlo tra esperimenti diversi (validation, pilot_a, workhorse).
+La chiave include la versione del codice dei solver (hash di algorithms.py e brute_force_vec.py):
+modificare gli algoritmi invalida automaticamente tutta la cache.
+Il tempo salvato è quello misurato originariamente (il run servito dalla cache non viene rimisurato).
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import time
+
+import algorithms
+
+# Algoritmi deterministici cacheabili (IG è stocastico e a tempo: mai cacheato)
+DETERMINISTIC_ALGOS = ("BF", "BnB", "DP")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    key         TEXT PRIMARY KEY,
+    algo        TEXT,
+    params      TEXT,
+    result      TEXT NOT NULL,
+    created_at  REAL,
+    last_access REAL
+)
+"""
+
+_SOLVER_VERSION = None
+
+# Sorgenti dei solver (brute_force_vec non viene importato: NumPy resta fuori dall'avvio)
+SOLVER_SOURCES = [algorithms.__file__,
+                  os.path.join(os.path.dirname(os.path.abspath(algorithms.__file__)), "brute_force_vec.py")]
+
+def solver_code_version():
+    """Hash (troncato) dei sorgenti dei solver."""
+    global _SOLVER_VERSION
+    if _SOLVER_VERSION is None:
+        h = hashlib.sha256()
+        for path in SOLVER_SOURCES:
+            with open(path, 'rb') as f:
+                h.update(f.read())
+        _SOLVER_VERSION = h.hexdigest()[:16]
+    return _SOLVER_VERSION
+
+def is_cacheable(algo, status):
+    """Solo i run deterministici e completati: un B&B in TIMEOUT dipende dalla velocità della macchina."""
+    return algo in DETERMINISTIC_ALGOS and status == "OPTIMAL"
+
+
+class ResultCache:
+    def __init__(self, db_path, max_entries=50000):
+        self.db_path = db_path
+        self.max_entries = max_entries
+        if os.path.dirname(db_path):
+            os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        self.conn = sqlite3.connect(db_path, timeout=60)
+        self.conn.execute(SCHEMA)
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_last_access ON results(last_access)")
+        self.conn.commit()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(instance_hash, algo, params, seed, timer):
+        """Chiave: (hash istanza, algoritmo, parametri, seed, tipo di timer, versione solver)."""
+        raw = json.dumps([instance_hash, algo, params, seed, timer, solver_code_version()])
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    def get(self, key):
+        row = self.conn.execute("SELECT result FROM results WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.conn.execute("UPDATE results SET last_access = ? WHERE key = ?", (time.time(), key))
+        self.conn.commit()
+        return json.loads(row[0])
+
+    def put(self, key, algo, params, result):
+        now = time.time()
+        self.conn.execute("INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?)",
+                          (key, algo, params, json.dumps(result), now, now))
+        self._evict()
+        self.conn.commit()
+
+    def _evict(self):
+        """Eviction LRU: oltre max_entries rimuove le voci usate meno di recente."""
+        count = self.conn.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+        excess = count - self.max_entries
+        if excess > 0:
+            self.conn.execute("DELETE FROM results WHERE key IN "
+                              "(SELECT key FROM results ORDER BY last_access ASC LIMIT ?)", (excess,))
+
+    def close(self):
+        self.conn.close()
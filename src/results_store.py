@@ -0,0 +1,240 @@
+"""
+Backend opzionale dei risultati su SQLite (solo stdlib).
+
+Stesse colonne del CSV, più i parametri degli algoritmi già estratti in colonne tipizzate
+(d, t_lambda, time_limit, warm_start): i plot possono filtrare/aggregare direttamente in SQL
+invece di caricare tutto il CSV e ri-parsare "d=4,T=0.1,t=30s" riga per riga.
+Il CSV resta il formato di scambio: import_csv/export_csv garantiscono la compatibilità.
+
+Usage:
+    python src/results_store.py import results/reference/*.csv --db results/generated/results.sqlite
+    python src/results_store.py export --db results/generated/results.sqlite --experiment workhorse_final out.csv
+"""
+import argparse
+import csv
+import os
+import re
+import sqlite3
+
+CSV_COLUMNS = ["Experiment", "Dist", "N", "M", "Replica", "Seed", "Algo", "Params",
+               "Time", "Obj", "Status", "Gap", "Nodes"]
+
+# Colonne facoltative del CSV (cache, misura memoria, portfolio): (colonna CSV, colonna SQL, tipo),
+# nello stesso ordine in cui run_experiment le aggiunge. Esportate solo se valorizzate.
+OPTIONAL_COLUMNS = [("Source", "source", "TEXT"), ("PeakPyMB", "peak_py_mb", "REAL"),
+                    ("RSSDeltaMB", "rss_delta_mb", "REAL"), ("Winner", "winner", "TEXT"),
+                    ("WallTime", "wall_time", "REAL")]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    id          INTEGER PRIMARY KEY AUTOINCREMENT,
+    experiment  TEXT NOT NULL,
+    dist        TEXT NOT NULL,
+    n           INTEGER NOT NULL,
+    m           INTEGER NOT NULL,
+    replica     INTEGER,
+    seed        INTEGER,
+    algo        TEXT NOT NULL,
+    params      TEXT,
+    time        REAL,
+    obj         REAL,
+    status      TEXT,
+    gap         REAL,
+    nodes       INTEGER,
+    d           INTEGER,
+    t_lambda    REAL,
+    time_limit  REAL,
+    warm_start  INTEGER NOT NULL DEFAULT 0,
+    source      TEXT,
+    peak_py_mb  REAL,
+    rss_delta_mb REAL,
+    winner      TEXT,
+    wall_time   REAL
+)
+"""
+
+INDEXES = [
+    "CREATE INDEX IF NOT EXISTS idx_results_cell ON results(experiment, n, m, dist, algo)",
+    "CREATE INDEX IF NOT EXISTS idx_results_status ON results(experiment, status)",
+]
+
+# Colonne interrogabili (whitelist: i nomi finiscono nell'SQL, i valori sono sempre parametri)
+QUERY_COLUMNS = {"experiment", "dist", "n", "m", "replica", "seed", "algo", "params", "time", "obj",
+                 "status", "gap", "nodes", "d", "t_lambda", "time_limit", "warm_start",
+                 "source", "peak_py_mb", "rss_delta_mb", "winner", "wall_time"}
+
+_PARAM_RE = re.compile(r'^(d|T|t|TL)=([0-9.]+)s?$')
+
+
+def parse_params(params):
+    """
+    Estrae i parametri tipizzati dalla stringa Params del CSV.
+    "d=4,T=0.1,t=30s" -> d=4, t_lambda=0.1, time_limit=30.0 | "TL=60s" -> time_limit=60.0 | "Exact" -> nulla
+    """
+    parsed = {"d": None, "t_lambda": None, "time_limit": None, "warm_start": 0}
+    for part in (params or "").split(','):
+        part = part.strip()
+        if part == "WS":
+            parsed["warm_start"] = 1
+            continue
+        match = _PARAM_RE.match(part)
+        if not match:
+            continue
+        name, value = match.groups()
+        if name == "d":
+            parsed["d"] = int(value)
+        elif name == "T":
+            parsed["t_lambda"] = float(value)
+        else:
+            parsed["time_limit"] = float(value)
+    return parsed
+
+
+def _optional(value, sql_type):
+    """Valore di una colonna facoltativa: cella vuota o assente -> NULL."""
+    if value is None or value == "":
+        return None
+    return float(value) if sql_type == "REAL" else value
+
+
+def _where(filters):
+    """Costruisce la clausola WHERE da {colonna: valore | lista di valori}."""
+    clauses, args = [], []
+    for col, value in (filters or {}).items():
+        if col not in QUERY_COLUMNS:
+            raise ValueError(f"Colonna non valida: {col}")
+        if isinstance(value, (list, tuple, set)):
+            value = list(value)
+            clauses.append(f"{col} IN ({','.join('?' * len(value))})")
+            args.extend(value)
+        else:
+            clauses.append(f"{col} = ?")
+            args.append(value)
+    return (" WHERE " + " AND ".join(clauses)) if clauses else "", args
+
+
+class ResultsStore:
+    def __init__(self, db_path):
+        self.db_path = db_path
+        if os.path.dirname(db_path):
+            os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        self.conn = sqlite3.connect(db_path, timeout=60)
+        self.conn.execute(SCHEMA)
+        # Database creati prima delle colonne facoltative: si aggiungono in coda
+        existing = {row[1] for row in self.conn.execute("PRAGMA table_info(results)")}
+        for _, col, sql_type in OPTIONAL_COLUMNS:
+            if col not in existing:
+                self.conn.execute(f"ALTER TABLE results ADD COLUMN {col} {sql_type}")
+        for stmt in INDEXES:
+            self.conn.execute(stmt)
+        self.conn.commit()
+
+    def insert_rows(self, rows, replace_experiment=None, batch_size=5000):
+        """
+        Inserisce righe in formato CSV (dict con le chiavi di CSV_COLUMNS, più eventuali OPTIONAL_COLUMNS)
+        in un'unica transazione, a blocchi di batch_size. replace_experiment: cancella prima le righe di
+        quell'esperimento.
+        """
+        sql = ("INSERT INTO results (experiment, dist, n, m, replica, seed, algo, params, time, obj, "
+               "status, gap, nodes, d, t_lambda, time_limit, warm_start, source, peak_py_mb, rss_delta_mb, winner, "
+               "wall_time) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)")
+        count = 0
+        with self.conn:  # transazione: commit a fine blocco, rollback su eccezione
+            if replace_experiment is not None:
+                self.conn.execute("DELETE FROM results WHERE experiment = ?", (replace_experiment,))
+            batch = []
+            for row in rows:
+                p = parse_params(row['Params'])
+                batch.append((row['Experiment'], row['Dist'], int(row['N']), int(row['M']),
+                              int(row['Replica']), int(row['Seed']), row['Algo'], row['Params'],
+                              float(row['Time']), float(row['Obj']), row['Status'], float(row['Gap']),
+                              int(float(row['Nodes'])), p['d'], p['t_lambda'], p['time_limit'], p['warm_start'])
+                             + tuple(_optional(row.get(name), sql_type) for name, _, sql_type in OPTIONAL_COLUMNS))
+                if len(batch) >= batch_size:
+                    self.conn.executemany(sql, batch)
+                    count += len(batch)
+                    batch = []
+            if batch:
+                self.conn.executemany(sql, batch)
+                count += len(batch)
+        return count
+
+    def import_csv(self, csv_path, replace=True):
+        """Importa un CSV di risultati; con replace=True sostituisce gli esperimenti che contiene."""
+        with open(csv_path, 'r', newline='') as f:
+            rows = list(csv.DictReader(f))
+        total = 0
+        for experiment in dict.fromkeys(r['Experiment'] for r in rows):
+            subset = (r for r in rows if r['Experiment'] == experiment)
+            total += self.insert_rows(subset, replace_experiment=experiment if replace else None)
+        return total
+
+    def export_csv(self, csv_path, filters=None):
+        """
+        Esporta in CSV (stesso formato di run_experiment: terminatore \\n, colonne facoltative solo se
+        valorizzate in almeno una riga esportata), in ordine di inserimento.
+        """
+        where, args = _where(filters)
+        optional = [(name, col) for name, col, _ in OPTIONAL_COLUMNS
+                    if self.conn.execute(f"SELECT 1 FROM results{where}{' AND' if where else ' WHERE'} "
+                                         f"{col} IS NOT NULL LIMIT 1", args).fetchone()]
+        cur = self.conn.execute(
+            "SELECT experiment, dist, n, m, replica, seed, algo, params, time, obj, status, gap, nodes"
+            + "".join(f", {col}" for _, col in optional) + f" FROM results{where} ORDER BY id", args)
+        with open(csv_path, 'w', newline='') as f:
+            writer = csv.writer(f, lineterminator="\n")
+            writer.writerow(CSV_COLUMNS + [name for name, _ in optional])
+            for row in cur:
+                row = list(row)
+                row[9] = int(row[9]) if row[9] is not None and row[9] == int(row[9]) else row[9]
+                writer.writerow(row)
+
+    def fetch(self, columns, filters=None):
+        """SELECT columns WHERE filters -> lista di dict."""
+        for col in columns:
+            if col not in QUERY_COLUMNS:
+                raise ValueError(f"Colonna non valida: {col}")
+        where, args = _where(filters)
+        cur = self.conn.execute(f"SELECT {', '.join(columns)} FROM results{where} ORDER BY id", args)
+        return [dict(zip(columns, row)) for row in cur]
+
+    def aggregate(self, group_by, value, filters=None):
+        """
+        Aggregazione eseguita da SQLite: per ogni gruppo count, mean, var (popolazione), min, max di `value`.
+        Ritorna lista di dict ordinata per le colonne di raggruppamento.
+        """
+        for col in list(group_by) + [value]:
+            if col not in QUERY_COLUMNS:
+                raise ValueError(f"Colonna non valida: {col}")
+        where, args = _where(filters)
+        keys = ", ".join(group_by)
+        cur = self.conn.execute(
+            f"SELECT {keys}, COUNT({value}), AVG({value}), AVG({value} * {value}) - AVG({value}) * AVG({value}), "
+            f"MIN({value}), MAX({value}) FROM results{where} GROUP BY {keys} ORDER BY {keys}", args)
+        out = []
+        for row in cur:
+            rec = dict(zip(group_by, row[:len(group_by)]))
+            rec.update(zip(("count", "mean", "var", "min", "max"), row[len(group_by):]))
+            out.append(rec)
+        return out
+
+    def close(self):
+        self.conn.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Backend SQLite dei risultati")
+    parser.add_argument("command", choices=["import", "export"])
+    parser.add_argument("paths", nargs="+", help="CSV da importare, oppure CSV di destinazione per export")
+    parser.add_argument("--db", type=str, required=True, help="Database SQLite dei risultati")
+    parser.add_argument("--experiment", type=str, default=None, help="Filtra per esperimento (export)")
+    args = parser.parse_args()
+
+    store = ResultsStore(args.db)
+    if args.command == "import":
+        for path in args.paths:
+            print(f"📥 {path}: {store.import_csv(path)} righe")
+    else:
+        store.export_csv(args.paths[0], {"experiment": args.experiment} if args.experiment else None)
+        print(f"📤 Esportato: {args.paths[0]}")
+    store.close()
@@ -2,6 +2,7 @@ import argparse
 import json
 import os
 import csv
+import io
 import time
 import glob
 import random
@@ -9,7 +10,16 @@ import re
 
 # Assicurati che questi import funzionino con la tua struttura
 from instance import Instance
-from algorithms import BranchAndBound, IteratedGreedy, PureBruteForce
+from algorithms import BranchAndBound, IteratedGreedy, PureBruteForce, TwoMachineDP
+from bks_registry import BestKnownRegistry
+from result_cache import ResultCache, DETERMINISTIC_ALGOS, is_cacheable
+from results_store import ResultsStore
+from scheduler import load_timing_history, estimate_task_cost, order_longest_first, predict_makespan
+from work_queue import WorkQueue, enqueue_config, run_worker
+import tracing
+from memory_probe import MemoryProbe, MEMORY_FIELDS
+from instance_archive import ARCHIVE_SEP, archive_paths, is_archive_path, load_instance as load_archived_instance
+from shared_instance import SharedInstanceStore, attach
 
 def parse_filename(filename):
     """
@@ -36,29 +46,32 @@ def parse_filename(filename):
         print(f"⚠️ Warning: Skip file anomalo '{filename}': {e}")
         return None
 
-def run_experiment(config_path):
-    # 1. Carica Configurazione
-    with open(config_path, 'r') as f:
-        config = json.load(f)
-    
-    print(f"🚀 Avvio Esperimento: {config['experiment_name']}")
-    print(f"📄 Configurazione: {config_path}")
-    
-    # 2. Setup Output CSV
-    output_file = config['output_file']
-    os.makedirs(os.path.dirname(output_file), exist_ok=True)
-    
-    # Header del CSV
-    fieldnames = ["Experiment", "Dist", "N", "M", "Replica", "Seed", "Algo", "Params", "Time", "Obj", "Status", "Gap", "Nodes"]
-    
-    # 3. Scansione del "Magazzino Dati" (Dataset esistente)
-    dataset_root = os.path.join("data", "dataset_exam")
-    if not os.path.exists(dataset_root):
-        print(f"❌ Errore: Cartella dati '{dataset_root}' non trovata. Lancia generator.py prima!")
-        return
+# Header del CSV
+FIELDNAMES = ["Experiment", "Dist", "N", "M", "Replica", "Seed", "Algo", "Params", "Time", "Obj", "Status", "Gap", "Nodes"]
+# Colonna extra dei run con portfolio: componente che ha prodotto la soluzione finale
+PORTFOLIO_FIELDS = ["Winner", "WallTime"]
 
-    # Trova tutti i file .txt ricorsivamente
-    all_files = glob.glob(os.path.join(dataset_root, "**/*.txt"), recursive=True)
+def collect_instances(config):
+    """
+    Scansiona il dataset e ritorna [(filepath, meta)] filtrati dal JSON,
+    in ordine canonico NUMERICO (N, M, Dist, Seed). Ritorna None se il dataset manca.
+    """
+    # Archivio compatto (un solo file mmap, vedi instance_archive) al posto della cartella
+    dataset_archive = config.get('dataset_archive')
+    if dataset_archive:
+        if not os.path.exists(dataset_archive):
+            print(f"❌ Errore: Archivio dati '{dataset_archive}' non trovato. Crealo con instance_archive.py pack!")
+            return None
+        all_files = archive_paths(dataset_archive)
+    else:
+        # Scansione del "Magazzino Dati" (Dataset esistente, o "dataset_root" del JSON per campagne sintetiche)
+        dataset_root = config.get('dataset_root', os.path.join("data", "dataset_exam"))
+        if not os.path.exists(dataset_root):
+            print(f"❌ Errore: Cartella dati '{dataset_root}' non trovata. Lancia generator.py prima!")
+            return None
+
+        # Trova tutti i file .txt ricorsivamente
+        all_files = glob.glob(os.path.join(dataset_root, "**/*.txt"), recursive=True)
     
     # Ordinamento NUMERICO (non alfabetico!) per N, M, Seed
     def sort_key(filepath):
@@ -74,146 +87,795 @@ def run_experiment(config_path):
     target_m = config['parameters'].get('m_values', [])
     target_dist = config['parameters'].get('distributions', [])
     
-    count = 0
-    skipped = 0
-    
-    # SOVRASCRITTURA COMPLETA DEL FILE (non append)
-    with open(output_file, 'w', newline='') as csvfile:
-        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-        writer.writeheader()  # Scrivi sempre l'header
+    instances = []
+    for filepath in all_files:
+        meta = parse_filename(os.path.basename(filepath))
+        if not meta: continue
+        
+        # --- FILTRO INTELLIGENTE ---
+        # Se l'istanza su disco non è richiesta dal JSON, la saltiamo.
+        if meta['n'] not in target_n or meta['m'] not in target_m or meta['dist'] not in target_dist:
+            continue
+        instances.append((filepath, meta))
+    return instances
 
-        for filepath in all_files:
-            filename = os.path.basename(filepath)
-            meta = parse_filename(filename)
-            
-            if not meta: continue
-            
-            # --- FILTRO INTELLIGENTE ---
-            # Se l'istanza su disco non è richiesta dal JSON, la saltiamo.
-            if meta['n'] not in target_n: 
-                skipped += 1
-                continue
-            if meta['m'] not in target_m: 
-                skipped += 1
-                continue
-            if meta['dist'] not in target_dist: 
-                skipped += 1
-                continue
-            
-            count += 1
-            print(f"[{count}] Processing {meta['n']}x{meta['m']} {meta['dist']} (Seed {meta['seed']})...")
-            
-            # Calcola replica dal seed (5 repliche per configurazione, seed parte da 2024)
-            replica = (meta['seed'] - 2024) % 5
+def build_tasks(config, instances, registry=None, with_hash=False):
+    """
+    Espande (istanza x algoritmo x configurazione) in una lista di task indipendenti,
+    nell'ordine canonico di scrittura del CSV (per istanza: BF, BnB, DP, IG...).
+    Ogni task è un dict serializzabile (picklable) con il proprio seed deterministico.
+    L'hash del contenuto (registro BKS, cache, selettore) è calcolato una volta per istanza e
+    salvato nel task ("instance_hash"): il padre non deve più riaprire il file.
+    """
+    algo_conf = config.get('algorithms', {})
+    experiment_name = config.get('experiment_name', '')
+    # Seleziona timer appropriato per micro/macro-benchmarking
+    use_wall_clock = config.get('measure_wall_clock', False)
+    measure_memory = config.get('measure_memory', False)
+    # Storage della matrice: "list" (default), "array" o "mmap" (istanze enormi, vedi streaming_parser)
+    storage = config.get('instance_storage', 'list')
+    
+    # Selettore appreso (opzionale, "selector" nel blocco branch_and_bound): sostituisce la regola fissa
+    # N > 20 con il tempo previsto dal modello (vedi selector.py)
+    bb_conf = algo_conf.get('branch_and_bound') or {}
+    selector = None
+    if bb_conf.get('selector'):
+        from selector import BnBTimeModel, Selector, instance_features
+        sel_conf = bb_conf['selector']
+        selector = Selector(BnBTimeModel.load(sel_conf['model']), sel_conf.get('margin', 10.0),
+                            sel_conf.get('min_time_limit', 1.0))
+    selection_log = _selection_log(config)
+    
+    tasks = []
+    for inst_idx, (filepath, meta) in enumerate(instances):
+        # Calcola replica dal seed (5 repliche per configurazione, seed parte da 2024)
+        replica = (meta['seed'] - 2024) % 5
+        
+        # Soluzione nota dal registro (per warm start e Optimality Gap senza rieseguire B&B)
+        inst_hash = None
+        if registry or with_hash or selector is not None:
+            inst_hash = _load_instance(filepath, storage=storage).content_hash()
+        bks = registry.get(inst_hash) if registry else None
+        warm_solution = (bks['makespan'], bks['assignment']) if bks and bks['assignment'] else None
+        opt_known = bks['makespan'] if bks and bks['proven_optimal'] else None
+        
+        base = {"experiment": experiment_name, "filepath": filepath, "meta": meta, "replica": replica, "instance_index": inst_idx,
+                "wall_clock": use_wall_clock, "memory": measure_memory, "known_optimum": opt_known,
+                "storage": storage, "instance_hash": inst_hash}
+        
+        # A. BRUTE FORCE (Solo se richiesto nel JSON)
+        # true = ricorsivo; {"vectorized": true, "workers": 2} = enumeratore a blocchi NumPy
+        # (brute_force_vec: stesso makespan e stesso conteggio dei nodi)
+        bf_opts = algo_conf.get('brute_force', False)
+        if bf_opts:
+            bf_opts = bf_opts if isinstance(bf_opts, dict) else {}
+            vectorized = bf_opts.get('vectorized', False)
+            tasks.append(dict(base, algo="BF", params="Exact,vec" if vectorized else "Exact",
+                              opts={"vectorized": vectorized, "workers": bf_opts.get('workers', 1)},
+                              seed=meta['seed'], warm_solution=None))
+        
+        # B. BRANCH & BOUND 
+        # ATTENZIONE: Nel Pilot A dobbiamo scoprire dove sta il "muro" → eseguiamo sempre!
+        # Negli altri esperimenti (workhorse) sappiamo già che N>20 va in timeout → skip.
+        if 'branch_and_bound' in algo_conf:
+            bb_opts = algo_conf['branch_and_bound']
             
-            # Seleziona timer appropriato per micro/macro-benchmarking
-            use_wall_clock = config.get('measure_wall_clock', False)
-            timer_func = time.perf_counter if use_wall_clock else time.process_time
-            timer_name = "Wall" if use_wall_clock else "CPU"
+            # Check se siamo nel Pilot A (deve scoprire il muro) o in altri esperimenti
+            is_pilot_wall = 'pilot_a' in experiment_name.lower() or 'wall' in experiment_name.lower()
             
-            # Carica Istanza
-            inst = Instance(filepath)
-            lb = inst.get_theoretical_lower_bound()
+            t_lim = bb_opts.get('time_limit', 60)
+            selection = None
+            if selector is not None:
+                inst = _load_instance(filepath, storage=storage)
+                selection = {"features": instance_features(inst)}
+                selection['decision'] = selector.choose(selection['features'], t_lim)
             
-            # --- SEZIONE ALGORITMI (Dinamica) ---
-            algo_conf = config.get('algorithms', {})
+            if selection is not None and selection['decision']['solver'] != "BnB":
+                print(f"  -> BnB skipped (tempo previsto {selection['decision']['predicted_time']:.3g}s > {t_lim}s) "
+                      f"{os.path.basename(filepath)}")
+                if selection_log:
+                    selection_log.append(experiment_name, meta, inst_hash, selection['features'],
+                                         selection['decision'])
+            elif selection is None and meta['n'] > 20 and not is_pilot_wall:
+                print(f"  -> BnB skipped (N={meta['n']} > 20, heuristic domain) {os.path.basename(filepath)}")
+            elif bb_opts.get('skip_if_proven', False) and opt_known is not None:
+                print(f"  -> BnB skipped (ottimo {opt_known} già certificato nel registro BKS) {os.path.basename(filepath)}")
+            else:
+                if selection is not None:
+                    t_lim = selection['decision']['time_limit']
+                use_warm = bb_opts.get('warm_start', False) and warm_solution is not None
+                tasks.append(dict(base, algo="BnB", params=f"TL={t_lim}s" + (",WS" if use_warm else ""),
+                                  opts={"time_limit": t_lim}, seed=meta['seed'],
+                                  warm_solution=warm_solution if use_warm else None, selection=selection))
+        
+        # C. DP ESATTO per M=2 (pseudo-polinomiale: ottimo anche per N molto oltre il muro del B&B)
+        if algo_conf.get('two_machine_dp', False):
+            if meta['m'] != 2:
+                print(f"  -> DP skipped (M={meta['m']} != 2) {os.path.basename(filepath)}")
+            else:
+                tasks.append(dict(base, algo="DP", params="Exact", opts={}, seed=meta['seed'], warm_solution=None))
+        
+        # D. ITERATED GREEDY (Supporta Tuning e liste di configurazioni)
+        if 'iterated_greedy' in algo_conf:
+            ig_opts = algo_conf['iterated_greedy']
+            # Se nel JSON è un oggetto singolo, lo trasformiamo in una lista di 1 elemento
+            configs_to_run = [ig_opts] if isinstance(ig_opts, dict) else ig_opts
             
-            # A. BRUTE FORCE (Solo se richiesto nel JSON)
-            if algo_conf.get('brute_force', False):
-                bf = PureBruteForce(inst)
-                start = timer_func()
-                obj, nodes = bf.solve()
-                elapsed = timer_func() - start
+            for cfg in configs_to_run:
+                t_lim = cfg.get('time_limit', 1.0)
+                d = cfg.get('d', 4)
+                T = cfg.get('T_lambda', 0.5)
+                use_warm = cfg.get('warm_start', False) and warm_solution is not None
                 
-                writer.writerow({
-                    "Experiment": config['experiment_name'],
-                    "Dist": meta['dist'], "N": meta['n'], "M": meta['m'], "Replica": replica, "Seed": meta['seed'],
-                    "Algo": "BF", "Params": "Exact",
-                    "Time": elapsed, "Obj": obj, "Status": "OPTIMAL", "Gap": 0.0, "Nodes": nodes
-                })
-
-            # B. BRANCH & BOUND 
-            # ATTENZIONE: Nel Pilot A dobbiamo scoprire dove sta il "muro" → eseguiamo sempre!
-            # Negli altri esperimenti (workhorse) sappiamo già che N>20 va in timeout → skip.
-            bnb_best_obj = None  # Usato dall'IG per calcolare l'Optimality Gap (N<=20)
-            if 'branch_and_bound' in algo_conf:
-                bb_opts = algo_conf['branch_and_bound']
+                # --- DECORRELAZIONE SEED (Cruciale) ---
+                # Usiamo il seed dell'istanza + costante fissa per l'algoritmo
+                algo_seed = meta['seed'] + 12345
                 
-                # Check se siamo nel Pilot A (deve scoprire il muro) o in altri esperimenti
-                experiment_name = config.get('experiment_name', '')
-                is_pilot_wall = 'pilot_a' in experiment_name.lower() or 'wall' in experiment_name.lower()
-                
-                if meta['n'] > 20 and not is_pilot_wall:
-                    print(f"  -> BnB skipped (N={meta['n']} > 20, heuristic domain)")
-                else:
-                    
-                    t_lim = bb_opts.get('time_limit', 60)
-                    bnb = BranchAndBound(inst, time_limit=t_lim)
-
-                    start = timer_func()
-                    obj, nodes, status = bnb.solve()
-                    elapsed = timer_func() - start
-
-                    # BnB gap è sempre vs Lower Bound (misura qualità del lower bound)
-                    gap = (obj - lb)/lb * 100 if lb > 0 else 0
-                    writer.writerow({
-                        "Experiment": config['experiment_name'],
-                        "Dist": meta['dist'], "N": meta['n'], "M": meta['m'], "Replica": replica, "Seed": meta['seed'],
-                        "Algo": "BnB", "Params": f"TL={t_lim}s",
-                        "Time": elapsed, "Obj": obj, "Status": status, "Gap": gap, "Nodes": nodes
-                    })
-                    # Salva il risultato ottimo (solo se trovato) come riferimento per l'IG
-                    if status == "OPTIMAL":
-                        bnb_best_obj = obj
-
-            # C. ITERATED GREEDY (Supporta Tuning e liste di configurazioni)
-            if 'iterated_greedy' in algo_conf:
-                ig_opts = algo_conf['iterated_greedy']
-                # Se nel JSON è un oggetto singolo, lo trasformiamo in una lista di 1 elemento
-                configs_to_run = [ig_opts] if isinstance(ig_opts, dict) else ig_opts
-                
-                for cfg in configs_to_run:
-                    t_lim = cfg.get('time_limit', 1.0)
-                    d = cfg.get('d', 4)
-                    T = cfg.get('T_lambda', 0.5)
-                    
-                    # --- DECORRELAZIONE SEED (Cruciale) ---
-                    # Usiamo il seed dell'istanza + costante fissa per l'algoritmo
-                    algo_seed = meta['seed'] + 12345
-                    
-                    ig = IteratedGreedy(inst, time_limit=t_lim, d=d, T_lambda=T)
-                    
-                    start = timer_func()
-                    # Passiamo il seed derivato
-                    obj, iterations, _ = ig.solve(seed=algo_seed) 
-                    elapsed = timer_func() - start
-                    
-                    # Gap a due regimi:
-                    # N<=20 + BnB ottimo disponibile -> Optimality Gap (IG vs soluzione ottima)
-                    # N>20 (o BnB in timeout) -> RPD vs Lower Bound teorico
-                    if meta['n'] <= 20 and bnb_best_obj is not None:
-                        gap = (obj - bnb_best_obj) / bnb_best_obj * 100 if bnb_best_obj > 0 else 0
-                        gap_label = "OPT_GAP"
-                    else:
-                        gap = (obj - lb) / lb * 100 if lb > 0 else 0
-                        gap_label = "RPD"
-
-                    writer.writerow({
-                        "Experiment": config['experiment_name'],
-                        "Dist": meta['dist'], "N": meta['n'], "M": meta['m'], "Replica": replica, "Seed": meta['seed'],
-                        "Algo": "IG", "Params": f"d={d},T={T},t={t_lim}s",
-                        "Time": elapsed, "Obj": obj, "Status": f"HEURISTIC_{gap_label}", "Gap": gap, "Nodes": iterations
-                    })
-            
-            # Scrittura su disco immediata (sicurezza contro crash)
-            csvfile.flush()
+                tasks.append(dict(base, algo="IG", params=f"d={d},T={T},t={t_lim}s" + (",WS" if use_warm else ""),
+                                  opts={"time_limit": t_lim, "d": d, "T_lambda": T}, seed=algo_seed,
+                                  warm_solution=warm_solution if use_warm else None))
+        
+        # E. PORTFOLIO: B&B + IG (seed diversi) in parallelo con incumbent condiviso (nessuno skip per N>20:
+        # il B&B pota con la best dell'IG e certifica l'ottimo quando ci riesce)
+        if 'portfolio' in algo_conf:
+            pf_opts = algo_conf['portfolio']
+            t_lim = pf_opts.get('time_limit', 10)
+            seeds = pf_opts.get('ig_seeds', 3)
+            tasks.append(dict(base, algo="PF", params=f"t={t_lim}s,seeds={seeds}",
+                              opts={"time_limit": t_lim, "ig_seeds": seeds, "d": pf_opts.get('d', 4),
+                                    "T_lambda": pf_opts.get('T_lambda', 0.5), "workers": pf_opts.get('workers')},
+                              seed=meta['seed'] + 12345, warm_solution=None))
+    
+    for idx, task in enumerate(tasks):
+        task['index'] = idx
+    return tasks
+
+def _selection_log(config):
+    """Log delle decisioni del selettore ("log" nel blocco selector), se configurato."""
+    sel_conf = (config.get('algorithms', {}).get('branch_and_bound') or {}).get('selector') or {}
+    if not sel_conf.get('log'):
+        return None
+    from selector import SelectionLog
+    return SelectionLog(sel_conf['log'])
+
+def _log_selection(selection_log, config, task, result):
+    """Esito realizzato di un B&B deciso dal selettore (predizione + tempo e status reali)."""
+    if selection_log and task.get('selection'):
+        selection_log.append(config['experiment_name'], task['meta'], result['instance_hash'],
+                             task['selection']['features'], task['selection']['decision'],
+                             result['time'], result['status'])
+
+# Cache (per processo) dell'ultima istanza caricata: i task della stessa istanza sono consecutivi
+_INSTANCE_CACHE = {}
+
+# Con "shared_instances": istanze pubblicate contemporaneamente, per worker (limita la RAM in /dev/shm)
+SHARED_INSTANCES_PER_WORKER = 2
+
+def _load_instance(filepath, task_index=None, storage="list", shared=None):
+    inst = _INSTANCE_CACHE.get(filepath)
+    if inst is None:
+        _INSTANCE_CACHE.clear()
+        with tracing.span("instance_parse", file=os.path.basename(filepath), task=task_index):
+            if shared is not None:
+                inst = attach(shared)  # segmento pubblicato dal padre: niente parsing né copia
+            elif is_archive_path(filepath):
+                inst = load_archived_instance(filepath)  # fetta dell'mmap: niente parsing
+            else:
+                inst = Instance(filepath, storage=storage)
+        _INSTANCE_CACHE[filepath] = inst
+    return inst
+
+def run_task(task):
+    """
+    Esegue un singolo task (anche in un processo worker).
+    Il tempo è misurato DENTRO il processo che esegue il solver: process_time resta per-task.
+    """
+    timer_func = time.perf_counter if task['wall_clock'] else time.process_time
+    
+    # Carica Istanza
+    inst = _load_instance(task['filepath'], task['index'], task.get('storage', 'list'), task.get('shared'))
+    with tracing.span("lower_bound", task=task['index']):
+        lb = inst.get_theoretical_lower_bound()
+    
+    # Memoria di picco (opzionale): tracemalloc + RSS attorno al solo solve
+    probe = MemoryProbe() if task.get('memory') else None
+    with tracing.span("solve", task=task['index'], algo=task['algo']), tracing.profiled(task):
+        if probe:
+            probe.start()
+        try:
+            obj, nodes, status, elapsed, assignment, extra = _solve(task, inst, timer_func)
+        finally:
+            # Anche se il solver solleva: tracemalloc acceso rallenterebbe i task successivi del worker
+            if probe:
+                peak_py_mb, rss_delta_mb = probe.stop()
+    
+    result = {"index": task['index'], "time": elapsed, "obj": obj, "nodes": nodes, "status": status,
+              "lb": lb, "assignment": assignment, "instance_hash": inst.content_hash(), **extra}
+    if probe:
+        result.update(peak_py_mb=peak_py_mb, rss_delta_mb=rss_delta_mb)
+    return result
 
-    print(f"\n✅ Completato. Processate {count} istanze. Ignorate {skipped} (non matchavano il config).")
+def _solve(task, inst, timer_func):
+    """Esegue il solver del task e misura il tempo con timer_func. extra: campi aggiuntivi del risultato."""
+    opts = task['opts']
+    extra = {}
+    if task['algo'] == "BF" and opts.get('vectorized'):
+        from brute_force_vec import VectorizedBruteForce  # NumPy solo se richiesto
+        solver = VectorizedBruteForce(inst, workers=opts.get('workers', 1))
+        start = timer_func()
+        obj, nodes = solver.solve()
+        elapsed = timer_func() - start
+        status, assignment = "OPTIMAL", solver.best_assignment
+    elif task['algo'] == "BF":
+        solver = PureBruteForce(inst)
+        start = timer_func()
+        obj, nodes = solver.solve()
+        elapsed = timer_func() - start
+        status, assignment = "OPTIMAL", None
+    elif task['algo'] == "DP":
+        solver = TwoMachineDP(inst)
+        start = timer_func()
+        # nodes = stati DP raggiungibili generati
+        obj, nodes, status = solver.solve()
+        elapsed = timer_func() - start
+        assignment = solver.best_assignment
+    elif task['algo'] == "BnB":
+        solver = BranchAndBound(inst, time_limit=opts['time_limit'], initial_solution=task['warm_solution'])
+        start = timer_func()
+        obj, nodes, status = solver.solve()
+        elapsed = timer_func() - start
+        assignment = solver.best_assignment
+    elif task['algo'] == "IG":
+        solver = IteratedGreedy(inst, time_limit=opts['time_limit'], d=opts['d'], T_lambda=opts['T_lambda'],
+                                initial_solution=task['warm_solution'])
+        start = timer_func()
+        # Passiamo il seed derivato
+        obj, nodes, status = solver.solve(seed=task['seed'])
+        elapsed = timer_func() - start
+        assignment = solver.best_assignment
+    elif task['algo'] == "PF":
+        from portfolio import Portfolio  # multiprocessing solo se richiesto
+        solver = Portfolio(inst, time_limit=opts['time_limit'],
+                           ig_seeds=[task['seed'] + i for i in range(opts['ig_seeds'])],
+                           d=opts['d'], T_lambda=opts['T_lambda'], workers=opts['workers'])
+        obj, nodes, status = solver.solve()
+        # I componenti girano in altri processi (process_time qui è ~0): Time = CPU sommata di coordinatore e
+        # componenti, come per le altre righe; il tempo wall fino alla risposta va nella colonna WallTime
+        elapsed = solver.wall_time if task['wall_clock'] else solver.cpu_time
+        assignment = solver.best_assignment
+        extra = {"winner": solver.winner, "wall_time": solver.wall_time}
+    else:
+        raise ValueError(f"Algoritmo sconosciuto: {task['algo']}")
+    return obj, nodes, status, elapsed, assignment, extra
+
+def make_row(config, task, result, bnb_best_obj=None, dp_best_obj=None):
+    """
+    Costruisce la riga CSV di un task completato.
+    bnb_best_obj: ottimo B&B della stessa istanza (se disponibile) per l'Optimality Gap dell'IG.
+    dp_best_obj: ottimo DP (M=2) della stessa istanza, valido come riferimento per ogni N.
+    """
+    meta, lb, obj = task['meta'], result['lb'], result['obj']
+    status = result['status']
+    
+    if task['algo'] == "BF":
+        gap = 0.0
+    elif task['algo'] in ("BnB", "DP") or (task['algo'] == "PF" and status == "OPTIMAL"):
+        # Gap degli esatti (e del portfolio certificato) sempre vs Lower Bound (misura qualità del lower bound)
+        gap = (obj - lb)/lb * 100 if lb > 0 else 0
+    else:
+        # Gap a due regimi:
+        # N<=20 + BnB ottimo disponibile -> Optimality Gap (IG vs soluzione ottima)
+        # N>20 (o BnB in timeout) -> RPD vs Lower Bound teorico
+        # (l'ottimo può arrivare anche dal registro BKS, senza rieseguire il B&B)
+        opt_ref = bnb_best_obj if meta['n'] <= 20 else None
+        if opt_ref is None:
+            opt_ref = dp_best_obj
+        if opt_ref is None:
+            opt_ref = task['known_optimum']
+        if opt_ref is not None:
+            gap = (obj - opt_ref) / opt_ref * 100 if opt_ref > 0 else 0
+            gap_label = "OPT_GAP"
+        else:
+            gap = (obj - lb) / lb * 100 if lb > 0 else 0
+            gap_label = "RPD"
+        status = f"HEURISTIC_{gap_label}"
+    
+    row = {
+        "Experiment": config['experiment_name'],
+        "Dist": meta['dist'], "N": meta['n'], "M": meta['m'], "Replica": task['replica'], "Seed": meta['seed'],
+        "Algo": task['algo'], "Params": task['params'],
+        "Time": result['time'], "Obj": obj, "Status": status, "Gap": gap, "Nodes": result['nodes']
+    }
+    if task.get('memory'):
+        # Righe dalla cache di run senza misura: colonne vuote
+        row["PeakPyMB"] = result.get('peak_py_mb', "")
+        row["RSSDeltaMB"] = result.get('rss_delta_mb', "")
+    if task['algo'] == "PF":
+        row["Winner"] = result.get('winner', "")
+        row["WallTime"] = result.get('wall_time', "")
+    return row
+
+def _task_hash(task):
+    """Hash dell'istanza del task: da build_tasks, altrimenti (es. task accodati senza) calcolato qui."""
+    if task.get('instance_hash') is None:
+        task['instance_hash'] = _load_instance(task['filepath'], storage=task.get('storage', 'list')).content_hash()
+    return task['instance_hash']
+
+def _update_registry(registry, config, task, result):
+    """Propaga il risultato di un task al registro BKS (solo se migliora il valore salvato)."""
+    proven = task['algo'] in ("BF", "DP") or result['status'] == "OPTIMAL"
+    name = os.path.basename(task['filepath'].split(ARCHIVE_SEP)[-1])
+    registry.update_record(_task_hash(task), name, task['meta']['n'], task['meta']['m'], result['obj'],
+                           result['assignment'], proven, f"{task['algo']} {task['params']}",
+                           config['experiment_name'])
+
+def _cache_key(task):
+    """
+    Chiave cache di un task deterministico (il makespan del warm start cambia i nodi esplorati).
+    Il time limit non entra nella chiave: in cache finiscono solo run OPTIMAL, che non ne dipendono.
+    """
+    params = ",".join(p for p in task['params'].split(',') if not p.startswith("TL="))
+    if task['warm_solution'] is not None:
+        params += f"@{task['warm_solution'][0]}"
+    timer = "wall" if task['wall_clock'] else "cpu"
+    return ResultCache.make_key(_task_hash(task), task['algo'], params, task['seed'], timer)
+
+def _iter_results(tasks, workers, shared=False):
+    """
+    Genera i risultati dei task man mano che terminano.
+    workers <= 1: esecuzione sequenziale in-process (ordine canonico).
+    workers > 1: fan-out su ProcessPoolExecutor (ordine di completamento arbitrario).
+    shared: le istanze sono pubblicate in memoria condivisa e i task portano solo il descrittore.
+    La sottomissione avanza a finestra: al più SHARED_INSTANCES_PER_WORKER * workers istanze vive,
+    un segmento è rimosso quando non ha più task in corso (e ripubblicato se ne arrivano altri).
+    """
+    if workers <= 1:
+        last_instance = None
+        for task in tasks:
+            if task['instance_index'] != last_instance:
+                last_instance = task['instance_index']
+                meta = task['meta']
+                print(f"[{last_instance + 1}] Processing {meta['n']}x{meta['m']} {meta['dist']} (Seed {meta['seed']})...")
+            yield task, run_task(task)
+        return
+    
+    # Import lazy: i run sequenziali non pagano concurrent.futures.process
+    from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+    
+    store = SharedInstanceStore() if shared else None
+    limit = SHARED_INSTANCES_PER_WORKER * workers
+    inflight, descriptors = {}, {}  # filepath -> task in corso / descrittore (solo con shared)
+    try:
+        # I worker ereditano la configurazione di trace/profiling del processo padre
+        with ProcessPoolExecutor(max_workers=workers, initializer=tracing.configure,
+                                 initargs=tracing.settings()) as pool:
+            futures = {}
+            next_task = 0
+            while True:
+                # Senza shared si sottomette tutto subito; con shared ci si ferma alla prima istanza fuori finestra
+                while next_task < len(tasks):
+                    task = submitted = tasks[next_task]
+                    if store is not None:
+                        path = task['filepath']
+                        if path not in inflight:  # con scheduling LPT i task di un'istanza non sono contigui
+                            if len(inflight) >= limit:
+                                break
+                            inflight[path] = 0
+                            descriptors[path] = store.publish(_load_instance(path, storage=task.get('storage', 'list')),
+                                                              key=path)
+                        inflight[path] += 1
+                        submitted = dict(task, shared=descriptors[path])
+                    futures[pool.submit(run_task, submitted)] = task
+                    next_task += 1
+                if not futures:
+                    break
+                finished, _ = wait(futures, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    task = futures.pop(future)
+                    if store is not None:
+                        path = task['filepath']
+                        inflight[path] -= 1
+                        if not inflight[path]:
+                            del inflight[path], descriptors[path]
+                            store.release(path)
+                    yield task, future.result()
+    finally:
+        if store is not None:
+            store.close()
+
+def task_key(config, task):
+    """
+    Chiave stabile di un task: (Experiment, Dist, N, M, Seed, Algo, Params).
+    Params è derivato dai parametri del JSON, quindi cambiare un parametro
+    invalida solo le righe dei task interessati.
+    """
+    meta = task['meta']
+    return (config['experiment_name'], meta['dist'], str(meta['n']), str(meta['m']),
+            str(meta['seed']), task['algo'], task['params'])
+
+def row_key(row):
+    """Chiave di una riga CSV già scritta (stessa forma di task_key)."""
+    return (row['Experiment'], row['Dist'], row['N'], row['M'], row['Seed'], row['Algo'], row['Params'])
+
+def _format_rows(rows, fieldnames, header=False):
+    buf = io.StringIO()
+    writer = csv.DictWriter(buf, fieldnames=fieldnames, lineterminator="\n")  # come i CSV di results/reference
+    if header:
+        writer.writeheader()
+    writer.writerows(rows)
+    return buf.getvalue()
+
+def _append_rows(output_file, rows, fieldnames):
+    """
+    Append ATOMICO: le righe sono serializzate in memoria e scritte con una sola write()
+    su un descrittore O_APPEND, poi fsync. Un crash può lasciare al più una riga troncata
+    in coda, che viene rimossa da _load_existing_rows alla ripresa successiva.
+    """
+    with tracing.span("csv_append", rows=len(rows)):
+        data = _format_rows(rows, fieldnames).encode()
+        fd = os.open(output_file, os.O_WRONLY | os.O_APPEND | os.O_CREAT)
+        try:
+            os.write(fd, data)
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+def _load_existing_rows(output_file, fieldnames):
+    """
+    Legge le righe già completate di un run precedente (per --resume).
+    Tronca un'eventuale riga finale incompleta lasciata da un crash.
+    Ritorna {row_key: row}, oppure None se il file non esiste o è vuoto.
+    """
+    if not os.path.exists(output_file):
+        return None
+    with open(output_file, 'rb+') as f:
+        data = f.read()
+        if data and not data.endswith(b"\n"):
+            f.truncate(data.rfind(b"\n") + 1)
+            print("🩹 Rimossa riga incompleta in coda al CSV (crash precedente)")
+    
+    with open(output_file, 'r', newline='') as f:
+        reader = csv.DictReader(f)
+        if reader.fieldnames is None:
+            return None
+        if reader.fieldnames != fieldnames:
+            raise ValueError(f"Header di {output_file} incompatibile con il run corrente: {reader.fieldnames}")
+        return {row_key(row): row for row in reader}
+
+def _rewrite_canonical(output_file, rows, fieldnames):
+    """Riscrive il CSV in ordine canonico (file temporaneo + os.replace = atomico)."""
+    tmp_file = output_file + ".tmp"
+    with tracing.span("csv_rewrite", rows=len(rows)):
+        with open(tmp_file, 'w', newline='') as f:
+            f.write(_format_rows(rows, fieldnames, header=True))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_file, output_file)
+
+def run_experiment(config_path, registry_path=None, workers=1, resume=False, cache_path=None, results_db=None,
+                   measure_memory=False):
+    # Trace/profiling (--trace, --profile) sono configurati dal chiamante con tracing.configure()
+    # 1. Carica Configurazione
+    with tracing.span("config_load"), open(config_path, 'r') as f:
+        config = json.load(f)
+    
+    print(f"🚀 Avvio Esperimento: {config['experiment_name']}")
+    print(f"📄 Configurazione: {config_path}")
+    
+    # Registro Best Known Solutions (opzionale): CLI > JSON
+    registry_path = registry_path or config.get('bks_registry')
+    registry = BestKnownRegistry(registry_path) if registry_path else None
+    if registry:
+        print(f"📚 Registro BKS: {registry_path}")
+    
+    # 2. Setup Output CSV
+    output_file = config['output_file']
+    os.makedirs(os.path.dirname(output_file), exist_ok=True)
+    fieldnames = FIELDNAMES
+    
+    # Cache dei run deterministici (opzionale): CLI > JSON ("result_cache": path o {path, max_entries})
+    cache_conf = config.get('result_cache') or {}
+    if isinstance(cache_conf, str):
+        cache_conf = {"path": cache_conf}
+    cache_path = cache_path or cache_conf.get('path')
+    cache = ResultCache(cache_path, cache_conf.get('max_entries', 50000)) if cache_path else None
+    if cache:
+        print(f"🗄️  Cache risultati: {cache_path}")
+        # Colonna extra: la riga è stata calcolata ora ("computed") o servita dalla cache ("cache")?
+        fieldnames = FIELDNAMES + ["Source"]
+    
+    # Memoria di picco per (istanza, algoritmo): CLI o "measure_memory": true nel JSON
+    if measure_memory:
+        config['measure_memory'] = True
+    if config.get('measure_memory', False):
+        print("🧠 Misura memoria attiva (tracemalloc: i tempi non sono confrontabili con run normali)")
+        fieldnames = fieldnames + MEMORY_FIELDS
+    if 'portfolio' in config.get('algorithms', {}):
+        fieldnames = fieldnames + PORTFOLIO_FIELDS
+    
+    selection_log = _selection_log(config)
+    
+    # 3. Istanze richieste dal JSON e relativi task
+    with tracing.span("collect_instances"):
+        instances = collect_instances(config)
+    if instances is None:
+        return
+    with tracing.span("build_tasks"):
+        tasks = build_tasks(config, instances, registry, with_hash=cache is not None)
+    
+    # RESUME: i task con una riga già presente nel CSV non vengono rieseguiti
+    with tracing.span("resume_load"):
+        existing = _load_existing_rows(output_file, fieldnames) if resume else None
+    done_rows = {}  # index -> riga già su disco
+    if existing is not None:
+        for t in tasks:
+            row = existing.get(task_key(config, t))
+            if row is not None:
+                done_rows[t['index']] = row
+        stale = len(existing) - len(done_rows)
+        print(f"♻️  Resume: {len(done_rows)}/{len(tasks)} task già completati"
+              + (f", {stale} righe obsolete verranno scartate" if stale else ""))
+    else:
+        # SOVRASCRITTURA COMPLETA DEL FILE (nuovo run): solo l'header
+        with open(output_file, 'w', newline='') as csvfile:
+            csvfile.write(_format_rows([], fieldnames, header=True))
+    
+    todo = [t for t in tasks if t['index'] not in done_rows]
+    
+    # Consultazione cache PRIMA dell'esecuzione: i task serviti dalla cache non vanno al pool
+    pending = {}
+    if cache:
+        with tracing.span("cache_lookup"):
+            for t in todo:
+                if t['algo'] not in DETERMINISTIC_ALGOS:
+                    continue
+                hit = cache.get(_cache_key(t))
+                # Un ottimo trovato oltre il time limit di questo run qui sarebbe un TIMEOUT: si ricalcola
+                if hit is not None and hit['time'] <= t['opts'].get('time_limit', float('inf')):
+                    pending[t['index']] = dict(hit, index=t['index'], source="cache")
+        todo = [t for t in todo if t['index'] not in pending]
+        if pending:
+            print(f"🗄️  {len(pending)} task serviti dalla cache (tempo originale conservato)")
+    
+    # Stima dei costi e ordine di dispatch: LPT (longest expected first) in parallelo,
+    # ordine canonico in sequenziale (le righe escono già ordinate, niente riscrittura finale)
+    history = load_timing_history(config.get('timing_history'))
+    costs = {t['index']: estimate_task_cost(t, history) for t in todo}
+    if workers > 1 and config.get('scheduling', "lpt") == "lpt":
+        todo = order_longest_first(todo, costs)
+    predicted = predict_makespan(todo, costs, workers)
+    
+    if workers > 1:
+        print(f"⚙️  Esecuzione parallela: {len(todo)} task su {workers} processi")
+    
+    # 4. Esecuzione + scrittura
+    # Ogni riga è scritta appena pronta; l'unica dipendenza (Gap IG/PF vs ottimo BnB/DP della stessa
+    # istanza) trattiene IG e PF finché gli esatti della loro istanza non sono conclusi.
+    # Se le righe escono fuori ordine, a fine run il CSV è riscritto in ORDINE CANONICO.
+    exact_left = {}    # instance_index -> task esatti (BnB/DP) non ancora conclusi
+    for t in tasks:
+        if t['algo'] in ("BnB", "DP"):
+            exact_left[t['instance_index']] = exact_left.get(t['instance_index'], 0) + 1
+    bnb_best = {}      # instance_index -> ottimo BnB (solo se OPTIMAL)
+    dp_best = {}       # instance_index -> ottimo DP
+    waiting = {}       # instance_index -> [(task, result)] IG/PF in attesa degli esatti
+    new_rows = {}
+    last_written = [-1, True]  # [ultimo indice scritto, scritto finora in ordine canonico?]
+    
+    for idx, row in done_rows.items():
+        t = tasks[idx]
+        if t['algo'] in ("BnB", "DP"):
+            exact_left[t['instance_index']] -= 1
+            if row['Status'] == "OPTIMAL":
+                best = bnb_best if t['algo'] == "BnB" else dp_best
+                best[t['instance_index']] = int(float(row['Obj']))
+    
+    def emit(t, res):
+        row = make_row(config, t, res, bnb_best.get(t['instance_index']), dp_best.get(t['instance_index']))
+        if cache:
+            row['Source'] = res.get('source', "computed")
+            if row['Source'] == "computed" and is_cacheable(t['algo'], res['status']):
+                cache.put(_cache_key(t), t['algo'], t['params'],
+                          {k: v for k, v in res.items() if k != 'index'})
+        new_rows[t['index']] = row
+        if res.get('source', "computed") == "computed":
+            _log_selection(selection_log, config, t, res)
+        if registry:
+            _update_registry(registry, config, t, res)
+        if t['index'] < last_written[0]:
+            last_written[1] = False
+        last_written[0] = max(last_written[0], t['index'])
+        return row
+    
+    def on_result(t, res):
+        inst_idx = t['instance_index']
+        batch = []
+        if t['algo'] in ("IG", "PF") and exact_left.get(inst_idx, 0) > 0:
+            waiting.setdefault(inst_idx, []).append((t, res))
+        else:
+            exact = t['algo'] in ("BnB", "DP")
+            if exact:
+                exact_left[inst_idx] -= 1
+                if res['status'] == "OPTIMAL":
+                    # Salva il risultato ottimo come riferimento per l'IG
+                    best = bnb_best if t['algo'] == "BnB" else dp_best
+                    best[inst_idx] = res['obj']
+            batch.append(emit(t, res))
+            # L'ultimo esatto sblocca IG e PF della sua istanza (in ordine canonico)
+            release = exact and exact_left[inst_idx] == 0
+            for wt, wres in sorted(waiting.pop(inst_idx, []) if release else [],
+                                   key=lambda x: x[0]['index']):
+                batch.append(emit(wt, wres))
+        # Scrittura su disco immediata (sicurezza contro crash)
+        if batch:
+            _append_rows(output_file, batch, fieldnames)
+    
+    for idx in sorted(pending):
+        on_result(tasks[idx], pending[idx])
+    
+    exec_start = time.perf_counter()
+    with tracing.span("execute", tasks=len(todo), workers=workers):
+        for task, result in _iter_results(todo, workers, shared=config.get('shared_instances', False)):
+            on_result(task, result)
+    actual = time.perf_counter() - exec_start
+    
+    # Resume o esecuzione fuori ordine: ripristina l'ordine canonico del CSV
+    final_rows = [done_rows.get(i) or new_rows[i] for i in range(len(tasks))]
+    if existing is not None or not last_written[1]:
+        _rewrite_canonical(output_file, final_rows, fieldnames)
+    
+    # Backend SQLite opzionale (CLI > JSON): le righe dell'esperimento vengono sostituite in blocco
+    results_db = results_db or config.get('results_db')
+    if results_db:
+        with tracing.span("results_db", rows=len(final_rows)):
+            store = ResultsStore(results_db)
+            store.insert_rows(final_rows, replace_experiment=config['experiment_name'])
+            store.close()
+        print(f"🗃️  Risultati anche in: {results_db}")
+
+    if registry:
+        registry.close()
+    if cache:
+        print(f"🗄️  Cache: {cache.hits} hit, {cache.misses} miss")
+        cache.close()
+
+    print(f"\n✅ Completato. Processate {len(instances)} istanze ({len(todo)} task eseguiti su {len(tasks)}).")
+    print(f"📐 Makespan campagna: previsto {predicted:.1f}s, reale {actual:.1f}s ({workers} worker)")
     print(f"📊 Risultati salvati in: {output_file}")
+    _report_instrumentation(todo)
+    return {"tasks": len(tasks), "executed": len(todo), "workers": workers,
+            "predicted_makespan": predicted, "actual_makespan": actual}
+
+def _report_instrumentation(executed):
+    """Riepilogo del trace (run corrente) e delle funzioni più costose dei task profilati."""
+    if tracing.enabled():
+        tracing.print_trace_summary(tracing.settings()[0], tracing.run_id())
+    profiled = [tracing.profile_path(t) for t in executed if tracing.should_profile(t)]
+    if profiled:
+        summary_path = os.path.join(tracing.settings()[1], "summary.txt")
+        report = tracing.summarize_profiles(profiled, summary_path, top=15)
+        if report:
+            print(f"🔬 Profili cProfile: {len(profiled)} file .pstats, riepilogo in {summary_path}")
+            print(report)
+
+def enqueue_experiment(config_path, queue_path, registry_path=None):
+    """Modalità coda, passo 1: accoda tutti i task del JSON (priorità = durata prevista)."""
+    with open(config_path, 'r') as f:
+        config = json.load(f)
+    registry_path = registry_path or config.get('bks_registry')
+    registry = BestKnownRegistry(registry_path) if registry_path else None
+    
+    instances = collect_instances(config)
+    if instances is None:
+        return
+    tasks = build_tasks(config, instances, registry)
+    for t in tasks:
+        t['key'] = list(task_key(config, t))
+    history = load_timing_history(config.get('timing_history'))
+    priorities = {t['index']: estimate_task_cost(t, history) for t in tasks}
+    enqueue_config(config, tasks, queue_path, priorities)
+    if registry:
+        registry.close()
+
+def merge_queue_results(config_path, queue_path, registry_path=None, results_db=None):
+    """
+    Modalità coda, passo 3: ricompone il CSV in ordine canonico dai risultati in coda.
+    I task sono riletti dalla coda (non ricostruiti dal JSON): indici e parametri restano quelli accodati.
+    """
+    with open(config_path, 'r') as f:
+        config = json.load(f)
+    queue = WorkQueue(queue_path)
+    entries = queue.entries(config['experiment_name'])
+    counts = queue.counts(config['experiment_name'])
+    queue.close()
+    
+    indices = [t['index'] for t, _, _ in entries]
+    if len(set(indices)) != len(indices):
+        print(f"❌ Merge impossibile: indici di task duplicati in coda per '{config['experiment_name']}' "
+              f"(riaccodare il config con --enqueue)")
+        return False
+    
+    missing = [t for t, res, _ in entries if res is None]
+    if not entries or missing:
+        print(f"❌ Merge impossibile: {len(missing)}/{len(entries)} task non completati. Stato coda: {counts}")
+        return False
+    
+    registry_path = registry_path or config.get('bks_registry')
+    registry = BestKnownRegistry(registry_path) if registry_path else None
+    selection_log = _selection_log(config)
+    bnb_best, dp_best = {}, {}
+    rows = []
+    for t, res, _ in entries:
+        if t['algo'] in ("BnB", "DP") and res['status'] == "OPTIMAL":
+            best = bnb_best if t['algo'] == "BnB" else dp_best
+            best[t['instance_index']] = res['obj']
+        rows.append(make_row(config, t, res, bnb_best.get(t['instance_index']), dp_best.get(t['instance_index'])))
+        _log_selection(selection_log, config, t, res)
+        if registry:
+            _update_registry(registry, config, t, res)
+    if registry:
+        registry.close()
+    
+    output_file = config['output_file']
+    os.makedirs(os.path.dirname(output_file), exist_ok=True)
+    fieldnames = FIELDNAMES + (MEMORY_FIELDS if any(t.get('memory') for t, _, _ in entries) else [])
+    fieldnames += PORTFOLIO_FIELDS if any(t['algo'] == "PF" for t, _, _ in entries) else []
+    _rewrite_canonical(output_file, rows, fieldnames)
+    results_db = results_db or config.get('results_db')
+    if results_db:
+        store = ResultsStore(results_db)
+        store.insert_rows(rows, replace_experiment=config['experiment_name'])
+        store.close()
+    print(f"📊 Merge completato: {len(rows)} righe in {output_file}")
+    return True
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
-    parser.add_argument("--config", type=str, required=True, help="Percorso del file .json di configurazione")
+    parser.add_argument("--config", type=str, help="Percorso del file .json di configurazione")
+    parser.add_argument("--registry", type=str, default=None,
+                        help="Database SQLite delle Best Known Solutions (sovrascrive 'bks_registry' del JSON)")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Numero di processi paralleli (default 1 = sequenziale)")
+    parser.add_argument("--resume", action="store_true",
+                        help="Riprende un run interrotto: esegue solo i task assenti dal CSV di output")
+    parser.add_argument("--cache", type=str, default=None,
+                        help="Database SQLite della cache dei run deterministici (sovrascrive 'result_cache' del JSON)")
+    parser.add_argument("--results-db", type=str, default=None,
+                        help="Database SQLite dei risultati (sovrascrive 'results_db' del JSON)")
+    parser.add_argument("--memory", action="store_true",
+                        help="Aggiunge le colonne PeakPyMB (tracemalloc) e RSSDeltaMB per ogni run")
+    # Modalità coda (più worker, anche avviati in momenti diversi, sullo stesso file SQLite)
+    parser.add_argument("--queue", type=str, default=None, help="Database SQLite della coda di lavoro")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--enqueue", action="store_true", help="Accoda i task del --config nella --queue")
+    mode.add_argument("--worker", action="store_true", help="Esegue task dalla --queue finché ce ne sono")
+    mode.add_argument("--merge", action="store_true", help="Scrive il CSV del --config dai risultati in --queue")
+    parser.add_argument("--lease", type=float, default=300,
+                        help="Durata del lease di un task in secondi (worker morto -> task ripreso)")
+    # Strumentazione
+    parser.add_argument("--trace", type=str, default=None,
+                        help="File JSONL (append) con il tempo wall/CPU di ogni fase")
+    parser.add_argument("--profile", type=str, default=None,
+                        help="Cartella dei profili cProfile (.pstats per task + summary.txt)")
+    parser.add_argument("--profile-tasks", type=str, default=None,
+                        help="Task da profilare: indici e/o algoritmi separati da virgola (es. 'BnB' o '0,7'); default tutti")
     args = parser.parse_args()
     
-    run_experiment(args.config)
\ No newline at end of file
+    if args.trace or args.profile:
+        tracing.configure(args.trace, args.profile,
+                          args.profile_tasks.split(',') if args.profile_tasks else None)
+    
+    if (args.enqueue or args.worker or args.merge) and not args.queue:
+        parser.error("--enqueue/--worker/--merge richiedono --queue")
+    if not args.worker and not args.config:
+        parser.error("--config è obbligatorio")
+    
+    if args.enqueue:
+        enqueue_experiment(args.config, args.queue, registry_path=args.registry)
+    elif args.worker:
+        run_worker(args.queue, run_task, lease_seconds=args.lease)
+    elif args.merge:
+        merge_queue_results(args.config, args.queue, registry_path=args.registry, results_db=args.results_db)
+    else:
+        run_experiment(args.config, registry_path=args.registry, workers=args.workers, resume=args.resume,
+                       cache_path=args.cache, results_db=args.results_db, measure_memory=args.memory)
\ No newline at end of file
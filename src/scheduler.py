@@ -0,0 +1,133 @@
+"""
+Scheduling dei task di una campagna in base alla durata prevista.
+
+Il costo di ogni task è stimato dai time limit del JSON e dai tempi storici
+(results/reference/*.csv e run precedenti in results/generated/csv/).
+In esecuzione parallela i task vengono distribuiti Longest Processing Time first
+(la stessa regola LPT dei nostri solver, applicata ai worker): i B&B da 60 s e gli IG
+da 30 s partono per primi e non si accumulano in coda come straggler.
+"""
+import csv
+import glob
+import heapq
+import os
+
+DEFAULT_HISTORY = [
+    os.path.join("results", "reference", "*.csv"),
+    os.path.join("results", "generated", "csv", "*.csv"),
+]
+
+# Stime di fallback (istanze mai viste): costo per nodo del Brute Force e overhead fisso per task
+BF_SECONDS_PER_NODE = 5e-7
+VEC_BF_SECONDS_PER_NODE = 3e-9  # enumeratore a blocchi (brute_force_vec), per processo
+TASK_OVERHEAD = 0.01
+# DP a due macchine: N passi su ~N * p_medio / 2 stati (UB), costo per stato misurato
+DP_SECONDS_PER_STATE = 3e-7
+DP_MEAN_TIME = 60
+# Portfolio senza storico proprio: avvio del pool di processi (misurato ~20 ms) oltre al tempo del B&B
+PORTFOLIO_STARTUP = 0.02
+
+
+def load_timing_history(patterns=None):
+    """
+    Aggrega i tempi storici dei solver esatti e del portfolio per (Algo, N, M, Dist).
+    Ritorna {chiave: [somma_tempi, conteggio, n_timeout]}; l'IG è escluso (dura quanto il suo time limit).
+    Per il portfolio conta il tempo wall fino alla risposta (WallTime; nelle righe che non hanno la colonna,
+    Time era già wall) e un run non certificato (HEURISTIC) è un "timeout": ha consumato tutto il budget.
+    """
+    history = {}
+    for pattern in patterns or DEFAULT_HISTORY:
+        for path in glob.glob(pattern):
+            with open(path, 'r', newline='') as f:
+                reader = csv.DictReader(f)
+                if not reader.fieldnames or not {'Algo', 'N', 'M', 'Dist', 'Time'} <= set(reader.fieldnames):
+                    continue
+                for row in reader:
+                    if row['Algo'] not in ("BF", "BnB", "DP", "PF"):
+                        continue
+                    portfolio = row['Algo'] == "PF"
+                    try:
+                        key = (row['Algo'], int(row['N']), int(row['M']), row['Dist'])
+                        elapsed = float(row.get('WallTime') or row['Time']) if portfolio else float(row['Time'])
+                    except ValueError:
+                        continue
+                    rec = history.setdefault(key, [0.0, 0, 0])
+                    rec[0] += elapsed
+                    rec[1] += 1
+                    rec[2] += row.get('Status') == ("HEURISTIC" if portfolio else "TIMEOUT")
+    return history
+
+
+def _lookup(history, algo, meta):
+    """Record storico di (algo, N, M, Dist); in mancanza, la stessa taglia su qualsiasi distribuzione."""
+    rec = history.get((algo, meta['n'], meta['m'], meta['dist']))
+    if rec is None:
+        recs = [v for k, v in history.items() if k[:3] == (algo, meta['n'], meta['m'])]
+        if recs:
+            rec = [sum(r[0] for r in recs), sum(r[1] for r in recs), sum(r[2] for r in recs)]
+    return rec
+
+
+def estimate_task_cost(task, history):
+    """Durata prevista (secondi) di un task."""
+    meta = task['meta']
+    algo = task['algo']
+
+    if algo == "IG":
+        return task['opts']['time_limit'] + TASK_OVERHEAD
+
+    if algo == "PF":
+        # Il portfolio risponde quando un componente certifica l'ottimo: tempo storico del portfolio,
+        # altrimenti quello del suo B&B (che certifica) se sulla taglia non è mai andato in timeout.
+        # Solo senza storico, o se il B&B non chiude, il costo è il budget intero.
+        limit = task['opts']['time_limit']
+        rec = _lookup(history, "PF", meta)
+        bnb = _lookup(history, "BnB", meta)
+        if rec is not None:
+            estimate = rec[0] / rec[1]
+        elif bnb is not None and bnb[2] == 0:
+            estimate = bnb[0] / bnb[1] + PORTFOLIO_STARTUP
+        else:
+            estimate = limit
+        return min(estimate, limit) + TASK_OVERHEAD
+
+    if algo == "BF" and task['opts'].get('vectorized'):
+        # Nessuno storico separato per l'enumeratore vettorizzato: stima dal numero di nodi
+        m, n = meta['m'], meta['n']
+        nodes = (m ** (n + 1) - 1) / (m - 1) if m > 1 else n + 1
+        return nodes * VEC_BF_SECONDS_PER_NODE / task['opts'].get('workers', 1) + TASK_OVERHEAD
+
+    limit = task['opts'].get('time_limit', float('inf'))
+    rec = _lookup(history, algo, meta)
+
+    if rec is not None:
+        # Un timeout storico significa "almeno il time limit": stima pessimistica
+        estimate = limit if rec[2] > 0 else rec[0] / rec[1]
+    elif algo == "BF":
+        m, n = meta['m'], meta['n']
+        estimate = (m ** (n + 1) - 1) / (m - 1) * BF_SECONDS_PER_NODE if m > 1 else n * BF_SECONDS_PER_NODE
+    elif algo == "DP":
+        n = meta['n']
+        estimate = n * n * DP_MEAN_TIME / 2 * DP_SECONDS_PER_STATE
+    else:
+        # B&B mai visto su questa taglia: assumiamo il caso peggiore
+        estimate = limit
+    return min(estimate, limit) + TASK_OVERHEAD
+
+
+def order_longest_first(tasks, costs):
+    """Ordine di dispatch LPT: costo decrescente, a parità ordine canonico (deterministico)."""
+    return sorted(tasks, key=lambda t: (-costs[t['index']], t['index']))
+
+
+def predict_makespan(ordered_tasks, costs, workers):
+    """
+    Simula il list scheduling del pool: ogni task va al primo worker libero.
+    Ritorna il makespan previsto della campagna (secondi).
+    """
+    free_at = [0.0] * max(1, workers)
+    heapq.heapify(free_at)
+    for t in ordered_tasks:
+        start = heapq.heappop(free_at)
+        heapq.heappush(free_at, start + costs[t['index']])
+    return max(free_at)
@@ -0,0 +1,264 @@
+"""
+Selezione dell'algoritmo per istanza: feature economiche + modello appreso del tempo del B&B.
+
+Feature (O(N * M^2), nessun solver):
+    n, m, p_mean, p_cv (coeff. di variazione dei p_ij), lb, lpt, lpt_gap = (LPT - LB) / LB,
+    machine_corr  correlazione media (Pearson) tra le righe delle macchine (alta = job_correlated)
+    job_regret    media su j di (secondo minimo - minimo) di p_.j, normalizzata per p_mean
+Modello: regressione ridge su log10(tempo B&B) con interazioni con n (il tempo cresce
+esponenzialmente in N, con pendenza che dipende da M e dalla struttura dell'istanza).
+I TIMEOUT sono censurati: il tempo vero è >= time limit, il target viene alzato alla predizione
+del modello stesso e si ripete il fit (poche iterazioni).
+
+Decisione (choose): se il tempo previsto supera il time limit il B&B è saltato (dominio IG),
+altrimenti gira con time limit = margin x previsto, tra min_time_limit e il time limit del JSON.
+Ogni decisione e il suo esito sono scritti in un log CSV, riusabile come storico per il re-training.
+
+Usage:
+    python src/selector.py train --history results/reference/pilot_wall_results.csv --model results/selector_model.json
+    python src/selector.py train --history results/reference/pilot_wall_results.csv --log results/generated/selector_log.csv
+    python src/selector.py predict data/dataset_exam/small/job_correlated/inst_24_4_job_correlated_2200.txt --time-limit 60
+"""
+import argparse
+import csv
+import glob
+import json
+import math
+import os
+import re
+import time
+
+from instance import Instance
+from algorithms import greedy_lpt_solve
+
+FEATURES = ["n", "m", "p_mean", "p_cv", "lb", "lpt", "lpt_gap", "machine_corr", "job_regret"]
+# Termini del modello (derivati dalle feature)
+MODEL_TERMS = ["n", "log2_m", "n_log2_m", "machine_corr", "n_machine_corr", "job_regret", "n_job_regret",
+               "lpt_gap", "p_cv"]
+MIN_SECONDS = 1e-4     # i tempi storici a 0.0 (risoluzione di process_time) diventano questo valore
+CENSOR_ROUNDS = 5
+LOG_FIELDS = (["Timestamp", "Experiment", "Dist", "N", "M", "Seed", "InstanceHash"] + FEATURES +
+              ["PredictedTime", "Decision", "TimeLimit", "RealizedTime", "Status"])
+
+
+def instance_features(inst):
+    """Feature economiche di un'istanza (dict con le chiavi di FEATURES)."""
+    n, m = inst.num_jobs, inst.num_machines
+    rows = [list(row) for row in inst.processing_times]
+    values = [p for row in rows for p in row]
+    p_mean = sum(values) / len(values)
+    p_std = math.sqrt(sum((p - p_mean) ** 2 for p in values) / len(values))
+    lb = inst.get_theoretical_lower_bound()
+    lpt, _ = greedy_lpt_solve(inst)
+
+    # Correlazione media tra coppie di macchine (0 se una riga è costante)
+    stats = []
+    for row in rows:
+        mu = sum(row) / n
+        sd = math.sqrt(sum((p - mu) ** 2 for p in row))
+        stats.append((mu, sd))
+    corrs = []
+    for a in range(m):
+        for b in range(a + 1, m):
+            (mu_a, sd_a), (mu_b, sd_b) = stats[a], stats[b]
+            if sd_a == 0 or sd_b == 0:
+                corrs.append(0.0)
+                continue
+            cov = sum((x - mu_a) * (y - mu_b) for x, y in zip(rows[a], rows[b]))
+            corrs.append(cov / (sd_a * sd_b))
+
+    # Regret del job: quanto costa non metterlo sulla sua macchina migliore
+    regrets = []
+    if m > 1:
+        for j in range(n):
+            first, second = sorted(row[j] for row in rows)[:2]
+            regrets.append(second - first)
+
+    return {"n": n, "m": m, "p_mean": p_mean, "p_cv": p_std / p_mean if p_mean else 0.0,
+            "lb": lb, "lpt": lpt, "lpt_gap": (lpt - lb) / lb if lb else 0.0,
+            "machine_corr": sum(corrs) / len(corrs) if corrs else 0.0,
+            "job_regret": (sum(regrets) / len(regrets)) / p_mean if regrets and p_mean else 0.0}
+
+
+def model_terms(features):
+    """Vettore dei termini del modello (ordine di MODEL_TERMS)."""
+    n, log2_m = features['n'], math.log2(max(features['m'], 1))
+    return [n, log2_m, n * log2_m, features['machine_corr'], n * features['machine_corr'],
+            features['job_regret'], n * features['job_regret'], features['lpt_gap'], features['p_cv']]
+
+
+class BnBTimeModel:
+    """Ridge su log10(secondi) con termini standardizzati. Predizione in puro Python (niente NumPy)."""
+
+    def __init__(self, params=None):
+        self.params = params
+
+    def fit(self, features, seconds, censored, ridge=1.0):
+        """features: lista di dict; seconds: tempi; censored[i] = True se TIMEOUT (tempo vero >= seconds[i])."""
+        import numpy as np
+        X = np.array([model_terms(f) for f in features], dtype=float)
+        y_floor = np.log10(np.maximum(np.array(seconds, dtype=float), MIN_SECONDS))
+        mask = np.array(censored, dtype=bool)
+        mean, std = X.mean(axis=0), X.std(axis=0)
+        std[std == 0] = 1.0
+        Z = np.hstack([np.ones((len(X), 1)), (X - mean) / std])
+        penalty = np.sqrt(ridge) * np.eye(Z.shape[1])
+        penalty[0, 0] = 0.0  # intercetta non penalizzata
+
+        y = y_floor.copy()
+        for _ in range(CENSOR_ROUNDS if mask.any() else 1):
+            coef = np.linalg.lstsq(np.vstack([Z, penalty]), np.concatenate([y, np.zeros(Z.shape[1])]),
+                                   rcond=None)[0]
+            # Censura: il tempo di un TIMEOUT è almeno il time limit, mai meno della predizione
+            y = np.where(mask, np.maximum(y_floor, Z @ coef), y_floor)
+
+        residuals = (Z @ coef - y_floor)[~mask]
+        self.params = {"terms": MODEL_TERMS, "mean": mean.tolist(), "std": std.tolist(),
+                       "intercept": float(coef[0]), "coef": coef[1:].tolist(), "ridge": ridge,
+                       "samples": int(len(X)), "censored": int(mask.sum()),
+                       "rmse_log10": float(np.sqrt(np.mean(residuals ** 2))) if residuals.size else None}
+        return self
+
+    def predict_log10(self, features):
+        p = self.params
+        z = [(v - mu) / sd for v, mu, sd in zip(model_terms(features), p['mean'], p['std'])]
+        return p['intercept'] + sum(c * v for c, v in zip(p['coef'], z))
+
+    def predict(self, features):
+        """Tempo previsto del B&B (secondi)."""
+        return 10 ** self.predict_log10(features)
+
+    def save(self, path):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump(self.params, f, indent=2)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'r') as f:
+            return cls(json.load(f))
+
+
+class Selector:
+    """Decisione per istanza: B&B (con time limit) o solo IG, dal tempo previsto."""
+
+    def __init__(self, model, margin=10.0, min_time_limit=1.0):
+        self.model = model
+        self.margin = margin
+        self.min_time_limit = min_time_limit
+
+    def choose(self, features, time_limit):
+        """Ritorna {"solver": "BnB"|"IG", "time_limit": secondi|None, "predicted_time": secondi}."""
+        predicted = self.model.predict(features)
+        if predicted > time_limit:
+            return {"solver": "IG", "time_limit": None, "predicted_time": predicted}
+        # Time limit su un decimale (Params leggibili e stabili tra run)
+        limit = min(time_limit, max(self.min_time_limit, math.ceil(self.margin * predicted * 10) / 10))
+        return {"solver": "BnB", "time_limit": limit, "predicted_time": predicted}
+
+
+class SelectionLog:
+    """Log CSV append-only di decisioni ed esiti (una riga per istanza decisa)."""
+
+    def __init__(self, path):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        if not os.path.exists(path):
+            with open(path, 'w', newline='') as f:
+                csv.DictWriter(f, fieldnames=LOG_FIELDS).writeheader()
+
+    def append(self, experiment, meta, instance_hash, features, decision, realized_time="", status=""):
+        row = {"Timestamp": f"{time.time():.3f}", "Experiment": experiment, "Dist": meta['dist'],
+               "N": meta['n'], "M": meta['m'], "Seed": meta['seed'], "InstanceHash": instance_hash,
+               "PredictedTime": f"{decision['predicted_time']:.6g}", "Decision": decision['solver'],
+               "TimeLimit": decision['time_limit'] if decision['time_limit'] is not None else "",
+               "RealizedTime": realized_time, "Status": status}
+        row.update(features)
+        with open(self.path, 'a', newline='') as f:
+            csv.DictWriter(f, fieldnames=LOG_FIELDS).writerow(row)
+
+
+# --- Storico per il training ---------------------------------------------------
+
+_TL_PATTERN = re.compile(r"TL=([0-9.]+)s")
+
+
+def _dataset_index(dataset_root):
+    return {os.path.basename(p): p for p in glob.glob(os.path.join(dataset_root, "**", "*.txt"), recursive=True)}
+
+
+def load_history(history_paths, dataset_root=os.path.join("data", "dataset_exam")):
+    """
+    Righe B&B dei CSV di risultati -> (features, secondi, censurato).
+    Le feature si calcolano dal file istanza inst_{N}_{M}_{Dist}_{Seed}.txt sotto dataset_root.
+    """
+    index = _dataset_index(dataset_root)
+    features_cache = {}
+    samples = []
+    for path in history_paths:
+        with open(path, 'r', newline='') as f:
+            for row in csv.DictReader(f):
+                if row['Algo'] != "BnB" or row['Status'] not in ("OPTIMAL", "TIMEOUT"):
+                    continue
+                name = f"inst_{row['N']}_{row['M']}_{row['Dist']}_{row['Seed']}.txt"
+                if name not in index:
+                    continue
+                if name not in features_cache:
+                    features_cache[name] = instance_features(Instance(index[name]))
+                match = _TL_PATTERN.search(row['Params'])
+                censored = row['Status'] == "TIMEOUT"
+                seconds = float(match.group(1)) if censored and match else float(row['Time'])
+                samples.append((features_cache[name], seconds, censored))
+    return samples
+
+
+def load_log(log_path):
+    """Esiti registrati nel log (solo istanze su cui il B&B è stato eseguito)."""
+    samples = []
+    with open(log_path, 'r', newline='') as f:
+        for row in csv.DictReader(f):
+            if row['Decision'] != "BnB" or row['Status'] not in ("OPTIMAL", "TIMEOUT"):
+                continue
+            features = {k: float(row[k]) for k in FEATURES}
+            censored = row['Status'] == "TIMEOUT"
+            seconds = float(row['TimeLimit']) if censored else float(row['RealizedTime'])
+            samples.append((features, seconds, censored))
+    return samples
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Feature delle istanze e modello del tempo del B&B")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p_train = sub.add_parser("train", help="Addestra il modello dallo storico (CSV di risultati e/o log)")
+    p_train.add_argument("--history", nargs="*", default=[os.path.join("results", "reference", "pilot_wall_results.csv")])
+    p_train.add_argument("--log", nargs="*", default=[], help="Log delle decisioni (SelectionLog)")
+    p_train.add_argument("--dataset", type=str, default=os.path.join("data", "dataset_exam"))
+    p_train.add_argument("--model", type=str, default=os.path.join("results", "selector_model.json"))
+    p_train.add_argument("--ridge", type=float, default=1.0)
+    p_predict = sub.add_parser("predict", help="Feature, tempo previsto e decisione per un'istanza")
+    p_predict.add_argument("instance", type=str)
+    p_predict.add_argument("--model", type=str, default=os.path.join("results", "selector_model.json"))
+    p_predict.add_argument("--time-limit", type=float, default=60)
+    args = parser.parse_args()
+
+    if args.command == "train":
+        samples = load_history(args.history, args.dataset)
+        for log_path in args.log:
+            samples += load_log(log_path)
+        if not samples:
+            print("❌ Nessun campione B&B nello storico")
+            raise SystemExit(1)
+        features, seconds, censored = zip(*samples)
+        model = BnBTimeModel().fit(features, seconds, censored, ridge=args.ridge)
+        model.save(args.model)
+        p = model.params
+        print(f"🧠 Modello salvato in {args.model}: {p['samples']} campioni ({p['censored']} TIMEOUT censurati), "
+              f"RMSE log10 = {p['rmse_log10']:.3f}")
+    else:
+        model = BnBTimeModel.load(args.model)
+        features = instance_features(Instance(args.instance))
+        decision = Selector(model).choose(features, args.time_limit)
+        print(f"📐 {os.path.basename(args.instance)}: " + ", ".join(
+            f"{k}={v:.3g}" if isinstance(v, float) else f"{k}={v}" for k, v in features.items()))
+        limit = f" (TL={decision['time_limit']}s)" if decision['time_limit'] else ""
+        print(f"🔮 Tempo B&B previsto: {decision['predicted_time']:.3g}s -> {decision['solver']}{limit}")
@@ -0,0 +1,160 @@
+"""
+Istanze in memoria condivisa (multiprocessing.shared_memory) per i solver multi-processo.
+
+Il processo padre pubblica UNA volta la matrice M x N (int32) e le statistiche per job in un segmento;
+ai worker arriva solo un descrittore picklabile (nome del segmento, N, M, hash) e attach() costruisce
+un Instance in sola lettura le cui righe sono memoryview sul segmento: niente pickling della lista
+annidata, niente parsing ripetuto, una sola copia in RAM qualunque sia il numero di worker.
+
+Layout del segmento (byte order nativo: padre e worker sono sulla stessa macchina):
+    [0, 4*N*M)              p_ij int32, riga per riga (macchina i: p_i0 ... p_i,N-1)
+    [4*N*M, 4*N*M + 4*N)    min_i p_ij per job (int32), usato dal lower bound senza rileggere la matrice
+
+Pulizia: SharedInstanceStore (lato padre) chiude e rimuove i segmenti con release()/close(), come
+context manager e comunque all'uscita dell'interprete (atexit). Se il padre muore senza arrivarci
+(kill, crash), il resource tracker di multiprocessing rimuove i segmenti che ha creato.
+I worker non rimuovono mai i segmenti: chiudono solo la propria mappatura quando l'Instance viene
+liberato.
+
+Usage:
+    python src/shared_instance.py data/dataset_exam/large/uniform/inst_500_20_uniform_2414.txt --workers 4
+"""
+import argparse
+import atexit
+import os
+import pickle
+import time
+from array import array
+from multiprocessing import resource_tracker, shared_memory
+
+from instance import Instance
+
+
+def _open_segment(name):
+    """
+    Apertura lato worker SENZA registrazione nel resource tracker: il segmento è del padre.
+    (Un worker con un proprio tracker lo rimuoverebbe alla sua uscita, sotto i piedi degli altri.)
+    """
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)  # Python >= 3.13
+    except TypeError:
+        pass
+    register = resource_tracker.register
+    resource_tracker.register = lambda name, rtype: None
+    try:
+        return shared_memory.SharedMemory(name=name)
+    finally:
+        resource_tracker.register = register
+
+
+class _SharedView:
+    """Memoryview in sola lettura su un segmento; rilasciate tutte prima di chiudere la mappatura."""
+
+    def __init__(self, shm, n, m):
+        self.shm = shm
+        self.base = shm.buf.toreadonly()
+        self.matrix = self.base[:4 * n * m].cast('i')
+        self.rows = [self.matrix[i * n:(i + 1) * n] for i in range(m)]
+        self.job_min = self.base[4 * n * m:4 * n * (m + 1)].cast('i')
+
+    def close(self):
+        if self.shm is None:
+            return
+        for view in self.rows + [self.job_min, self.matrix, self.base]:
+            view.release()
+        self.shm.close()
+        self.shm = None
+
+    def __del__(self):
+        self.close()
+
+
+def attach(descriptor):
+    """Instance in sola lettura sul segmento del descrittore (nessuna copia della matrice)."""
+    n, m = descriptor['n'], descriptor['m']
+    view = _SharedView(_open_segment(descriptor['name']), n, m)
+    return Instance.from_rows(view.rows, n, m, name=descriptor['label'], content_hash=descriptor['hash'],
+                              buffer=view, job_min=view.job_min)
+
+
+class SharedInstanceStore:
+    """Segmenti pubblicati dal processo padre, per chiave (es. percorso del file)."""
+
+    def __init__(self):
+        self._segments = {}  # chiave -> (SharedMemory, descrittore)
+        atexit.register(self.close)
+
+    def publish(self, inst, key=None):
+        """Copia matrice e statistiche in un nuovo segmento (una volta per chiave). Ritorna il descrittore."""
+        key = key if key is not None else inst.filepath
+        if key in self._segments:
+            return self._segments[key][1]
+        n, m = inst.num_jobs, inst.num_machines
+        shm = shared_memory.SharedMemory(create=True, size=4 * n * (m + 1))
+        try:
+            job_min = None
+            for i, row in enumerate(inst.processing_times):
+                packed = array('i', row)
+                shm.buf[4 * i * n:4 * (i + 1) * n] = packed.tobytes()
+                job_min = packed if job_min is None else array('i', map(min, job_min, packed))
+            shm.buf[4 * n * m:4 * n * (m + 1)] = job_min.tobytes()
+        except BaseException:
+            shm.close()
+            shm.unlink()
+            raise
+        descriptor = {"name": shm.name, "n": n, "m": m, "hash": inst.content_hash(), "label": inst.filepath}
+        self._segments[key] = (shm, descriptor)
+        return descriptor
+
+    def release(self, key):
+        """Rimuove il segmento di una chiave (i worker che lo hanno già mappato continuano a leggerlo)."""
+        entry = self._segments.pop(key, None)
+        if entry is not None:
+            entry[0].close()
+            entry[0].unlink()
+
+    def close(self):
+        for key in list(self._segments):
+            self.release(key)
+
+    def __len__(self):
+        return len(self._segments)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _worker_lb(source):
+    """Benchmark: lower bound nel worker, da descrittore (attach) o da Instance picklato."""
+    inst = attach(source) if isinstance(source, dict) else source
+    return inst.get_theoretical_lower_bound()
+
+
+if __name__ == "__main__":
+    from concurrent.futures import ProcessPoolExecutor
+
+    parser = argparse.ArgumentParser(description="Confronto pickling vs memoria condivisa verso i worker")
+    parser.add_argument("instance", type=str, help="File istanza")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--tasks", type=int, default=16, help="Task (uno per invio dell'istanza)")
+    args = parser.parse_args()
+
+    inst = Instance(args.instance)
+    print(f"📦 {os.path.basename(args.instance)}: N={inst.num_jobs}, M={inst.num_machines}, "
+          f"pickle {len(pickle.dumps(inst)) / 1024:.0f} KiB per task")
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        list(pool.map(abs, range(args.workers)))  # avvio dei worker fuori dalla misura
+        start = time.perf_counter()
+        lbs = list(pool.map(_worker_lb, [inst] * args.tasks))
+        pickled = time.perf_counter() - start
+        with SharedInstanceStore() as store:
+            start = time.perf_counter()
+            descriptor = store.publish(inst)
+            shared_lbs = list(pool.map(_worker_lb, [descriptor] * args.tasks))
+            shared = time.perf_counter() - start
+    print(f"🐢 Pickling:          {pickled:.3f}s ({args.tasks} task)")
+    print(f"⚡ Memoria condivisa: {shared:.3f}s (pubblicazione inclusa, descrittore {len(pickle.dumps(descriptor))} B)")
+    print("✅ Lower bound identici" if lbs == shared_lbs else "❌ Lower bound diversi")
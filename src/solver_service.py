@@ -0,0 +1,402 @@
+"""
+Servizio solver locale (daemon) con pool di processi pre-riscaldato.
+
+Evita, per ogni richiesta, l'avvio di un interprete e l'import di pandas/matplotlib:
+i worker importano i solver una sola volta e restano in attesa. Ascolta su localhost (HTTP)
+oppure su un socket Unix; solo stdlib.
+
+API:
+    POST   /solve          JSON {"algo": "lpt"|"ig"|"bnb", "matrix": [[...], ...] (M x N),
+                                 "time_limit": 1.0, "seed": 42, "d": min(4, N), "T_lambda": 0.5, "async": false}
+                           oppure corpo binario (Content-Type: application/octet-stream) = M*N int32
+                           little-endian riga per riga, parametri nella query (?algo=ig&m=4&n=50&time_limit=1)
+                           -> 200 {"id", "makespan", "assignment", "status", "nodes", "lower_bound", ...}
+                              202 {"id"} se async; 503 se il servizio è saturo (max_inflight)
+    GET    /result/<id>    -> 200 risultato | 202 {"status": "queued"|"running"} | 404
+    DELETE /solve/<id>     cancellazione: rimossa dalla coda se non ancora partita, altrimenti
+                           il solver si ferma alla prossima verifica del time limit (status CANCELLED)
+    GET    /metrics        profondità coda, richieste in corso, latenze p50/p90/p99/max
+    GET    /health
+
+Usage:
+    python src/solver_service.py --port 8765 --workers 4
+    python src/solver_service.py --unix /tmp/solver.sock --workers 4
+    curl -s localhost:8765/solve -d '{"algo": "ig", "matrix": [[3, 5, 2], [4, 1, 6]], "time_limit": 0.5}'
+"""
+import argparse
+import array
+import collections
+import itertools
+import json
+import math
+import multiprocessing
+import os
+import signal
+import socket
+import socketserver
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, CancelledError
+from http.server import BaseHTTPRequestHandler, HTTPServer, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+from instance import Instance
+from algorithms import greedy_lpt_solve, IteratedGreedy, BranchAndBound
+
+ALGOS = ("lpt", "ig", "bnb")
+DEFAULT_TIME_LIMIT = {"ig": 1.0, "bnb": 10.0}
+LATENCY_WINDOW = 2048  # campioni per i percentili
+
+# --- Lato worker ---------------------------------------------------------------
+
+# Flag condivisi (per slot di richiesta): il padre scrive _CANCEL, il worker scrive _RUNNING
+_CANCEL = None
+_RUNNING = None
+
+
+def _init_worker(cancel_flags, running_flags):
+    global _CANCEL, _RUNNING
+    _CANCEL = cancel_flags
+    _RUNNING = running_flags
+
+
+def _warmup(hold):
+    """Forza l'avvio del processo worker e una prima esecuzione dei solver."""
+    greedy_lpt_solve(Instance.from_matrix([[1, 2], [2, 1]]))
+    time.sleep(hold)  # tiene occupato il worker: il pool è costretto ad avviarli tutti
+    return os.getpid()
+
+
+def _watch_cancel(solver, slot, stop):
+    """Cancellazione cooperativa: azzera il time limit, il solver si ferma al controllo successivo."""
+    while not stop.wait(0.01):
+        if _CANCEL[slot]:
+            solver.time_limit = -1
+            return
+
+
+def _solve_request(req, slot):
+    started = time.time()
+    if _CANCEL[slot]:
+        return {"status": "CANCELLED", "started": started, "cpu_time": 0.0}
+    _RUNNING[slot] = 1
+    try:
+        inst = Instance.from_matrix(req['matrix'])
+        algo = req['algo']
+        cpu0 = time.process_time()
+        if algo == "lpt":
+            makespan, assignment = greedy_lpt_solve(inst)
+            nodes, status = 0, "HEURISTIC"
+        else:
+            if algo == "ig":
+                solver = IteratedGreedy(inst, time_limit=req['time_limit'], d=req['d'], T_lambda=req['T_lambda'])
+                run = lambda: solver.solve(seed=req['seed'])
+            else:
+                solver = BranchAndBound(inst, time_limit=req['time_limit'])
+                run = solver.solve
+            stop = threading.Event()
+            watcher = threading.Thread(target=_watch_cancel, args=(solver, slot, stop), daemon=True)
+            watcher.start()
+            try:
+                makespan, nodes, status = run()
+            finally:
+                stop.set()
+                watcher.join()
+            assignment = solver.best_assignment
+            if _CANCEL[slot]:
+                status = "CANCELLED"
+        return {"makespan": makespan, "assignment": list(assignment), "status": status, "nodes": nodes,
+                "lower_bound": inst.get_theoretical_lower_bound(), "cpu_time": time.process_time() - cpu0,
+                "started": started}
+    finally:
+        _RUNNING[slot] = 0
+
+
+# --- Lato servizio -------------------------------------------------------------
+
+def _percentiles(samples):
+    if not samples:
+        return {}
+    ordered = sorted(samples)
+
+    def pct(p):
+        return ordered[max(0, math.ceil(p * len(ordered)) - 1)]
+    return {"p50": pct(0.50), "p90": pct(0.90), "p99": pct(0.99), "max": ordered[-1], "count": len(ordered)}
+
+
+class SolverService:
+    """Pool pre-riscaldato + stato delle richieste (thread-safe)."""
+
+    def __init__(self, workers=None, max_inflight=64, max_time_limit=300.0, retention=300.0):
+        self.workers = workers or os.cpu_count() or 1
+        self.max_inflight = max_inflight
+        self.max_time_limit = max_time_limit
+        self.retention = retention  # secondi di conservazione dei risultati async non ritirati
+        self.cancel_flags = multiprocessing.Array('b', max_inflight, lock=False)
+        self.running_flags = multiprocessing.Array('b', max_inflight, lock=False)
+        self.pool = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                        initargs=(self.cancel_flags, self.running_flags))
+        self.lock = threading.Lock()
+        self.free_slots = list(range(max_inflight))
+        self.requests = {}  # id -> {"future", "slot", "submitted", "done_at"}
+        self.ids = itertools.count(1)
+        self.latency_ms = collections.deque(maxlen=LATENCY_WINDOW)
+        self.queue_wait_ms = collections.deque(maxlen=LATENCY_WINDOW)
+        self.counters = collections.Counter()
+        self.started_at = time.time()
+
+    def warm_up(self):
+        """Avvia tutti i worker prima della prima richiesta (niente cold start in coda)."""
+        pids = set(f.result() for f in [self.pool.submit(_warmup, 0.2) for _ in range(self.workers)])
+        print(f"🔥 Pool pronto: {len(pids)} worker")
+
+    def validate(self, req):
+        algo = req.get('algo')
+        if algo not in ALGOS:
+            raise ValueError(f"algo deve essere uno tra {ALGOS}")
+        matrix = req.get('matrix')
+        if not isinstance(matrix, list) or not matrix or not isinstance(matrix[0], list):
+            raise ValueError("matrix deve essere una lista di righe (M x N)")
+        n = len(matrix[0])
+        if n == 0 or any(not isinstance(row, list) or len(row) != n for row in matrix):
+            raise ValueError("matrix: tutte le righe devono avere lo stesso numero (> 0) di job")
+        # bool è un int per Python, ma un p_ij true/false è quasi certamente un errore del client
+        if any(type(p) is not int or p < 0 for row in matrix for p in row):
+            raise ValueError("matrix: ogni p_ij deve essere un intero >= 0")
+        time_limit = float(req.get('time_limit', DEFAULT_TIME_LIMIT.get(algo, 0)))
+        if not 0 <= time_limit <= self.max_time_limit:
+            raise ValueError(f"time_limit deve essere in [0, {self.max_time_limit}]")
+        # d di default: 4, ridotto a N sulle istanze piccole; solo un d esplicito fuori range è un errore
+        d = int(req['d']) if 'd' in req else min(4, n)
+        if algo == "ig" and not 1 <= d <= n:
+            raise ValueError(f"d deve essere in [1, N={n}]")
+        return {"algo": algo, "matrix": matrix, "time_limit": time_limit, "d": d,
+                "T_lambda": float(req.get('T_lambda', 0.5)), "seed": int(req.get('seed', 42))}
+
+    def submit(self, req):
+        """Accoda una richiesta validata. Ritorna l'id, oppure None se il servizio è saturo."""
+        with self.lock:
+            self._sweep()
+            if not self.free_slots:
+                self.counters['rejected'] += 1
+                return None
+            slot = self.free_slots.pop()
+            self.cancel_flags[slot] = 0
+            req_id = str(next(self.ids))
+            entry = {"slot": slot, "submitted": time.time(), "done_at": None}
+            self.requests[req_id] = entry
+            self.counters['submitted'] += 1
+        entry["future"] = self.pool.submit(_solve_request, req, slot)
+        entry["future"].add_done_callback(lambda f, e=entry: self._on_done(e))
+        return req_id
+
+    def _on_done(self, entry):
+        # L'entry arriva dalla closure: la richiesta può essere già stata ritirata da result()
+        with self.lock:
+            entry["done_at"] = time.time()
+            self.free_slots.append(entry["slot"])
+            self.latency_ms.append((entry["done_at"] - entry["submitted"]) * 1000)
+            future = entry["future"]
+            if future.cancelled():
+                self.counters['cancelled'] += 1
+            elif future.exception() is not None:
+                self.counters['errors'] += 1
+            else:
+                res = future.result()
+                self.queue_wait_ms.append(max(0.0, res['started'] - entry["submitted"]) * 1000)
+                self.counters['cancelled' if res['status'] == "CANCELLED" else 'completed'] += 1
+
+    def _sweep(self):
+        """Rimuove i risultati async non ritirati oltre la retention (chiamata con lock)."""
+        now = time.time()
+        for rid in [r for r, e in self.requests.items() if e["done_at"] and now - e["done_at"] > self.retention]:
+            del self.requests[rid]
+
+    def result(self, req_id, wait=False):
+        """(stato, payload): stato in done/queued/running/missing."""
+        with self.lock:
+            entry = self.requests.get(req_id)
+        if entry is None:
+            return "missing", None
+        future = entry["future"]
+        if not wait and not future.done():
+            return ("running" if self.running_flags[entry["slot"]] else "queued"), None
+        try:
+            res = dict(future.result())
+        except CancelledError:
+            res = {"status": "CANCELLED"}
+        except Exception as e:
+            res = {"status": "ERROR", "error": repr(e)}
+        with self.lock:
+            self.requests.pop(req_id, None)
+        res.pop('started', None)
+        res.update(id=req_id, latency_ms=((entry["done_at"] or time.time()) - entry["submitted"]) * 1000)
+        return "done", res
+
+    def cancel(self, req_id):
+        with self.lock:
+            entry = self.requests.get(req_id)
+            if entry is None or entry["done_at"] is not None:
+                return False
+            self.cancel_flags[entry["slot"]] = 1
+        entry["future"].cancel()  # efficace solo se non ancora partita
+        return True
+
+    def metrics(self):
+        with self.lock:
+            inflight = [e for e in self.requests.values() if e["done_at"] is None]
+            running = sum(1 for e in inflight if self.running_flags[e["slot"]])
+            return {
+                "workers": self.workers,
+                "uptime_s": time.time() - self.started_at,
+                "inflight": len(inflight),
+                "running": running,
+                "queue_depth": len(inflight) - running,
+                "max_inflight": self.max_inflight,
+                "counters": dict(self.counters),
+                "latency_ms": _percentiles(self.latency_ms),
+                "queue_wait_ms": _percentiles(self.queue_wait_ms),
+            }
+
+    def shutdown(self):
+        for slot in range(self.max_inflight):
+            self.cancel_flags[slot] = 1
+        self.pool.shutdown(wait=True, cancel_futures=True)
+
+
+def _parse_binary(body, query):
+    """Corpo binario: M*N int32 little-endian, forma e parametri nella query string."""
+    req = {k: v[0] for k, v in query.items()}
+    m, n = int(req.pop('m')), int(req.pop('n'))
+    values = array.array('i')
+    values.frombytes(body)
+    if sys.byteorder == "big":
+        values.byteswap()
+    if len(values) != m * n:
+        raise ValueError(f"Attesi {m * n} interi, ricevuti {len(values)}")
+    req['matrix'] = [values[i * n:(i + 1) * n].tolist() for i in range(m)]
+    req['async'] = req.get('async', "false").lower() in ("1", "true")
+    return req
+
+
+class SolverRequestHandler(BaseHTTPRequestHandler):
+    service = None  # impostato da make_server
+    verbose = False
+
+    def _send(self, code, payload):
+        data = json.dumps(payload).encode()
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        path = urlparse(self.path).path.rstrip('/')
+        if path == "/health":
+            self._send(200, {"status": "ok"})
+        elif path == "/metrics":
+            self._send(200, self.service.metrics())
+        elif path.startswith("/result/"):
+            state, res = self.service.result(path.rsplit('/', 1)[1])
+            if state == "done":
+                self._send(200, res)
+            elif state == "missing":
+                self._send(404, {"error": "richiesta sconosciuta o già ritirata"})
+            else:
+                self._send(202, {"status": state})
+        else:
+            self._send(404, {"error": "endpoint sconosciuto"})
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        if url.path.rstrip('/') != "/solve":
+            self._send(404, {"error": "endpoint sconosciuto"})
+            return
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        try:
+            if self.headers.get("Content-Type", "").startswith("application/octet-stream"):
+                raw = _parse_binary(body, parse_qs(url.query))
+            else:
+                raw = json.loads(body or b"{}")
+            req = self.service.validate(raw)
+        except (ValueError, KeyError, TypeError) as e:
+            self._send(400, {"error": str(e)})
+            return
+
+        req_id = self.service.submit(req)
+        if req_id is None:
+            self._send(503, {"error": "servizio saturo", "max_inflight": self.service.max_inflight})
+        elif raw.get('async'):
+            self._send(202, {"id": req_id})
+        else:
+            res = self.service.result(req_id, wait=True)[1]
+            self._send(500 if res['status'] == "ERROR" else 200, res)
+
+    def do_DELETE(self):
+        path = urlparse(self.path).path.rstrip('/')
+        if not path.startswith("/solve/"):
+            self._send(404, {"error": "endpoint sconosciuto"})
+            return
+        self._send(200, {"cancelled": self.service.cancel(path.rsplit('/', 1)[1])})
+
+    def address_string(self):
+        # Socket Unix: client_address non è una tupla (host, port)
+        return self.client_address[0] if isinstance(self.client_address, tuple) else "unix"
+
+    def log_message(self, format, *args):
+        if self.verbose:
+            super().log_message(format, *args)
+
+
+class ThreadingUnixHTTPServer(socketserver.ThreadingMixIn, HTTPServer):
+    address_family = socket.AF_UNIX
+    daemon_threads = True
+
+    def server_bind(self):
+        if os.path.exists(self.server_address):
+            os.unlink(self.server_address)
+        socketserver.TCPServer.server_bind(self)
+        self.server_name, self.server_port = "localhost", 0
+
+
+def make_server(service, host="127.0.0.1", port=8765, unix_path=None, verbose=False):
+    handler = type("BoundSolverRequestHandler", (SolverRequestHandler,), {"service": service, "verbose": verbose})
+    if unix_path:
+        return ThreadingUnixHTTPServer(unix_path, handler)
+    return ThreadingHTTPServer((host, port), handler)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Servizio solver locale con pool pre-riscaldato")
+    parser.add_argument("--host", type=str, default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix", type=str, default=None, help="Ascolta su un socket Unix invece che su TCP")
+    parser.add_argument("--workers", type=int, default=None, help="Processi del pool (default: numero di core)")
+    parser.add_argument("--max-inflight", type=int, default=64, help="Richieste in coda + in esecuzione (oltre: 503)")
+    parser.add_argument("--max-time-limit", type=float, default=300.0, help="Time limit massimo per richiesta (s)")
+    parser.add_argument("--verbose", action="store_true", help="Log di ogni richiesta HTTP")
+    args = parser.parse_args()
+
+    service = SolverService(args.workers, args.max_inflight, args.max_time_limit)
+    service.warm_up()
+    server = make_server(service, args.host, args.port, args.unix, args.verbose)
+    where = args.unix or f"http://{args.host}:{args.port}"
+    print(f"🚀 Solver service in ascolto su {where}")
+
+    def _terminate(signum, frame):
+        raise KeyboardInterrupt  # SIGTERM: stesso arresto ordinato di Ctrl+C
+    signal.signal(signal.SIGTERM, _terminate)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n🛑 Arresto...")
+    finally:
+        # Un secondo SIGTERM/Ctrl+C non deve interrompere la chiusura del pool a metà
+        signal.signal(signal.SIGTERM, signal.SIG_IGN)
+        signal.signal(signal.SIGINT, signal.SIG_IGN)
+        server.server_close()
+        service.shutdown()
+        if args.unix and os.path.exists(args.unix):
+            os.unlink(args.unix)
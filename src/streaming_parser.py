@@ -0,0 +1,162 @@
+"""
+Parser a blocchi per istanze enormi (N ~ 10^6): il file viene letto a chunk di dimensione fissa e i
+valori finiscono direttamente in un buffer int32 preallocato (array('i') o file mappato in memoria),
+senza mai costruire la lista di righe né le liste di int Python.
+
+Memoria: 4 byte per p_ij contro ~36 (int boxed + puntatore) del parser classico. Con backing "mmap"
+la matrice vive nella page cache (pagine rimpiazzabili dal kernel) invece che nell'heap del processo.
+
+Stesso formato e stesse verifiche di Instance.load_from_file: righe vuote e commenti '#' ignorati,
+header "N M", esattamente M righe da N valori. I valori devono stare in un int32.
+
+Usage:
+    python src/streaming_parser.py data/dataset_exam/large/uniform/inst_30_5_uniform_2237.txt --storage mmap
+"""
+import mmap
+import os
+import tempfile
+import time
+from array import array
+
+CHUNK_SIZE = 1 << 14  # 16 KiB di testo per lettura: pochi token temporanei, heap che non cresce
+ITEM_SIZE = array('i').itemsize
+
+STORAGES = ("list", "array", "mmap")
+
+
+def _iter_line_tokens(f, chunk_size):
+    """
+    Token delle righe utili del file, a blocchi: yield (tokens, end_of_line).
+    Una riga lunga arriva in più pezzi; un token spezzato tra due chunk viene ricucito.
+    Le righe di commento (che iniziano con '#') non producono token.
+    """
+    carry = ""          # token spezzato a cavallo di due chunk
+    line_start = True   # nessun carattere ancora visto sulla riga corrente
+    comment = False
+    while True:
+        chunk = f.read(chunk_size)
+        eof = not chunk
+        pieces = ("\n" if eof else chunk).split("\n")
+        for k, piece in enumerate(pieces):
+            end_of_line = k < len(pieces) - 1
+            if line_start and piece:
+                comment = piece.startswith('#')
+                line_start = False
+            if not comment:
+                tokens = (carry + piece).split()
+                carry = ""
+                if not end_of_line and piece and not piece[-1].isspace() and tokens:
+                    carry = tokens.pop()  # il chunk finisce a metà di un numero
+                if tokens or end_of_line:
+                    yield tokens, end_of_line
+            if end_of_line:
+                line_start, comment = True, False
+        if eof:
+            return
+
+
+def _allocate(size, storage, backing_path):
+    """Buffer int32 azzerato di size elementi: (memoryview 'i', oggetto da tenere vivo)."""
+    if storage == "array":
+        buf = array('i', [0]) * size
+        return memoryview(buf), buf
+    if backing_path is None:
+        fd, backing_path = tempfile.mkstemp(suffix=".i32")
+        f = os.fdopen(fd, 'w+b')
+        os.unlink(backing_path)  # il file sparisce alla chiusura dell'mmap
+    else:
+        f = open(backing_path, 'w+b')
+    with f:
+        f.truncate(max(1, size * ITEM_SIZE))  # mmap non accetta lunghezza 0
+        mm = mmap.mmap(f.fileno(), 0)
+    return memoryview(mm).cast('i')[:size], mm
+
+
+def parse_streaming(filepath, storage="array", backing_path=None, chunk_size=CHUNK_SIZE):
+    """
+    Legge un file istanza in un buffer compatto.
+    Ritorna (num_jobs, num_machines, rows, keepalive): rows[i] è una memoryview int32 della
+    macchina i (rows[i][j] = p_ij, senza copie); keepalive è l'array/mmap sottostante.
+    """
+    if storage not in ("array", "mmap"):
+        raise ValueError(f"Storage non valido: {storage} (attesi 'array' o 'mmap')")
+    if not os.path.exists(filepath):
+        raise FileNotFoundError(f"File {filepath} not found")
+
+    with open(filepath, 'r') as f:
+        lines = _iter_line_tokens(f, chunk_size)
+
+        # 1. Header (N M): prima riga utile
+        header = []
+        for tokens, end_of_line in lines:
+            header.extend(tokens)
+            if end_of_line and header:
+                break
+        try:
+            num_jobs, num_machines = int(header[0]), int(header[1])
+        except (IndexError, ValueError):
+            raise ValueError(f"Header non valido nel file: {filepath}")
+
+        # 2. Matrice: riempimento diretto del buffer, riga per riga
+        flat, keepalive = _allocate(num_jobs * num_machines, storage, backing_path)
+        row, col = 0, 0
+        for tokens, end_of_line in lines:
+            if tokens:
+                if row < num_machines and col + len(tokens) <= num_jobs:
+                    start = row * num_jobs + col
+                    try:
+                        flat[start:start + len(tokens)] = array('i', list(map(int, tokens)))  # via lista: ~30% più veloce del map diretto
+                    except OverflowError:
+                        raise ValueError(f"Riga {row}: valore fuori dal range int32")
+                col += len(tokens)
+            if end_of_line and col:
+                if row < num_machines and col != num_jobs:
+                    raise ValueError(f"Riga {row}: attesi {num_jobs} jobs, trovati {col}")
+                row, col = row + 1, 0
+
+    if row != num_machines:
+        raise ValueError(f"Attese {num_machines} macchine, trovate {row}")
+    rows = [flat[i * num_jobs:(i + 1) * num_jobs] for i in range(num_machines)]
+    return num_jobs, num_machines, rows, keepalive
+
+
+def measure(filepath, storage="array", backing_path=None):
+    """
+    Tempo di parsing e memoria di picco: (secondi, picco Python MB, picco RSS MB).
+    Due passate: prima la memoria (heap ancora vuoto), poi il tempo senza tracemalloc, che rallenta
+    le allocazioni.
+    """
+    from instance import Instance
+    from memory_probe import MemoryProbe
+
+    probe = MemoryProbe()
+    probe.start()
+    inst = Instance(filepath, storage=storage, backing_path=backing_path)
+    peak_py_mb, rss_delta_mb = probe.stop()
+    del inst
+    t0 = time.perf_counter()
+    inst = Instance(filepath, storage=storage, backing_path=backing_path)
+    elapsed = time.perf_counter() - t0
+    return elapsed, peak_py_mb, rss_delta_mb
+
+
+if __name__ == "__main__":
+    import argparse
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+
+    parser = argparse.ArgumentParser(description="Tempo e memoria di picco del parsing di un'istanza")
+    parser.add_argument("instance", type=str, help="File istanza")
+    parser.add_argument("--storage", choices=STORAGES, nargs="+", default=list(STORAGES),
+                        help="Storage da confrontare (default: tutti)")
+    parser.add_argument("--backing", type=str, default=None, help="File .i32 per lo storage mmap (default: temporaneo)")
+    args = parser.parse_args()
+
+    size_mb = os.path.getsize(args.instance) / (1024 * 1024)
+    print(f"📂 {args.instance} ({size_mb:.1f} MB)")
+    for storage in args.storage:
+        # Un processo nuovo per storage: l'heap lasciato dal parsing precedente falserebbe l'RSS
+        with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as pool:
+            elapsed, peak_py_mb, rss_delta_mb = pool.submit(measure, args.instance, storage, args.backing).result()
+        rss = f"{rss_delta_mb:.1f} MB" if rss_delta_mb is not None else "n/d"
+        print(f"  {storage:<6}: {elapsed:.3f} s, picco Python {peak_py_mb:.1f} MB, picco RSS +{rss}")
@@ -0,0 +1,164 @@
+"""
+Strumentazione delle campagne: trace JSONL delle fasi e profiling cProfile opzionale.
+
+Trace (--trace PATH): ogni fase (parsing istanza, lower bound, solve, scrittura CSV, plot...)
+produce una riga JSON con tempo wall (perf_counter) e CPU (process_time) del processo che la esegue:
+    {"name": "solve", "ts": 1760000000.1, "wall": 0.82, "cpu": 0.81, "pid": 4242,
+     "run": "20260301-101500-4200", "task": 17, "algo": "BnB"}
+Le righe sono scritte in append con una sola write() (O_APPEND): più worker possono condividere il file.
+
+Profiling (--profile DIR): i task selezionati girano sotto cProfile, un file .pstats per task
+più un riepilogo delle funzioni più costose (summary.txt).
+
+Disattivati (default) span() e profiled() si riducono a un controllo di None.
+
+Usage:
+    python src/runner.py --config experiments/config_pilot_a.json --trace results/generated/trace.jsonl
+    python src/runner.py --config experiments/config_pilot_a.json --profile results/generated/profiles --profile-tasks BnB
+    python src/tracing.py results/generated/trace.jsonl      # riepilogo per fase
+"""
+import contextlib
+import io
+import json
+import os
+import sys
+import time
+
+# Configurazione del processo corrente (propagata ai worker dall'initializer del pool)
+_STATE = {"trace_path": None, "profile_dir": None, "profile_select": None, "run": None}
+
+
+def configure(trace_path=None, profile_dir=None, profile_select=None, run=None):
+    """
+    Attiva trace e/o profiling nel processo corrente.
+    profile_select: lista di indici di task e/o nomi di algoritmo (es. ["BnB", "12"]); None = tutti.
+    run: identificativo del run nel trace (il file è in append: più run possono condividerlo).
+    """
+    for path in (trace_path and os.path.dirname(trace_path), profile_dir):
+        if path:
+            os.makedirs(path, exist_ok=True)
+    _STATE.update(trace_path=trace_path, profile_dir=profile_dir,
+                  profile_select=[str(s) for s in profile_select] if profile_select else None,
+                  run=run or f"{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}")
+
+
+def settings():
+    """Configurazione corrente, come argomenti di configure() (initargs del pool)."""
+    return (_STATE["trace_path"], _STATE["profile_dir"], _STATE["profile_select"], _STATE["run"])
+
+
+def enabled():
+    return _STATE["trace_path"] is not None
+
+
+def run_id():
+    return _STATE["run"]
+
+
+def _write(record):
+    data = (json.dumps(record) + "\n").encode()
+    fd = os.open(_STATE["trace_path"], os.O_WRONLY | os.O_APPEND | os.O_CREAT)
+    try:
+        os.write(fd, data)
+    finally:
+        os.close(fd)
+
+
+@contextlib.contextmanager
+def span(name, **attrs):
+    """Misura una fase (wall + CPU) e la aggiunge al trace."""
+    if _STATE["trace_path"] is None:
+        yield
+        return
+    ts = time.time()
+    wall0, cpu0 = time.perf_counter(), time.process_time()
+    try:
+        yield
+    finally:
+        record = {"name": name, "ts": ts, "wall": time.perf_counter() - wall0,
+                  "cpu": time.process_time() - cpu0, "pid": os.getpid(), "run": _STATE["run"]}
+        record.update(attrs)
+        _write(record)
+
+
+def profile_path(task):
+    """File .pstats di un task (nome deterministico: esperimento, indice, algoritmo, istanza)."""
+    meta = task['meta']
+    name = f"{task.get('experiment', '')}_task{task['index']:05d}_{task['algo']}_{meta['n']}x{meta['m']}_{meta['dist']}_{meta['seed']}.pstats"
+    return os.path.join(_STATE["profile_dir"], name)
+
+
+def should_profile(task):
+    if _STATE["profile_dir"] is None:
+        return False
+    select = _STATE["profile_select"]
+    return select is None or str(task['index']) in select or task['algo'] in select
+
+
+@contextlib.contextmanager
+def profiled(task):
+    """Esegue il blocco sotto cProfile se il task è selezionato."""
+    if not should_profile(task):
+        yield
+        return
+    import cProfile  # import lazy: costa ~10 ms all'avvio di ogni processo che non profila
+    prof = cProfile.Profile()
+    prof.enable()
+    try:
+        yield
+    finally:
+        prof.disable()
+        prof.dump_stats(profile_path(task))
+
+
+def summarize_profiles(paths, output_path=None, top=20):
+    """Unisce i .pstats e riporta le `top` funzioni per tempo proprio (tottime)."""
+    import pstats
+    paths = [p for p in paths if os.path.exists(p)]
+    if not paths:
+        return None
+    stats = pstats.Stats(paths[0], stream=io.StringIO())
+    for path in paths[1:]:
+        stats.add(path)
+    stats.files = []  # l'elenco dei .pstats nell'intestazione sarebbe lungo quanto la campagna
+    buf = io.StringIO()
+    stats.stream = buf
+    buf.write(f"Profili aggregati: {len(paths)} task\n")
+    stats.sort_stats("tottime").print_stats(top)
+    report = buf.getvalue()
+    if output_path:
+        with open(output_path, 'w') as f:
+            f.write(report)
+    return report
+
+
+def summarize_trace(trace_path, run=None):
+    """Aggrega il trace per fase: {name: {"count", "wall", "cpu"}} ordinato per wall decrescente."""
+    phases = {}
+    with open(trace_path, 'r') as f:
+        for line in f:
+            try:
+                rec = json.loads(line)
+            except ValueError:
+                continue  # riga troncata (crash durante la scrittura)
+            if run is not None and rec.get('run') != run:
+                continue
+            agg = phases.setdefault(rec['name'], {"count": 0, "wall": 0.0, "cpu": 0.0})
+            agg["count"] += 1
+            agg["wall"] += rec['wall']
+            agg["cpu"] += rec['cpu']
+    return dict(sorted(phases.items(), key=lambda kv: -kv[1]["wall"]))
+
+
+def print_trace_summary(trace_path, run=None):
+    print(f"⏱️  Trace per fase ({trace_path}" + (f", run {run}" if run else "") + "):")
+    print(f"   {'Fase':<20} {'N':>7} {'Wall [s]':>10} {'CPU [s]':>10}")
+    for name, agg in summarize_trace(trace_path, run).items():
+        print(f"   {name:<20} {agg['count']:>7} {agg['wall']:>10.3f} {agg['cpu']:>10.3f}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 2:
+        print("Usage: python src/tracing.py <trace.jsonl>")
+        sys.exit(1)
+    print_trace_summary(sys.argv[1])
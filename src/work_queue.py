@@ -0,0 +1,222 @@
+"""
+Coda di lavoro locale su SQLite per eseguire una campagna con un numero arbitrario di worker.
+
+Flusso (nessun broker esterno, solo un file SQLite sul disco locale):
+    1. enqueue: i task (istanza, algoritmo, parametri, seed) di un experiments/*.json finiscono in coda
+                (un nuovo enqueue dello stesso esperimento rimuove i task non più presenti nel config)
+    2. worker:  N processi `runner.py --worker` reclamano i task in modo atomico (BEGIN IMMEDIATE)
+                con un lease rinnovato da un heartbeat; un lease scaduto (worker morto) rimette
+                il task in gioco, fino a max_attempts tentativi
+    3. merge:   i risultati vengono ricomposti nel CSV in ordine canonico (Gap IG vs ottimo BnB incluso)
+
+Usage:
+    python src/runner.py --config experiments/workhorse_config.json --queue results/generated/queue.sqlite --enqueue
+    python src/runner.py --queue results/generated/queue.sqlite --worker        # lanciarne quanti se ne vuole
+    python src/runner.py --config experiments/workhorse_config.json --queue results/generated/queue.sqlite --merge
+"""
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    id          INTEGER PRIMARY KEY AUTOINCREMENT,
+    experiment  TEXT NOT NULL,
+    task_index  INTEGER NOT NULL,
+    task_key    TEXT NOT NULL,
+    payload     TEXT NOT NULL,
+    priority    REAL NOT NULL DEFAULT 0,
+    status      TEXT NOT NULL DEFAULT 'pending',
+    attempts    INTEGER NOT NULL DEFAULT 0,
+    worker      TEXT,
+    lease_until REAL,
+    result      TEXT,
+    error       TEXT,
+    updated_at  REAL,
+    UNIQUE (experiment, task_key)
+)
+"""
+
+
+class WorkQueue:
+    def __init__(self, db_path, lease_seconds=300, max_attempts=3):
+        self.db_path = db_path
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        if os.path.dirname(db_path):
+            os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        # isolation_level=None: transazioni esplicite (BEGIN IMMEDIATE prende subito il lock di scrittura)
+        self.conn = sqlite3.connect(db_path, timeout=60, isolation_level=None, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(SCHEMA)
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_tasks_claim ON tasks(status, priority)")
+        self.lock = threading.Lock()  # la connessione è condivisa con il thread di heartbeat
+
+    def _transaction(self, fn):
+        with self.lock:
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                out = fn()
+                self.conn.execute("COMMIT")
+                return out
+            except Exception:
+                self.conn.execute("ROLLBACK")
+                raise
+
+    def enqueue(self, experiment, tasks, priorities):
+        """
+        Allinea la coda di un esperimento ai task del config corrente. Ritorna (aggiunti, rimossi).
+        Un task già in coda con la stessa chiave conserva stato e risultato (indice, payload e priorità
+        sono aggiornati); i task dell'esperimento assenti dal nuovo config vengono rimossi.
+        """
+        now = time.time()
+        rows = [(t['index'], json.dumps(t['key']), json.dumps(t), priorities[t['index']]) for t in tasks]
+
+        def op():
+            keys = {key for _, key, _, _ in rows}
+            stale = [(row_id,) for row_id, key in self.conn.execute(
+                "SELECT id, task_key FROM tasks WHERE experiment = ?", (experiment,)) if key not in keys]
+            self.conn.executemany("DELETE FROM tasks WHERE id = ?", stale)
+            before = self.conn.total_changes
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO tasks (experiment, task_index, task_key, payload, priority, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                [(experiment, index, key, payload, priority, now) for index, key, payload, priority in rows])
+            added = self.conn.total_changes - before
+            self.conn.executemany(
+                "UPDATE tasks SET task_index = ?, payload = ?, priority = ? WHERE experiment = ? AND task_key = ?",
+                [(index, payload, priority, experiment, key) for index, key, payload, priority in rows])
+            return added, len(stale)
+        return self._transaction(op)
+
+    def claim(self, worker_id):
+        """
+        Reclama atomicamente il prossimo task: pending, oppure running con lease scaduto.
+        Priorità = durata prevista (i task lunghi per primi). Ritorna (id, task) o None.
+        Un task con lease scaduto all'ultimo tentativo (worker morto) passa a failed.
+        """
+        now = time.time()
+
+        def op():
+            self.conn.execute(
+                "UPDATE tasks SET status = 'failed', error = COALESCE(error, 'lease scaduto'), lease_until = NULL, "
+                "updated_at = ? WHERE status = 'running' AND lease_until < ? AND attempts >= ?",
+                (now, now, self.max_attempts))
+            row = self.conn.execute(
+                "SELECT id, payload FROM tasks WHERE attempts < ? AND "
+                "(status = 'pending' OR (status = 'running' AND lease_until < ?)) "
+                "ORDER BY priority DESC, id LIMIT 1", (self.max_attempts, now)).fetchone()
+            if row is None:
+                return None
+            self.conn.execute(
+                "UPDATE tasks SET status = 'running', worker = ?, lease_until = ?, attempts = attempts + 1, "
+                "updated_at = ? WHERE id = ?", (worker_id, now + self.lease_seconds, now, row[0]))
+            return row[0], json.loads(row[1])
+        return self._transaction(op)
+
+    def renew(self, task_id, worker_id):
+        """Heartbeat: estende il lease (solo se il task è ancora nostro)."""
+        now = time.time()
+        self._transaction(lambda: self.conn.execute(
+            "UPDATE tasks SET lease_until = ?, updated_at = ? WHERE id = ? AND worker = ? AND status = 'running'",
+            (now + self.lease_seconds, now, task_id, worker_id)))
+
+    def complete(self, task_id, result):
+        """Salva il risultato. Il primo risultato vince: un worker 'resuscitato' non sovrascrive."""
+        self._transaction(lambda: self.conn.execute(
+            "UPDATE tasks SET status = 'done', result = ?, lease_until = NULL, updated_at = ? "
+            "WHERE id = ? AND status != 'done'", (json.dumps(result), time.time(), task_id)))
+
+    def fail(self, task_id, error):
+        """Errore nel task: torna pending finché restano tentativi, poi failed."""
+        self._transaction(lambda: self.conn.execute(
+            "UPDATE tasks SET status = CASE WHEN attempts < ? THEN 'pending' ELSE 'failed' END, "
+            "error = ?, lease_until = NULL, updated_at = ? WHERE id = ? AND status != 'done'",
+            (self.max_attempts, error, time.time(), task_id)))
+
+    def counts(self, experiment=None):
+        """Conteggio task per stato."""
+        sql = "SELECT status, COUNT(*) FROM tasks"
+        args = ()
+        if experiment is not None:
+            sql += " WHERE experiment = ?"
+            args = (experiment,)
+        with self.lock:
+            return dict(self.conn.execute(sql + " GROUP BY status", args).fetchall())
+
+    def outstanding(self):
+        """Task che possono ancora terminare: pending, running con lease vivo o con tentativi residui."""
+        with self.lock:
+            return self.conn.execute(
+                "SELECT COUNT(*) FROM tasks WHERE status = 'pending' OR (status = 'running' AND "
+                "(lease_until >= ? OR attempts < ?))", (time.time(), self.max_attempts)).fetchone()[0]
+
+    def entries(self, experiment):
+        """[(task, result | None, status)] di un esperimento, in ordine canonico (task_index)."""
+        with self.lock:
+            rows = self.conn.execute("SELECT payload, result, status FROM tasks WHERE experiment = ? "
+                                     "ORDER BY task_index", (experiment,)).fetchall()
+        return [(json.loads(p), json.loads(r) if r else None, st) for p, r, st in rows]
+
+    def close(self):
+        self.conn.close()
+
+
+def enqueue_config(config, tasks, queue_path, priorities):
+    """Mette in coda i task di un esperimento (chiave stabile = runner.task_key)."""
+    queue = WorkQueue(queue_path)
+    added, removed = queue.enqueue(config['experiment_name'], tasks, priorities)
+    counts = queue.counts(config['experiment_name'])
+    queue.close()
+    print(f"📥 Accodati {added} nuovi task ({len(tasks) - added} già presenti) in {queue_path}")
+    if removed:
+        print(f"   🧹 Rimossi {removed} task di una versione precedente del config")
+    print(f"   Stato coda: {counts}")
+
+
+def run_worker(queue_path, run_task, lease_seconds=300, max_attempts=3, poll_seconds=5.0):
+    """
+    Loop del worker: reclama, esegue, salva. Termina quando non restano task pending
+    né task running di altri worker ancora vivi o ripresentabili (lease scaduto con tentativi residui).
+    """
+    queue = WorkQueue(queue_path, lease_seconds=lease_seconds, max_attempts=max_attempts)
+    worker_id = f"{socket.gethostname()}:{os.getpid()}"
+    done = 0
+    print(f"👷 Worker {worker_id} su {queue_path}")
+
+    while True:
+        claimed = queue.claim(worker_id)
+        if claimed is None:
+            if queue.outstanding() == 0:
+                break
+            time.sleep(poll_seconds)  # task di altri worker in corso: se il lease scade li riprendiamo
+            continue
+
+        task_id, task = claimed
+        stop = threading.Event()
+
+        def heartbeat():
+            while not stop.wait(lease_seconds / 3):
+                queue.renew(task_id, worker_id)
+        beat = threading.Thread(target=heartbeat, daemon=True)
+        beat.start()
+        try:
+            result = run_task(task)
+            queue.complete(task_id, result)
+            done += 1
+            meta = task['meta']
+            print(f"  ✓ [{task['index']}] {task['algo']} {meta['n']}x{meta['m']} {meta['dist']} "
+                  f"(Seed {meta['seed']}) -> {result['obj']}")
+        except Exception as e:
+            queue.fail(task_id, repr(e))
+            print(f"  ❌ [{task['index']}] {task['algo']}: {e}")
+        finally:
+            stop.set()
+            beat.join()
+
+    print(f"👷 Worker {worker_id}: {done} task completati. Stato coda: {queue.counts()}")
+    queue.close()
+    return done
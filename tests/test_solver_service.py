@@ -0,0 +1,63 @@
+"""
+Il servizio solver risponde 200 all'esempio documentato (docstring del modulo e docs/README.md).
+
+Usage:
+    python -m pytest -q tests/test_solver_service.py
+"""
+import json
+import os
+import sys
+import threading
+import unittest
+import urllib.error
+import urllib.request
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+import solver_service
+from solver_service import SolverService, make_server
+
+# Esempio copiato così com'è dalla documentazione (N=3: il d di default deve adattarsi)
+DOCUMENTED_REQUEST = '{"algo": "ig", "matrix": [[3, 5, 2], [4, 1, 6]], "time_limit": 0.5}'
+
+
+class DocumentedExampleTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.service = SolverService(workers=1, max_inflight=4)
+        cls.server = make_server(cls.service, port=0)
+        cls.url = f"http://127.0.0.1:{cls.server.server_address[1]}"
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        cls.service.shutdown()
+
+    def _post(self, body):
+        req = urllib.request.Request(self.url + "/solve", data=body.encode(), method="POST")
+        try:
+            with urllib.request.urlopen(req, timeout=30) as resp:
+                return resp.status, json.loads(resp.read())
+        except urllib.error.HTTPError as e:
+            return e.code, json.loads(e.read())
+
+    def test_example_is_documented(self):
+        with open(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "docs", "README.md")) as f:
+            self.assertIn(DOCUMENTED_REQUEST, f.read())
+        self.assertIn(DOCUMENTED_REQUEST, solver_service.__doc__)
+
+    def test_documented_example_returns_200(self):
+        status, body = self._post(DOCUMENTED_REQUEST)
+        self.assertEqual(status, 200, body)
+        self.assertEqual(len(body["assignment"]), 3)
+
+    def test_explicit_d_out_of_range_is_rejected(self):
+        status, _ = self._post('{"algo": "ig", "matrix": [[3, 5, 2], [4, 1, 6]], "time_limit": 0.5, "d": 4}')
+        self.assertEqual(status, 400)
+
+
+if __name__ == "__main__":
+    unittest.main()